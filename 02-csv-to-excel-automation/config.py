@@ -16,6 +16,9 @@ COLUMN_ALIASES = {
     "City": ["city", "Location", "location"]
 }
 
+# Low-cardinality text columns stored as categories (less memory)
+CATEGORY_COLUMNS = ["Product", "City"]
+
 # Drop columns after cleaning
 DROP_COLUMNS = ["City"]
 
@@ -1,6 +1,8 @@
 
 import pandas as pd
+import numpy as np
 import os
+import sys
 import logging
 import argparse
 from datetime import datetime
@@ -8,6 +10,11 @@ from datetime import datetime
 from config import CLIENT_NAME, INPUT_FILE, OUTPUT_FILE, REQUIRED_COLUMNS
 from config import COLUMN_ALIASES
 
+# shared libs (excel_rollover) live at the repo root
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+from excel_rollover import RolloverWorkbook
+from automation_utils import optimize_dtypes
 
 # ---------------- LOGGING ----------------
 logging.basicConfig(
@@ -23,6 +30,10 @@ def parse_arguments():
     parser.add_argument("--client", default=CLIENT_NAME)
     parser.add_argument("--input", default=INPUT_FILE)
     parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="Stream the CSV in chunks of N rows (for files bigger than RAM)")
+    parser.add_argument("--format", choices=["xlsx", "csv"], default="xlsx",
+                        help="Output format for streaming mode")
     return parser.parse_args()
 
 # ---------------- LOAD CSV ----------------
@@ -102,6 +113,245 @@ def clean_data(df):
 
     return df, duplicates_removed, missing_names_removed, initial_rows
 
+# ---------------- STREAMING (CHUNKED) MODE ----------------
+def read_header(path):
+    """
+    Header only (no data rows) - columns are normalised and
+    validated once here instead of on the full file
+    """
+    if not os.path.exists(path):
+        logging.error(f"Input file not found: {path}")
+        print(f"❌ File not found: {path}")
+        return None
+
+    try:
+        return pd.read_csv(path, nrows=0)
+    except Exception as e:
+        logging.error(f"Error reading CSV: {str(e)}")
+        print(f"❌ Error reading CSV: {str(e)}")
+        return None
+
+
+def infer_dtypes(path, chunksize):
+    """
+    First pass: the dtype pandas would infer for each column on the
+    whole file. Per-chunk inference drifts (int in one chunk, text in
+    the next; an all-empty chunk comes back float64), so chunks are
+    read with these fixed dtypes and the same row hashes the same in
+    every chunk.
+    """
+    kinds, has_na = {}, {}
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        for col in chunk.columns:
+            series = chunk[col]
+            has_na[col] = has_na.get(col, False) or bool(series.isna().any())
+            if series.isna().all():
+                continue  # says nothing about the column's type
+            if pd.api.types.is_bool_dtype(series):
+                kind = "bool"
+            elif pd.api.types.is_integer_dtype(series):
+                kind = "int"
+            elif pd.api.types.is_float_dtype(series):
+                kind = "float"
+            else:
+                kind = "str"
+            prev = kinds.get(col, kind)
+            if prev != kind:
+                kind = "float" if {prev, kind} == {"int", "float"} else "str"
+            kinds[col] = kind
+
+    dtypes = {}
+    for col, na in has_na.items():
+        kind = kinds.get(col, "float")  # all empty -> float64 (NaN), like a full read
+        if kind == "int":
+            dtypes[col] = "float64" if na else "int64"
+        elif kind == "bool":
+            dtypes[col] = "boolean" if na else "bool"
+        else:
+            dtypes[col] = "float64" if kind == "float" else str
+    return dtypes
+
+
+def row_hashes(chunk):
+    """
+    64-bit hash per row (all columns)
+    Chunks must be read with infer_dtypes() so a value hashes the same
+    in every chunk.
+    """
+    return pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+
+
+class HashSeen:
+    """
+    Set of uint64 row hashes seen so far (8 bytes per unique row)
+
+    Kept as a few sorted numpy runs; a new run is merged into the
+    previous one when they get close in size, so lookups stay
+    log-time and merging stays cheap.
+    """
+
+    def __init__(self):
+        self.runs = []
+
+    def __len__(self):
+        return sum(len(r) for r in self.runs)
+
+    def contains(self, hashes):
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self.runs:
+            idx = np.searchsorted(run, hashes)
+            idx[idx == len(run)] = 0
+            found |= run[idx] == hashes
+        return found
+
+    def add(self, new_unique):
+        if len(new_unique) == 0:
+            return
+        self.runs.append(np.sort(new_unique))
+        while len(self.runs) > 1 and len(self.runs[-2]) <= 2 * len(self.runs[-1]):
+            last = self.runs.pop()
+            self.runs[-1] = np.sort(np.concatenate([self.runs[-1], last]), kind="mergesort")
+
+
+def clean_chunk(chunk, seen):
+    """
+    clean_data() for one chunk - duplicates are checked against every
+    earlier chunk through the hash set, so counts match the full-file run
+    """
+    initial_rows = len(chunk)
+    hashes = row_hashes(chunk)
+
+    # first occurrence inside this chunk, not seen in earlier chunks
+    first = np.zeros(initial_rows, dtype=bool)
+    first[np.unique(hashes, return_index=True)[1]] = True
+    keep = first & ~seen.contains(hashes)
+    seen.add(hashes[keep])
+
+    chunk = chunk[keep]
+    duplicates_removed = initial_rows - len(chunk)
+
+    chunk = chunk.dropna(subset=["Name"])
+    missing_names_removed = initial_rows - duplicates_removed - len(chunk)
+
+    return chunk, duplicates_removed, missing_names_removed, initial_rows
+
+
+class StreamWriter:
+    """
+    Append-only output: CSV (append mode) or write-only Excel that rolls
+    over to a new sheet / file past the Excel row limit
+    """
+
+    def __init__(self, path, fmt="xlsx"):
+        self.path = path
+        self.fmt = fmt
+        self.rows = 0
+        self._book = None
+        self._sheet = None
+        self._header = True
+
+    def write(self, chunk):
+        if self.fmt == "csv":
+            chunk.to_csv(self.path, mode="w" if self._header else "a",
+                         header=self._header, index=False)
+            self._header = False
+        else:
+            if self._book is None:
+                self._book = RolloverWorkbook(self.path)
+                self._sheet = self._book.sheet("Sheet1", [str(c) for c in chunk.columns])
+            values = chunk.astype(object).where(chunk.notna(), None)
+            for row in values.itertuples(index=False, name=None):
+                self._sheet.append(row)
+        self.rows += len(chunk)
+
+    def close(self):
+        if self._book is not None:
+            return self._book.close()
+        return [self.path]
+
+
+def csv_to_excel_streaming(client, input_file, output_file, output_dir, chunksize, fmt="xlsx"):
+    """
+    Bounded-memory run: only one chunk (plus 8 bytes per unique row
+    for duplicate detection) is ever held in memory
+    The file is read twice: once for the column dtypes, then to clean.
+    """
+    header = read_header(input_file)
+    if header is None:
+        return
+
+    # Normalize + validate on the header only
+    header = normalize_columns(header, COLUMN_ALIASES)
+    columns = header.columns.tolist()
+    print("\n🧪 Columns after normalization:")
+    print(columns)
+    logging.info(f"Columns after normalization: {columns}")
+
+    if not validate_columns(header, REQUIRED_COLUMNS):
+        return
+
+    from config import DROP_COLUMNS, FINAL_COLUMN_RENAME, CATEGORY_COLUMNS
+
+    if fmt == "csv":
+        output_file = os.path.splitext(output_file)[0] + ".csv"
+    writer = StreamWriter(output_file, fmt)
+    seen = HashSeen()
+    initial_rows = dup_removed = missing_removed = 0
+
+    dtypes = infer_dtypes(input_file, chunksize)
+    for i, chunk in enumerate(pd.read_csv(input_file, chunksize=chunksize, dtype=dtypes)):
+        chunk.columns = columns
+        if i == 0:
+            print("\n📊 Raw Data:")
+            print(chunk.head())
+
+        chunk, dups, missing, rows = clean_chunk(chunk, seen)
+        initial_rows += rows
+        dup_removed += dups
+        missing_removed += missing
+
+        # Shrink dtypes after the duplicate check - downcasts differ per
+        # chunk and would change the row hashes; only CATEGORY_COLUMNS
+        # become categories so every chunk gets the same set
+        chunk = optimize_dtypes(chunk, CATEGORY_COLUMNS, max_ratio=0, report=False)
+
+        chunk = apply_column_rules(chunk, DROP_COLUMNS, FINAL_COLUMN_RENAME)
+        writer.write(chunk)
+        print(f"   📦 Chunk {i + 1}: {initial_rows} rows read, {writer.rows} kept")
+
+    if initial_rows == 0:
+        logging.error("CSV file is empty")
+        print("❌ CSV file is empty")
+        return
+
+    files = writer.close()
+    final_rows = writer.rows
+
+    logging.info(f"Duplicates removed: {dup_removed}")
+    logging.info(f"Missing names removed: {missing_removed}")
+    logging.info(f"Final rows: {final_rows}")
+
+    print("\n🧹 Cleaning Summary")
+    print(f"Initial rows: {initial_rows}")
+    print(f"Duplicates removed: {dup_removed}")
+    print(f"Missing names removed: {missing_removed}")
+    print(f"Final rows: {final_rows}")
+
+    generate_quality_report(
+        client,
+        input_file,
+        initial_rows,
+        dup_removed,
+        missing_removed,
+        final_rows,
+        output_dir
+    )
+    logging.info(f"Output exported: {files}")
+
+    for f in files:
+        print(f"\n✅ Output file created: {f}")
+    print("\n🏁 Automation finished successfully")
+
 # -------Helper Function ------------------------------------
 
 def create_output_path(client):
@@ -152,6 +402,12 @@ def csv_to_excel_automation():
     logging.info(f"Automation started for client: {client}")
     print(f"🚀 Processing started for client: {client}")
 
+    if args.chunksize:
+        print(f"🌊 Streaming mode: {args.chunksize} rows per chunk")
+        csv_to_excel_streaming(client, input_file, output_file, output_dir,
+                               args.chunksize, args.format)
+        return
+
     # Load CSV
     df = load_csv(input_file)
     if df is None:
@@ -170,6 +426,10 @@ def csv_to_excel_automation():
     print("\n📊 Raw Data:")
     print(df.head())
 
+    # Shrink dtypes before cleaning (categories, downcast numbers)
+    from config import CATEGORY_COLUMNS
+    df = optimize_dtypes(df, CATEGORY_COLUMNS)
+
     # Clean data
     df, dup_removed, missing_removed, initial_rows = clean_data(df)
 
@@ -1,4 +1,3 @@
-import requests
 from bs4 import BeautifulSoup
 import csv
 
@@ -6,13 +5,13 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath('../..'))
 
-from automation_utils import save_to_csv
+from automation_utils import save_to_csv, fetch_webpage
 import pandas as pd
 
 
 # Step 1: Fetch webpage
 url = "https://quotes.toscrape.com"
-response = requests.get(url)
+response = fetch_webpage(url, raise_for_status=False)
 print(response.status_code)
 
 # Step 2: Parse HTML
@@ -9,3 +9,35 @@ LOG_FILE = "logs/scraper.log"
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; AutomationBot/1.0)"
 }
+
+# Crawl Settings
+ASYNC_CRAWL = True      # False = one page at a time (old behaviour)
+CONCURRENCY = 8         # requests in flight overall
+PER_HOST_MAX = 2        # requests in flight to one site
+MIN_INTERVAL = 0.5      # seconds between requests to one site
+REQUEST_TIMEOUT = 10    # seconds per request
+MAX_RETRIES = 3         # retries on timeout / 429 / 5xx
+RETRY_BACKOFF = 0.5     # first retry wait, doubles each time
+
+# HTTP Cache (reruns revalidate pages instead of downloading them again)
+HTTP_CACHE = True       # False = always download
+OFFLINE_MODE = False    # True = serve only from the cache (no network)
+
+# HTML Parsing (CSS selectors, looked up inside each QUOTE_SELECTOR match)
+HTML_BACKEND = "auto"   # auto / selectolax / lxml / bs4-lxml / bs4
+QUOTE_SELECTOR = "div.quote"
+QUOTE_FIELDS = {
+    "quote": "span.text",
+    "author": "small.author"
+}
+
+# Frontier Crawl (discover pages by following links instead of NUM_PAGES)
+CRAWL_MODE = "pages"                # "frontier" = follow links from START_URLS up to MAX_PAGES
+START_URLS = [f"{BASE_URL}/page/1/"]
+NEXT_SELECTOR = "li.next a@href"    # "next page" link, always followed
+FOLLOW_PATTERNS = []                # regexes, e.g. [r"/tag/[^/]+/page/\d+/$"]
+MAX_PAGES = 1000                    # None = no limit
+MAX_DEPTH = None                    # link hops from a start URL, None = no limit
+DEDUPE = "auto"                     # set / bloom (auto = bloom once MAX_PAGES > 100000)
+CHECKPOINT_FILE = "checkpoints/quotes_crawl.json"  # relative to this folder; + .jsonl records, .seen URLs
+CHECKPOINT_EVERY = 20               # pages between checkpoints
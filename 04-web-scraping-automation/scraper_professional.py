@@ -8,7 +8,6 @@ Scrapes quotes from quotes.toscrape.com
 """
 
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import time
 from datetime import datetime
@@ -28,8 +27,15 @@ from automation_utils import (
     setup_logging,
     create_output_directory,
     save_to_csv,
-    remove_duplicates
+    remove_duplicates,
+    fetch_webpage,
+    http_stats,
+    parse_html
 )
+from async_fetcher import fetch_all
+from crawl_frontier import Crawler
+import http_cache
+from http_cache import HttpCache
 
 # Import config from current directory
 current_dir = os.path.dirname(__file__)
@@ -42,9 +48,57 @@ from config import (
     NUM_PAGES,
     OUTPUT_FILE,
     LOG_FILE, 
-    HEADERS
+    HEADERS,
+    ASYNC_CRAWL,
+    CONCURRENCY,
+    PER_HOST_MAX,
+    MIN_INTERVAL,
+    REQUEST_TIMEOUT,
+    MAX_RETRIES,
+    RETRY_BACKOFF,
+    HTTP_CACHE,
+    OFFLINE_MODE,
+    HTML_BACKEND,
+    QUOTE_SELECTOR,
+    QUOTE_FIELDS,
+    CRAWL_MODE,
+    START_URLS,
+    NEXT_SELECTOR,
+    FOLLOW_PATTERNS,
+    MAX_PAGES,
+    MAX_DEPTH,
+    DEDUPE,
+    CHECKPOINT_FILE,
+    CHECKPOINT_EVERY
 )
 
+# Crawl checkpoints live next to the script, whatever the working directory
+CHECKPOINT_PATH = os.path.join(os.path.abspath(current_dir), CHECKPOINT_FILE)
+
+# On-disk HTTP cache (AUTOMATION_OFFLINE=1 also turns on offline mode)
+HTTP_STORE = HttpCache(offline=OFFLINE_MODE or http_cache.OFFLINE) \
+    if HTTP_CACHE or OFFLINE_MODE else False
+
+
+def parse_quotes(content, url):
+    """
+    Extract one record per QUOTE_SELECTOR match (fields from
+    QUOTE_FIELDS in config.py)
+
+    Args:
+        content (bytes): page HTML
+        url (str): page URL (for logging)
+
+    Returns:
+        list: List of dictionaries with quote and author
+    """
+    page = parse_html(content, backend=HTML_BACKEND)
+    data = page.records(QUOTE_SELECTOR, QUOTE_FIELDS)
+
+    print(f"   ✅ Found {len(data)} quotes")
+    logging.info(f"Scraped {len(data)} quotes from {url}")
+    return data
+
 
 def scrape_single_page(url):
     """
@@ -61,28 +115,16 @@ def scrape_single_page(url):
     try:
         print(f"📄 Scraping: {url}")
 
-        response = requests.get(
+        response = fetch_webpage(
             url,
             headers=HEADERS,
-            timeout=10
+            timeout=REQUEST_TIMEOUT,
+            cache=HTTP_STORE
         )
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, "html.parser")
-
-        quotes = soup.find_all("span", class_="text")
-        authors = soup.find_all("small", class_="author")
-
-        data = []
-        for q, a in zip(quotes, authors):
-            data.append({
-                "quote": q.text.strip(),
-                "author": a.text.strip()
-            })
+        if getattr(response, "from_cache", False):
+            print("   📦 From cache")
 
-        print(f"   ✅ Found {len(data)} quotes")
-        logging.info(f"Scraped {len(data)} quotes from {url}")
-        return data
+        return parse_quotes(response.content, url)
 
     except requests.exceptions.RequestException as e:
         print(f"   ❌ Network error: {e}")
@@ -95,6 +137,100 @@ def scrape_single_page(url):
         return []
 
 
+def scrape_pages_async(urls):
+    """
+    Fetch all pages concurrently (global + per-host limits, retries)
+    and parse each one with parse_quotes - results keep page order
+
+    Args:
+        urls (list): page URLs
+
+    Returns:
+        list: quotes from every page that downloaded
+    """
+    def report(result):
+        if result.ok and result.from_cache:
+            print(f"📦 From cache: {result.url}")
+        elif result.ok:
+            print(f"📄 Fetched: {result.url} ({result.elapsed:.2f}s)")
+        else:
+            print(f"   ❌ Network error: {result.url} - {result.error}")
+
+    results = fetch_all(
+        urls,
+        on_result=report,
+        concurrency=CONCURRENCY,
+        per_host=PER_HOST_MAX,
+        min_interval=MIN_INTERVAL,
+        timeout=REQUEST_TIMEOUT,
+        retries=MAX_RETRIES,
+        backoff=RETRY_BACKOFF,
+        headers=HEADERS,
+        cache=HTTP_STORE
+    )
+
+    cached = sum(1 for r in results if r.from_cache)
+    if cached:
+        print(f"\n📦 {cached}/{len(results)} pages from HTTP cache")
+        logging.info(f"{cached}/{len(results)} pages from HTTP cache")
+
+    all_quotes = []
+    for result in results:
+        if not result.ok:
+            continue
+        try:
+            all_quotes.extend(parse_quotes(result.content, result.url))
+        except Exception as e:
+            print(f"   ❌ Unexpected error: {e}")
+            logging.error(f"Unexpected error on {result.url}: {e}")
+    return all_quotes
+
+
+def crawl_quotes():
+    """
+    Frontier crawl from START_URLS: follows next / FOLLOW_PATTERNS links,
+    checkpoints to CHECKPOINT_PATH and resumes from it after a crash
+
+    Returns:
+        tuple: (quotes, pages crawled)
+    """
+    def report(url, records, result):
+        source = "📦 From cache" if result.from_cache else "📄 Fetched"
+        print(f"{source}: {url} - {len(records)} quotes")
+
+    crawler = Crawler(
+        START_URLS,
+        extract=lambda page, url: page.records(QUOTE_SELECTOR, QUOTE_FIELDS),
+        next_selector=NEXT_SELECTOR,
+        follow_patterns=FOLLOW_PATTERNS,
+        max_pages=MAX_PAGES,
+        max_depth=MAX_DEPTH,
+        dedupe=DEDUPE,
+        checkpoint_path=CHECKPOINT_PATH,
+        checkpoint_every=CHECKPOINT_EVERY,
+        html_backend=HTML_BACKEND,
+        on_page=report,
+        concurrency=CONCURRENCY,
+        per_host=PER_HOST_MAX,
+        min_interval=MIN_INTERVAL,
+        timeout=REQUEST_TIMEOUT,
+        retries=MAX_RETRIES,
+        backoff=RETRY_BACKOFF,
+        headers=HEADERS,
+        cache=HTTP_STORE
+    )
+    quotes = crawler.run()
+
+    if crawler.frontier:
+        print(f"\n⚠️  MAX_PAGES reached - {len(crawler.frontier)} pages still queued "
+              f"(raise MAX_PAGES and rerun to continue)")
+    if crawler.failed:
+        print(f"⚠️  {len(crawler.failed)} pages failed (retried on the next run)")
+    logging.info(f"Crawled {crawler.pages} pages, {len(crawler.failed)} failed, "
+                 f"{len(crawler.frontier)} still queued")
+    return quotes, crawler.pages
+
+
 def generate_statistics(df):
     """Generate and print statistics about the data"""
     print(f"\n📊 STATISTICS:")
@@ -109,7 +245,7 @@ def generate_statistics(df):
     logging.info(f"Statistics - Total: {len(df)}, Unique authors: {df['author'].nunique()}")
 
 
-def generate_report(df, dup_count, output_dir, output_path):
+def generate_report(df, dup_count, output_dir, output_path, pages_scraped=NUM_PAGES):
     """Generate detailed text report"""
     report = f"""
 {'='*60}
@@ -122,7 +258,7 @@ Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 SCRAPING DETAILS:
 - Base URL: {BASE_URL}
-- Pages scraped: {NUM_PAGES}
+- Pages scraped: {pages_scraped}
 - Total quotes collected: {len(df)}
 - Unique authors: {df['author'].nunique()}
 - Duplicates removed: {dup_count}
@@ -165,23 +301,41 @@ def main():
     logging.info("="*60)
     
     # SCRAPE MULTIPLE PAGES
-    all_quotes = []
+    urls = [f"{BASE_URL}/page/{page_num}/" for page_num in range(1, NUM_PAGES + 1)]
+    pages_scraped = NUM_PAGES
     
-    print(f"\n🔄 Scraping {NUM_PAGES} pages...\n")
-    
-    for page_num in range(1, NUM_PAGES + 1):
-        url = f"{BASE_URL}/page/{page_num}/"
-        page_data = scrape_single_page(url)
-        all_quotes.extend(page_data)
+    if CRAWL_MODE == "frontier":
+        print(f"\n🔄 Crawling from {', '.join(START_URLS)} ({CONCURRENCY} concurrent, "
+              f"{PER_HOST_MAX} per host)...\n")
+        all_quotes, pages_scraped = crawl_quotes()
+    elif ASYNC_CRAWL:
+        print(f"\n🔄 Scraping {NUM_PAGES} pages ({CONCURRENCY} concurrent, "
+              f"{PER_HOST_MAX} per host)...\n")
+        all_quotes = scrape_pages_async(urls)
+    else:
+        all_quotes = []
+        print(f"\n🔄 Scraping {NUM_PAGES} pages...\n")
         
-        # Polite delay between requests
-        if page_num < NUM_PAGES:
-            time.sleep(1)
+        for page_num, url in enumerate(urls, start=1):
+            page_data = scrape_single_page(url)
+            all_quotes.extend(page_data)
+            
+            # Polite delay between requests
+            if page_num < NUM_PAGES and not (HTTP_STORE and HTTP_STORE.offline):
+                time.sleep(1)
     
     print(f"\n{'='*60}")
     print(f"🎯 Total quotes collected: {len(all_quotes)}")
     print(f"{'='*60}")
     
+    # HTTP METRICS (requests, retries, keep-alive connections per host)
+    stats = http_stats()
+    if stats["requests"]:
+        print(f"🌐 HTTP: {stats['requests']} requests, {stats['retries']} retries, "
+              f"avg {stats['avg_seconds']:.2f}s, p95 {stats['p95_seconds']:.2f}s, "
+              f"{stats['bytes'] / 1024:.0f} KB")
+        logging.info(f"HTTP stats: {stats}")
+    
     # CREATE DATAFRAME
     if not all_quotes:
         print("❌ No data collected! Exiting.")
@@ -231,7 +385,7 @@ def main():
         print(f"⚠️  Log file not found: {LOG_FILE}")
     
     # GENERATE REPORT
-    generate_report(df, dup_count, output_dir, output_path)
+    generate_report(df, dup_count, output_dir, output_path, pages_scraped)
     
     # FINAL SUMMARY
     print(f"\n{'='*60}")
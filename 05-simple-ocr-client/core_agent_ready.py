@@ -2,12 +2,19 @@
 # CORE GST ENGINE – AGENT READY (WITH ROLE ACCURACY + CACHE)
 # ============================================================
 
-import os, re, json, boto3
+import os, re, sys, json, boto3
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
 import xml.etree.ElementTree as ET
 
+# Shared Textract helpers live in the repo root
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from textract_utils import cluster_rows
+from profiling import profiled
+
 # ================= CONFIG =================
 
 OUTPUT_DIR = "output"
@@ -54,21 +61,18 @@ def run_ocr(file_path):
 # ================= OCR HELPERS =================
 
 def group_lines(blocks):
-    lines, words = [], [b for b in blocks if b["BlockType"] == "WORD"]
-    for w in words:
-        y = round(w["Geometry"]["BoundingBox"]["Top"], 3)
-        for ln in lines:
-            if abs(ln["y"] - y) <= 0.01:
-                ln["words"].append(w)
-                break
-        else:
-            lines.append({"y": y, "words": [w]})
+    words = [b for b in blocks if b["BlockType"] == "WORD"]
+    rows = cluster_rows(
+        words, lambda w: round(w["Geometry"]["BoundingBox"]["Top"], 3),
+        tol=0.01, inclusive=True
+    )
 
-    for ln in lines:
-        ln["words"].sort(key=lambda x: x["Geometry"]["BoundingBox"]["Left"])
-        ln["text"] = " ".join(w["Text"] for w in ln["words"])
+    lines = []
+    for y, row in rows:
+        row.sort(key=lambda x: x["Geometry"]["BoundingBox"]["Left"])
+        lines.append({"y": y, "words": row, "text": " ".join(w["Text"] for w in row)})
 
-    return sorted(lines, key=lambda x: x["y"])
+    return lines
 
 # ================= HEADER EXTRACTION (ADVANCED) =================
 
@@ -139,6 +143,7 @@ def extract_header_structured(lines, vendor_cache):
 
 # ================= MAIN CORE =================
 
+@profiled("process_invoice")
 def process_invoice(file_path):
     vendor_cache = load_vendor_cache()
 
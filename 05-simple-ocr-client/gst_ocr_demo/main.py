@@ -1,7 +1,15 @@
 import os
-import json
+import sys
 from datetime import datetime
 
+# Shared Textract helpers (repo root)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from textract_utils import BlockIndex, iter_blocks
+from result_sinks import open_sink
+from profiling import profiled
+
 # --- Pipeline folder से सही Imports ---
 from pipeline.invoice_number_extractor import extract_invoice_number
 from pipeline.total_amount_extractor import extract_total_amount
@@ -14,58 +22,48 @@ from pipeline.excel_writer import write_to_excel
 # --- CONFIG (As per your directory structure) ---
 TEXTRACT_DIR = "textract_json" 
 OUTPUT_DIR = "outputs"
+SINK_FORMAT = "jsonl"  # jsonl | sqlite | parquet
 
 if not os.path.exists(OUTPUT_DIR):
     os.makedirs(OUTPUT_DIR)
 
-def extract_kv_pairs(blocks):
+def extract_kv_pairs(index):
     """AWS Textract के ब्लॉक्स से Key-Value जोड़े (Forms) निकालना"""
     kvs = {}
-    key_map = {}
-    value_map = {}
-    block_map = {b['Id']: b for b in blocks}
 
     # पहले Keys और Values को मैप करें
-    for block in blocks:
-        if block['BlockType'] == "KEY_VALUE_SET":
-            if 'Relationships' in block:
-                if 'KEY' in block['EntityTypes']:
-                    key_id = [r['Ids'] for r in block['Relationships'] if r['Type'] == 'CHILD'][0]
-                    key_text = " ".join([block_map[i]['Text'] for i in key_id if i in block_map]).lower()
-                    
-                    # Value ID ढूँढें
-                    val_ids = [r['Ids'] for r in block['Relationships'] if r['Type'] == 'VALUE']
-                    if val_ids:
-                        kvs[key_text] = val_ids[0]
+    for block in index.blocks("KEY_VALUE_SET"):
+        if 'KEY' in block.get('EntityTypes', []) and index.children.get(block['Id']):
+            key_text = index.text(block).lower()
+
+            # Value blocks ढूँढें
+            val_blocks = index.value_blocks(block)
+            if val_blocks:
+                kvs[key_text] = val_blocks
     
-    # Value IDs को टेक्स्ट में बदलें
+    # Value blocks को टेक्स्ट में बदलें
     final_kvs = {}
-    for k, v_ids in kvs.items():
-        v_text = ""
-        for v_id in v_ids:
-            if v_id in block_map and 'Relationships' in block_map[v_id]:
-                child_ids = [r['Ids'] for r in block_map[v_id]['Relationships'] if r['Type'] == 'CHILD'][0]
-                v_text += " ".join([block_map[i]['Text'] for i in child_ids if i in block_map]) + " "
+    for k, v_blocks in kvs.items():
+        v_text = " ".join(index.text(v) for v in v_blocks)
         final_kvs[k.strip(": ")] = v_text.strip()
     return final_kvs
 
+@profiled("process_invoice")
 def process_invoice(json_path):
     """एक सिंगल इनवॉइस को प्रोसेस करना"""
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    
-    blocks = data.get("Blocks", [])
+    # Forms (KEY_VALUE_SET + WORD) और LINE ब्लॉक्स ही स्ट्रीम करें
+    index = BlockIndex(iter_blocks(json_path, {"KEY_VALUE_SET", "WORD", "LINE"}))
     file_name = os.path.basename(json_path)
     
     # 1. Key-Value pairs निकालें (Forms extraction)
-    kv_data = extract_kv_pairs(blocks)
+    kv_data = extract_kv_pairs(index)
     
     # 2. LINE ब्लॉक्स निकालें (Regex extractors के लिए)
     lines = [{
     "text": b.get("Text", ""), 
     "confidence": b.get("Confidence", 0),
     "geometry": b.get("Geometry", {}) # यह लाइन ज़रूरी है
-}   for b in blocks if b.get("BlockType") == "LINE"]
+}   for b in index.blocks("LINE")]
     
     # --- DATA EXTRACTION LOGIC ---
     
@@ -95,7 +93,7 @@ def process_invoice(json_path):
     total_amt = total_res.get("total_amount")
     
     # Inventories (Advanced table logic)
-    items = extract_inventories_advanced(blocks)
+    items = extract_inventories_advanced(index.blocks("LINE"))
 
     return {
         "file": file_name,
@@ -115,19 +113,22 @@ if __name__ == "__main__":
         if not files:
             print(f"⚠️ No JSON files found in '{TEXTRACT_DIR}'")
         else:
-            all_results = []
-            for f in files:
-                print(f"🔍 Processing: {f}")
-                try:
-                    res = process_invoice(os.path.join(TEXTRACT_DIR, f))
-                    all_results.append(res)
-                except Exception as e:
-                    print(f"❌ Error processing {f}: {e}")
-            
-            if all_results:
-                timestamp = datetime.now().strftime('%d%m%Y_%H%M')
-                output_path = os.path.join(OUTPUT_DIR, f"Final_Professional_Report_{timestamp}.xlsx")
-                write_to_excel(all_results, output_path)
-                print(f"\n✅ Success! Professional Excel created: {output_path}")
+            timestamp = datetime.now().strftime('%d%m%Y_%H%M')
+
+            # हर इनवॉइस तुरंत sink में सेव - crash पर भी पूरा हुआ काम बचा रहेगा
+            with open_sink(SINK_FORMAT, os.path.join(OUTPUT_DIR, f"results_{timestamp}")) as sink:
+                for f in files:
+                    print(f"🔍 Processing: {f}")
+                    try:
+                        res = process_invoice(os.path.join(TEXTRACT_DIR, f))
+                        sink.append(res)
+                    except Exception as e:
+                        print(f"❌ Error processing {f}: {e}")
+                
+                if sink.count:
+                    output_path = os.path.join(OUTPUT_DIR, f"Final_Professional_Report_{timestamp}.xlsx")
+                    write_to_excel(sink.results(), output_path)
+                    print(f"\n✅ Success! Professional Excel created: {output_path}")
+                    print(f"💾 Results saved: {sink.path}")
     else:
         print(f"❌ Error: Folder '{TEXTRACT_DIR}' not found.")
@@ -0,0 +1,118 @@
+try:
+    import numpy as np
+except ImportError:  # pure-Python scoring fallback
+    np = None
+
+# ============================================================
+# 🧮 CANDIDATE BATCH (column store)
+# ============================================================
+
+class CandidateBatch:
+    """
+    Collects candidate features column-wise
+    (amount, confidence, position ratio, keyword boost, penalties,
+    pattern id ...) so a whole pass is scored in one step.
+    """
+
+    def __init__(self, *fields):
+        self.fields = fields
+        self.columns = {f: [] for f in fields}
+
+    def add(self, **values):
+        for f in self.fields:
+            self.columns[f].append(values[f])
+
+    def __len__(self):
+        return len(self.columns[self.fields[0]]) if self.fields else 0
+
+# ============================================================
+# ⚖️ WEIGHT TABLES
+# ============================================================
+# A weight table is an ordered list of terms, added left to right:
+#   ("const",  None,   value)                     -> + value
+#   ("add",    column, None)                      -> + column
+#   ("lookup", column, (mapping, default))        -> + mapping.get(value, default)
+#   ("ratio",  column, (divisor, cap))            -> + min(column / divisor, cap)
+#   ("linear", column, (start, step))             -> + max(0, start + column * step)
+#   ("above",  column, [(threshold, points)...])  -> + points of the first threshold exceeded
+#   ("below",  column, [(threshold, points)...])  -> + points of the first threshold not reached
+#   ("each",   column, [(threshold, points)...])  -> + points of every threshold exceeded
+# Optional "floor" (e.g. 0) clamps the final score from below.
+
+def _term_python(kind, values, param):
+    if kind == "add":
+        return values
+    if kind == "lookup":
+        mapping, default = param
+        return [mapping.get(v, default) for v in values]
+    if kind == "ratio":
+        divisor, cap = param
+        return [min(v / divisor, cap) for v in values]
+    if kind == "linear":
+        start, step = param
+        return [max(0, start + v * step) for v in values]
+    if kind == "above":
+        return [next((p for t, p in param if v > t), 0) for v in values]
+    if kind == "below":
+        return [next((p for t, p in param if v < t), 0) for v in values]
+    raise ValueError(f"Unknown weight term: {kind}")
+
+
+def _term_numpy(kind, values, param):
+    if kind == "add":
+        return np.asarray(values, dtype=float)
+    if kind == "lookup":
+        mapping, default = param
+        return np.array([mapping.get(v, default) for v in values], dtype=float)
+    arr = np.asarray(values, dtype=float)
+    if kind == "ratio":
+        divisor, cap = param
+        return np.minimum(arr / divisor, cap)
+    if kind == "linear":
+        start, step = param
+        return np.maximum(0, start + arr * step)
+    if kind in ("above", "below"):
+        conds = [arr > t if kind == "above" else arr < t for t, _ in param]
+        return np.select(conds, [p for _, p in param], default=0)
+    raise ValueError(f"Unknown weight term: {kind}")
+
+
+def score_batch(batch, table, floor=None, digits=1):
+    """
+    Score every candidate of a batch with one weight table
+    Returns a list of floats rounded like the scalar code did.
+    """
+    n = len(batch)
+    if n == 0:
+        return []
+
+    if np is not None:
+        score = np.zeros(n)
+        for kind, column, param in table:
+            if kind == "const":
+                score = score + param
+            elif kind == "each":
+                arr = np.asarray(batch.columns[column], dtype=float)
+                for t, p in param:
+                    score = score + np.where(arr > t, p, 0)
+            else:
+                score = score + _term_numpy(kind, batch.columns[column], param)
+        if floor is not None:
+            score = np.maximum(floor, score)
+        scores = score.tolist()
+    else:
+        scores = [0] * n
+        for kind, column, param in table:
+            if kind == "const":
+                scores = [s + param for s in scores]
+            elif kind == "each":
+                for t, p in param:
+                    scores = [s + (p if v > t else 0) for s, v in zip(scores, batch.columns[column])]
+            else:
+                term = _term_python(kind, batch.columns[column], param)
+                scores = [s + v for s, v in zip(scores, term)]
+        if floor is not None:
+            scores = [max(floor, s) for s in scores]
+
+    # Python round() on every value - matches the per-candidate code exactly
+    return [round(s, digits) for s in scores]
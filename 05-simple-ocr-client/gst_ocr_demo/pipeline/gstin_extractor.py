@@ -1,10 +1,9 @@
-import re
+from ocr_patterns import GSTIN_RE
 
 def extract_gstins(lines_with_geo):
-    gst_re = r"\b\d{2}[A-Z]{5}\d{4}[A-Z]{1}[A-Z\d]{1}Z[A-Z\d]\b"
     all_found = []
     for i, line in enumerate(lines_with_geo):
-        m = re.search(gst_re, line['text'].upper())
+        m = GSTIN_RE.search(line['text'].upper())
         if m:
             all_found.append({"gst": m.group(0), "top": line['geometry']['BoundingBox']['Top'], "text": line['text']})
 
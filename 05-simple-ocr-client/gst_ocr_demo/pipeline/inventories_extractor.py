@@ -1,39 +1,37 @@
 import re
+from textract_utils import cluster_rows
+from ocr_patterns import KeywordMatcher
+
+HEADER_KEYS = KeywordMatcher(["description", "qty", "rate", "amount"])
+STOP_KEYS = KeywordMatcher(["total", "amount in words", "bank"])
+NUM_RE = re.compile(r"(\d+(?:,\d{3})*(?:\.\d{2,3})?)")
 
 def extract_inventories_advanced(blocks):
     inventory_rows = []
     lines = [b for b in blocks if b['BlockType'] == 'LINE']
     if not lines: return []
 
-    rows = {}
-    for b in lines:
-        t = b['Geometry']['BoundingBox']['Top']
-        found = False
-        for k in rows.keys():
-            if abs(k - t) < 0.012: # थोड़ी टॉलरेंस बढ़ाई गई है
-                rows[k].append(b)
-                found = True
-                break
-        if not found: rows[t] = [b]
+    # थोड़ी टॉलरेंस बढ़ाई गई है
+    rows = cluster_rows(lines, lambda b: b['Geometry']['BoundingBox']['Top'], tol=0.012)
 
     table_started = False
-    for t in sorted(rows.keys()):
-        parts = sorted(rows[t], key=lambda x: x['Geometry']['BoundingBox']['Left'])
+    for t, row in rows:
+        parts = sorted(row, key=lambda x: x['Geometry']['BoundingBox']['Left'])
         row_text = " ".join([p['Text'] for p in parts])
         low = row_text.lower()
 
         # हेडर पहचानना
-        if any(k in low for k in ["description", "qty", "rate", "amount"]):
+        if HEADER_KEYS.search(low):
             table_started = True
             continue
         
         if table_started:
-            if any(k in low for k in ["total", "amount in words", "bank"]): break
+            if STOP_KEYS.search(low): break
             
             # कॉलम आधारित एक्सट्रैक्शन
             item_desc = " ".join([p['Text'] for p in parts if p['Geometry']['BoundingBox']['Left'] < 0.45])
             # नंबर्स को ढूंढें और क्लीन करें (करेंसी सिंबल हटाएं)
-            nums = re.findall(r"(\d+(?:,\d{3})*(?:\.\d{2,3})?)", row_text.replace('₹', '').replace('Rs', ''))
+            nums = NUM_RE.findall(row_text.replace('₹', '').replace('Rs', ''))
             
             if len(item_desc) > 2 and len(nums) >= 1:
                 inventory_rows.append({
@@ -1,5 +1,7 @@
 import re
 from difflib import SequenceMatcher
+from ocr_patterns import KeywordMatcher
+from pipeline.candidate_scoring import CandidateBatch, score_batch
 
 # ============================================================
 # 🔒 ENHANCED KEYWORD CANON
@@ -13,11 +15,13 @@ INVOICE_KEYS = [
     "voucher no", "voucher number", "receipt no"
 ]
 
+INVOICE_MATCHER = KeywordMatcher(INVOICE_KEYS)
+
 # ============================================================
 # 🔒 ENHANCED REGEX PATTERNS (Priority Ordered)
 # ============================================================
 
-REGEX_PATTERNS = [
+REGEX_PATTERNS = [re.compile(p) for p in [
     # Explicit invoice label with colon/dash
     r"(?i)invoice(?:\s*number|\s*no|\.?\s*no)?\s*[:\-]\s*([A-Z0-9][A-Z0-9\/\-\#]{2,80})",
     
@@ -35,18 +39,20 @@ REGEX_PATTERNS = [
     
     # Pattern-only fallback (high recall)
     r"\b([A-Z]{2,5}[\-\/]?\d{3,8}[\-\/]?[A-Z0-9]{0,8})\b"
-]
+]]
 
 # ============================================================
 # ❌ HARD REJECT PATTERNS
 # ============================================================
 
-DATE_RE = r"\b(\d{2}[\/\-]\d{2}[\/\-]\d{2,4}|\d{4}[\/\-]\d{2}[\/\-]\d{2})\b"
-GSTIN_RE = r"\b\d{2}[A-Z]{5}\d{4}[A-Z]{1}[A-Z\d]{1}Z[A-Z\d]\b"
-VEHICLE_RE = r"^[A-Z]{2}\d{2}[A-Z]{1,2}\d{3,4}$"
-AMOUNT_RE = r"[₹\u20B9]\s*\d+(\.\d{2})?"
-PHONE_RE = r"\b\d{10}\b"
-PINCODE_RE = r"\b\d{6}\b"
+DATE_RE = re.compile(r"\b(\d{2}[\/\-]\d{2}[\/\-]\d{2,4}|\d{4}[\/\-]\d{2}[\/\-]\d{2})\b")
+GSTIN_RE = re.compile(r"\b\d{2}[A-Z]{5}\d{4}[A-Z]{1}[A-Z\d]{1}Z[A-Z\d]\b")
+VEHICLE_RE = re.compile(r"^[A-Z]{2}\d{2}[A-Z]{1,2}\d{3,4}$")
+AMOUNT_RE = re.compile(r"[₹\u20B9]\s*\d+(\.\d{2})?")
+PHONE_RE = re.compile(r"\b\d{10}\b")
+PINCODE_RE = re.compile(r"\b\d{6}\b")
+NON_DIGIT_RE = re.compile(r"[^\d]")
+SIMPLE_ID_RE = re.compile(r"\b([A-Z0-9]{3,}(?:[\-\/][A-Z0-9]+)*)\b")
 
 BAD_TOKENS = {
     "invoice", "tax invoice", "signature", "authorised", "authorized",
@@ -67,7 +73,7 @@ def is_valid_invoice_number(token: str) -> bool:
         return False
     
     # Check GSTIN pattern
-    if re.fullmatch(GSTIN_RE, token):
+    if GSTIN_RE.fullmatch(token):
         return False
     
     # Must have at least one digit
@@ -78,7 +84,7 @@ def is_valid_invoice_number(token: str) -> bool:
     has_letter = any(ch.isalpha() for ch in t)
     if not has_letter:
         try:
-            num = int(re.sub(r'[^\d]', '', token))
+            num = int(NON_DIGIT_RE.sub('', token))
             if num < 100:  # Too small to be invoice number
                 return False
         except:
@@ -93,11 +99,11 @@ def is_valid_invoice_number(token: str) -> bool:
         return False
     
     # Phone number check
-    if re.fullmatch(PHONE_RE, token):
+    if PHONE_RE.fullmatch(token):
         return False
     
     # Pincode check
-    if re.fullmatch(PINCODE_RE, token):
+    if PINCODE_RE.fullmatch(token):
         return False
     
     return True
@@ -110,25 +116,87 @@ def fuzzy_match_keyword(text: str, threshold: float = 0.8) -> bool:
     """Check if text fuzzy matches any invoice keyword"""
     text_lower = text.lower()
     for keyword in INVOICE_KEYS:
-        ratio = SequenceMatcher(None, text_lower, keyword).ratio()
-        if ratio >= threshold:
+        sm = SequenceMatcher(None, text_lower, keyword)
+        # cheap upper bounds first - ratio() only when they pass
+        if sm.real_quick_ratio() < threshold or sm.quick_ratio() < threshold:
+            continue
+        if sm.ratio() >= threshold:
             return True
     return False
 
+# ============================================================
+# ⚖️ SCORING WEIGHTS (pluggable - see candidate_scoring)
+# ============================================================
+
+PASS1_WEIGHTS = [
+    ("lookup", "source", ({"kv": 45, "table": 35}, 30)),  # Base score by source
+    ("ratio", "confidence", (2.5, 35)),                  # Confidence boost
+    ("linear", "pattern_id", (15, -3)),                  # Earlier patterns are more specific
+    ("add", "keyword_boost", None),                      # Keyword proximity (±2 lines)
+    ("below", "position_ratio", [(0.3, 10)]),            # Invoices usually in top 30%
+]
+
+FALLBACK_SCORE = 40  # Lower score for pass 2 fallback
+
 # ============================================================
 # 🧠 ENHANCED CORE EXTRACTOR
 # ============================================================
 
-def extract_invoice_number(textract_lines):
+def reject_reason(value: str):
+    """Hard reject checks for an extracted value (None = keep)"""
+    if DATE_RE.search(value):
+        return "date_pattern"
+    if GSTIN_RE.search(value):
+        return "gstin_pattern"
+    if VEHICLE_RE.fullmatch(value):
+        return "vehicle_number"
+    if AMOUNT_RE.search(value):
+        return "amount_pattern"
+    if not is_valid_invoice_number(value):
+        return "invalid_token"
+    return None
+
+def keyword_proximity(textract_lines: list, idx: int, exact: dict, fuzzy: dict) -> int:
+    """
+    Keyword boost of line idx from the ±2 line context
+    exact / fuzzy: per-line match caches shared by the whole document
+    """
+    window = range(max(0, idx - 2), min(len(textract_lines), idx + 3))
+    
+    def low(j):
+        return textract_lines[j].get("text", "").lower()
+    
+    # Exact keyword match
+    for j in window:
+        if j not in exact:
+            exact[j] = INVOICE_MATCHER.search(low(j))
+    if any(exact[j] for j in window):
+        return 25
+    # Fuzzy keyword match
+    for j in window:
+        if j not in fuzzy:
+            fuzzy[j] = fuzzy_match_keyword(low(j), 0.75)
+        if fuzzy[j]:
+            return 15
+    return 0
+
+def extract_invoice_number(textract_lines, debug=False):
     """
     Enhanced invoice number extraction with:
     - Better pattern matching
     - Fuzzy keyword matching
     - Multi-pass extraction
     - Improved confidence scoring
+    debug=True also returns one debug row per pattern match
     """
     candidates = []
     debug_rows = []
+    accepted_rows = []
+    matched_texts = set()   # lines that hit any pattern in pass 1
+    keyword_boosts = {}     # idx -> keyword proximity (once per line)
+    exact_hits, fuzzy_hits = {}, {}
+    
+    batch = CandidateBatch("source", "confidence", "pattern_id", "keyword_boost", "position_ratio")
     
     # Pass 1: Pattern-based extraction
     for idx, item in enumerate(textract_lines):
@@ -141,95 +209,57 @@ def extract_invoice_number(textract_lines):
         
         # Try each pattern
         for pattern_idx, pattern in enumerate(REGEX_PATTERNS):
-            match = re.search(pattern, text)
+            match = pattern.search(text)
             if not match:
                 continue
             
             value = match.group(1).strip()
+            matched_texts.add(text)
             
-            debug = {
-                "raw_text": text,
-                "extracted_value": value,
-                "source": source,
-                "confidence": confidence,
-                "pattern_used": pattern_idx,
-                "score": None,
-                "rejected": None
-            }
+            row = None
+            if debug:
+                row = {
+                    "raw_text": text,
+                    "extracted_value": value,
+                    "source": source,
+                    "confidence": confidence,
+                    "pattern_used": pattern_idx,
+                    "score": None,
+                    "rejected": None
+                }
+                debug_rows.append(row)
             
             # ❌ HARD REJECTS
-            if re.search(DATE_RE, value):
-                debug["rejected"] = "date_pattern"
-                debug_rows.append(debug)
+            reason = reject_reason(value)
+            if reason:
+                if row is not None:
+                    row["rejected"] = reason
                 continue
             
-            if re.search(GSTIN_RE, value):
-                debug["rejected"] = "gstin_pattern"
-                debug_rows.append(debug)
-                continue
-            
-            if re.fullmatch(VEHICLE_RE, value):
-                debug["rejected"] = "vehicle_number"
-                debug_rows.append(debug)
-                continue
-            
-            if re.search(AMOUNT_RE, value):
-                debug["rejected"] = "amount_pattern"
-                debug_rows.append(debug)
-                continue
-            
-            if not is_valid_invoice_number(value):
-                debug["rejected"] = "invalid_token"
-                debug_rows.append(debug)
-                continue
-            
-            # ✅ ENHANCED SCORING
-            score = 0
-            
-            # Base score by source
-            if source == "kv":
-                score += 45
-            elif source == "table":
-                score += 35
-            else:
-                score += 30
-            
-            # Confidence boost
-            if confidence:
-                score += min(confidence / 2.5, 35)
-            
-            # Pattern priority boost (earlier patterns are more specific)
-            score += max(0, 15 - (pattern_idx * 3))
-            
-            # 🔑 Keyword proximity (±2 lines for better context)
-            context_texts = []
-            for j in range(max(0, idx - 2), min(len(textract_lines), idx + 3)):
-                context_texts.append(textract_lines[j].get("text", "").lower())
-            
-            # Exact keyword match
-            if any(k in ctx for ctx in context_texts for k in INVOICE_KEYS):
-                score += 25
-            # Fuzzy keyword match
-            elif any(fuzzy_match_keyword(ctx, 0.75) for ctx in context_texts):
-                score += 15
-            
-            # Position boost (invoices usually in top 30%)
-            position_ratio = idx / len(textract_lines)
-            if position_ratio < 0.3:
-                score += 10
-            
-            score = round(score, 1)
-            
-            debug["score"] = score
-            debug["rejected"] = "accepted"
-            debug_rows.append(debug)
+            if idx not in keyword_boosts:
+                keyword_boosts[idx] = keyword_proximity(textract_lines, idx, exact_hits, fuzzy_hits)
             
+            batch.add(
+                source=source,
+                confidence=confidence or 0,
+                pattern_id=pattern_idx,
+                keyword_boost=keyword_boosts[idx],
+                position_ratio=idx / len(textract_lines)
+            )
             candidates.append({
                 "invoice_no": value,
-                "score": score,
+                "score": None,
                 "raw_text": text,
                 "confidence": confidence
             })
+            accepted_rows.append(row)
+    
+    # ✅ ENHANCED SCORING - whole pass in one step
+    for cand, row, score in zip(candidates, accepted_rows, score_batch(batch, PASS1_WEIGHTS)):
+        cand["score"] = score
+        if row is not None:
+            row["score"] = score
+            row["rejected"] = "accepted"
     
     # ========================================================
     # 🧯 PASS 2: If no good candidates, try relaxed patterns
@@ -241,19 +271,17 @@ def extract_invoice_number(textract_lines):
             text = (item.get("text") or "").strip()
             
             # Skip if already processed
-            if any(d.get("raw_text") == text for d in debug_rows):
+            if text in matched_texts:
                 continue
             
             # Look for simple patterns like: ABC123, 123-456, etc.
-            simple_pattern = r"\b([A-Z0-9]{3,}(?:[\-\/][A-Z0-9]+)*)\b"
-            matches = re.findall(simple_pattern, text)
+            matches = SIMPLE_ID_RE.findall(text)
             
             for value in matches:
                 if is_valid_invoice_number(value):
-                    score = 40  # Lower score for fallback
                     candidates.append({
                         "invoice_no": value,
-                        "score": score,
+                        "score": FALLBACK_SCORE,
                         "raw_text": text,
                         "confidence": item.get("confidence", 0)
                     })
@@ -312,7 +340,7 @@ def test_extractor():
         {"text": "Date: 01/01/2024", "confidence": 99.0, "source": "line"},
     ]
     
-    result = extract_invoice_number(test_lines)
+    result = extract_invoice_number(test_lines, debug=True)
     print("Test Result:", result)
     return result
 
@@ -1,16 +1,17 @@
-import re
+from ocr_patterns import KeywordMatcher, AMOUNT_RE
+
+STRONG_TOTAL_KEYS = KeywordMatcher(["grand total", "total amount", "payable"])
 
 def extract_total_amount(lines):
-    amt_re = r"(\d{1,3}(?:,\d{3})*(?:\.\d{2}))"
     candidates = []
     
     for item in lines:
         text = item.get("text", "").lower()
-        match = re.search(amt_re, text)
+        match = AMOUNT_RE.search(text)
         if match:
             clean_amt = float(match.group(1).replace(",", ""))
             score = 0
-            if any(k in text for k in ["grand total", "total amount", "payable"]): score += 100
+            if STRONG_TOTAL_KEYS.search(text): score += 100
             elif "total" in text: score += 50
             
             candidates.append({"amt": match.group(1), "val": clean_amt, "score": score})
@@ -1,4 +1,6 @@
 import re
+from ocr_patterns import KeywordMatcher
+from pipeline.candidate_scoring import CandidateBatch, score_batch
 
 # ============================================================
 # 🔒 ENHANCED AMOUNT KEYWORDS
@@ -27,6 +29,22 @@ NEGATIVE_KEYS = [
     "rate", "price", "unit price"
 ]
 
+# One-scan matchers over the keyword lists above
+AMOUNT_MATCHER = KeywordMatcher(AMOUNT_KEYS)
+NEGATIVE_MATCHER = KeywordMatcher(NEGATIVE_KEYS)
+
+# Bit i = AMOUNT_KEYS[i]; lowest set bit = first key in list order
+AMOUNT_BITS = {k: 1 << i for i, k in enumerate(AMOUNT_KEYS)}
+KEYWORD_BOOST_BY_BIT = [
+    30 if k in ["grand total", "net payable", "total payable"]
+    else 25 if k in ["total amount", "invoice total"]
+    else 15
+    for k in AMOUNT_KEYS
+]
+
+# Keywords that can straddle the " " between two joined context lines
+BRIDGE_LEN = max(len(k) for k in AMOUNT_KEYS) - 1
+
 # ============================================================
 # 🔒 ENHANCED CURRENCY PATTERNS
 # ============================================================
@@ -94,82 +112,125 @@ def is_valid_total_amount(amount: float, idx: int, total_lines: int) -> dict:
     return {"is_valid": True, "reason": "valid"}
 
 # ============================================================
-# 🔍 CONTEXT ANALYZER
+# 🧮 LINE KEYWORD MASKS + SLIDING CONTEXT
 # ============================================================
 
-def analyze_context(text: str, nearby_lines: list) -> dict:
+def amount_mask(text_lower: str) -> int:
+    """AMOUNT_KEYS hits of one line as a bitmask"""
+    mask = 0
+    for key in AMOUNT_MATCHER.find_all(text_lower):
+        mask |= AMOUNT_BITS[key]
+    return mask
+
+def context_adjustments(lines: list) -> list:
     """
-    Analyze surrounding context for amount extraction
-    Returns scoring adjustments
+    Keyword boost / negative penalty for every line in one pass
+    A line's own first AMOUNT_KEYS hit sets the boost; otherwise a hit
+    in the ±2 neighbouring lines (joined with spaces) gives 10.
+    Keyword masks are computed once per line; the context hit of
+    line i is the OR of the masks of lines i-2..i+2 (excluding i), plus
+    keywords spanning the join of two neighbours.
     """
-    text_lower = text.lower()
-    context = " ".join([line.lower() for line in nearby_lines])
-    
-    score_adjustments = {
-        "keyword_boost": 0,
-        "negative_penalty": 0,
-        "position_boost": 0
-    }
-    
-    # Check for positive keywords
-    for key in AMOUNT_KEYS:
-        if key in text_lower:
-            if key in ["grand total", "net payable", "total payable"]:
-                score_adjustments["keyword_boost"] = 30
-            elif key in ["total amount", "invoice total"]:
-                score_adjustments["keyword_boost"] = 25
-            else:
-                score_adjustments["keyword_boost"] = 15
-            break
-    
-    # Check context (±1 line)
-    for key in AMOUNT_KEYS:
-        if key in context and score_adjustments["keyword_boost"] == 0:
-            score_adjustments["keyword_boost"] = 10
-            break
-    
-    # Check for negative keywords
-    for neg_key in NEGATIVE_KEYS:
-        if neg_key in text_lower:
+    lows = [(line.get("text") or "").lower() for line in lines]
+    masks = [amount_mask(low) for low in lows]
+    n = len(lines)
+    padded = [0, 0] + masks + [0, 0]
+
+    def bridge(a, b):
+        return AMOUNT_MATCHER.search(lows[a][-BRIDGE_LEN:] + " " + lows[b][:BRIDGE_LEN])
+
+    adjustments = []
+    for idx in range(n):
+        score_adjustments = {
+            "keyword_boost": 0,
+            "negative_penalty": 0,
+            "position_boost": 0
+        }
+
+        mask = masks[idx]
+        if mask:
+            first_bit = (mask & -mask).bit_length() - 1
+            score_adjustments["keyword_boost"] = KEYWORD_BOOST_BY_BIT[first_bit]
+        else:
+            # sliding ±2 window over the masks
+            hit = padded[idx] | padded[idx + 1] | padded[idx + 3] | padded[idx + 4]
+            if not hit:
+                window = [j for j in (idx - 2, idx - 1, idx + 1, idx + 2) if 0 <= j < n]
+                hit = any(bridge(a, b) for a, b in zip(window, window[1:]))
+            if hit:
+                score_adjustments["keyword_boost"] = 10
+
+        if NEGATIVE_MATCHER.search(lows[idx]):
             score_adjustments["negative_penalty"] = -20
-            break
-    
-    return score_adjustments
+
+        adjustments.append(score_adjustments)
+    return adjustments
+
+# ============================================================
+# ⚖️ SCORING WEIGHTS (pluggable - see candidate_scoring)
+# ============================================================
+
+WEIGHTS = {
+    # Pass 1: with currency symbol
+    "currency_symbol": [
+        ("const", None, 45),                                   # Base score
+        ("ratio", "confidence", (2, 25)),                      # Confidence boost
+        ("add", "keyword_boost", None),                        # Context adjustments
+        ("add", "negative_penalty", None),
+        ("above", "position_ratio", [(0.65, 20), (0.5, 10)]),  # Bottom 35% / 50%
+        ("each", "amount", [(10000, 5), (100000, 5)]),         # Larger amounts more likely totals
+    ],
+    # Pass 2: without symbol (lower base score)
+    "no_symbol": [
+        ("const", None, 35),
+        ("ratio", "confidence", (2, 20)),
+        ("add", "keyword_boost", None),
+        ("add", "negative_penalty", None),
+        ("above", "position_ratio", [(0.65, 15)]),
+    ],
+}
+
+CANDIDATE_FIELDS = ("amount", "confidence", "position_ratio", "keyword_boost", "negative_penalty")
+
+def score_pass(batch, rows, pattern, candidates):
+    """Score one pass in a single step and record the candidates"""
+    scores = score_batch(batch, WEIGHTS[pattern], floor=0)
+    for amt, row, score in zip(batch.columns["amount"], rows, scores):
+        candidates.append((amt, score))
+        if row is not None:
+            row["score"] = score
 
 # ============================================================
 # 🧠 ENHANCED CORE EXTRACTOR
 # ============================================================
 
-def extract_total_amount(lines):
+def extract_total_amount(lines, debug=False):
     """
     Enhanced total amount extraction with:
     - Multiple currency pattern support
     - Better context analysis
     - Improved validation
     - Multi-pass extraction
+    debug=True also returns one debug row per amount looked at
     """
     candidates = []
-    debug = []
+    debug_rows = []
+    accepted_texts = set()  # lines that produced an accepted candidate
     
     total_lines = len(lines)
+    contexts = context_adjustments(lines)
     
     # Pass 1: Extract with currency symbol
+    batch, rows = CandidateBatch(*CANDIDATE_FIELDS), []
     for idx, item in enumerate(lines):
         text = (item.get("text") or "").strip()
-        low = text.lower()
         conf = item.get("confidence", 0)
         
         if not text:
             continue
         
-        # Get nearby context (±2 lines)
-        nearby_lines = []
-        for j in range(max(0, idx - 2), min(len(lines), idx + 3)):
-            if j != idx:
-                nearby_lines.append(lines[j].get("text", ""))
-        
-        # Analyze context
-        context_analysis = analyze_context(text, nearby_lines)
+        # Context (±2 lines) from the precomputed masks
+        context_analysis = contexts[idx]
         
         # Try Pattern 1 (with currency symbol)
         for m in CURRENCY_PATTERN_1.finditer(text):
@@ -179,71 +240,57 @@ def extract_total_amount(lines):
             
             validation = is_valid_total_amount(amt, idx, total_lines)
             if not validation["is_valid"]:
-                debug.append({
-                    "raw_text": text,
-                    "extracted_amount": amt,
-                    "score": 0,
-                    "confidence": conf,
-                    "rejected": validation["reason"]
-                })
+                if debug:
+                    debug_rows.append({
+                        "raw_text": text,
+                        "extracted_amount": amt,
+                        "score": 0,
+                        "confidence": conf,
+                        "rejected": validation["reason"]
+                    })
                 continue
             
-            # Calculate score
-            score = 45  # Base score for currency symbol pattern
-            
-            # Confidence boost
-            score += min(conf / 2, 25)
-            
-            # Context adjustments
-            score += context_analysis["keyword_boost"]
-            score += context_analysis["negative_penalty"]
+            batch.add(
+                amount=amt,
+                confidence=conf,
+                position_ratio=idx / total_lines,
+                keyword_boost=context_analysis["keyword_boost"],
+                negative_penalty=context_analysis["negative_penalty"]
+            )
+            accepted_texts.add(text)
             
-            # Position boost (amounts in bottom 35%)
-            position_ratio = idx / total_lines
-            if position_ratio > 0.65:
-                score += 20
-            elif position_ratio > 0.5:
-                score += 10
-            
-            # Amount size heuristic (larger amounts more likely to be totals)
-            if amt > 10000:
-                score += 5
-            if amt > 100000:
-                score += 5
-            
-            score = round(max(0, score), 1)
-            
-            candidates.append((amt, score))
-            debug.append({
-                "raw_text": text,
-                "extracted_amount": amt,
-                "score": score,
-                "confidence": conf,
-                "rejected": "accepted",
-                "pattern": "currency_symbol"
-            })
+            row = None
+            if debug:
+                row = {
+                    "raw_text": text,
+                    "extracted_amount": amt,
+                    "score": None,
+                    "confidence": conf,
+                    "rejected": "accepted",
+                    "pattern": "currency_symbol"
+                }
+                debug_rows.append(row)
+            rows.append(row)
+    
+    score_pass(batch, rows, "currency_symbol", candidates)
     
     # Pass 2: If no good candidates, try without currency symbol
     if not candidates or max([c[1] for c in candidates]) < 50:
+        batch, rows = CandidateBatch(*CANDIDATE_FIELDS), []
         for idx, item in enumerate(lines):
             text = (item.get("text") or "").strip()
             low = text.lower()
             conf = item.get("confidence", 0)
             
             # Skip if already processed
-            if any(d.get("raw_text") == text and d.get("rejected") == "accepted" for d in debug):
+            if text in accepted_texts:
                 continue
             
             # Only process if has amount keywords
-            if not any(key in low for key in AMOUNT_KEYS):
+            if not AMOUNT_MATCHER.search(low):
                 continue
             
-            nearby_lines = []
-            for j in range(max(0, idx - 2), min(len(lines), idx + 3)):
-                if j != idx:
-                    nearby_lines.append(lines[j].get("text", ""))
-            
-            context_analysis = analyze_context(text, nearby_lines)
+            context_analysis = contexts[idx]
             
             # Try Pattern 2 (without symbol)
             for m in CURRENCY_PATTERN_2.finditer(text):
@@ -255,27 +302,29 @@ def extract_total_amount(lines):
                 if not validation["is_valid"]:
                     continue
                 
-                # Lower base score for no-symbol pattern
-                score = 35
-                score += min(conf / 2, 20)
-                score += context_analysis["keyword_boost"]
-                score += context_analysis["negative_penalty"]
-                
-                position_ratio = idx / total_lines
-                if position_ratio > 0.65:
-                    score += 15
-                
-                score = round(max(0, score), 1)
+                batch.add(
+                    amount=amt,
+                    confidence=conf,
+                    position_ratio=idx / total_lines,
+                    keyword_boost=context_analysis["keyword_boost"],
+                    negative_penalty=context_analysis["negative_penalty"]
+                )
+                accepted_texts.add(text)
                 
-                candidates.append((amt, score))
-                debug.append({
-                    "raw_text": text,
-                    "extracted_amount": amt,
-                    "score": score,
-                    "confidence": conf,
-                    "rejected": "accepted",
-                    "pattern": "no_symbol"
-                })
+                row = None
+                if debug:
+                    row = {
+                        "raw_text": text,
+                        "extracted_amount": amt,
+                        "score": None,
+                        "confidence": conf,
+                        "rejected": "accepted",
+                        "pattern": "no_symbol"
+                    }
+                    debug_rows.append(row)
+                rows.append(row)
+        
+        score_pass(batch, rows, "no_symbol", candidates)
     
     # ========================================================
     # 🧯 FINAL DECISION
@@ -286,7 +335,7 @@ def extract_total_amount(lines):
             "total_amount": None,
             "status": "EXCEPT",
             "score": 0,
-            "debug": debug
+            "debug": debug_rows
         }
     
     # Sort by score
@@ -312,7 +361,7 @@ def extract_total_amount(lines):
         "total_amount": best[0],
         "status": status,
         "score": best[1],
-        "debug": debug
+        "debug": debug_rows
     }
 
 
@@ -330,7 +379,7 @@ def test_extractor():
         {"text": "Grand Total: ₹944.00", "confidence": 99.5, "source": "line"},
     ]
     
-    result = extract_total_amount(test_lines)
+    result = extract_total_amount(test_lines, debug=True)
     print("Test Result:", result)
     return result
 
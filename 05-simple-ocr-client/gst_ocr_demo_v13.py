@@ -9,11 +9,17 @@ from datetime import datetime
 import pandas as pd
 import boto3
 
+# Shared pattern registry (repo root)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from ocr_patterns import KeywordMatcher
+
 # ================= CONFIG =================
 
 REGION = "ap-south-1"
 
-GSTIN_REGEX = r"\b\d{2}[A-Z]{5}\d{4}[A-Z][1-9A-Z]Z[0-9A-Z]\b"
+GSTIN_REGEX = re.compile(r"\b\d{2}[A-Z]{5}\d{4}[A-Z][1-9A-Z]Z[0-9A-Z]\b")
 
 ASSIST_ONLY_FIELDS = {
     "supplier_gstin",
@@ -41,10 +47,16 @@ IGNORE_KEYWORDS = [
 
 INVOICE_KEYS = ["invoice", "tax invoice", "bill no", "inv no"]
 DATE_REGEXES = [
-    r"\b\d{2}[-/]\d{2}[-/]\d{4}\b",
-    r"\b\d{4}[-/]\d{2}[-/]\d{2}\b"
+    re.compile(r"\b\d{2}[-/]\d{2}[-/]\d{4}\b"),
+    re.compile(r"\b\d{4}[-/]\d{2}[-/]\d{2}\b")
 ]
 
+IGNORE_MATCHER = KeywordMatcher(IGNORE_KEYWORDS)
+INVOICE_MATCHER = KeywordMatcher(INVOICE_KEYS)
+NUMBER_RE = re.compile(r"\d+\.\d+|\d+")
+DECIMAL_RE = re.compile(r"\d+\.\d+")
+QTY_X_RE = re.compile(r"\d+\s*x\s*\d+")
+
 # ================= TEXTRACT =================
 
 def get_textract():
@@ -66,26 +78,26 @@ def textract_lines(file_path):
 
 def normalize_amount(txt):
     txt = txt.replace(",", "").replace("₹", "")
-    m = re.findall(r"\d+\.\d+|\d+", txt)
+    m = NUMBER_RE.findall(txt)
     return float(m[0]) if m else None
 
 def find_invoice_no(lines):
     for i, (l, _) in enumerate(lines):
-        if any(k in l.lower() for k in INVOICE_KEYS):
+        if INVOICE_MATCHER.search(l.lower()):
             return l[:40]
     return "NA"
 
 def find_invoice_date(lines):
     for l, _ in lines:
         for r in DATE_REGEXES:
-            m = re.search(r, l)
+            m = r.search(l)
             if m:
                 return m.group()
     return "NA"
 
 def extract_gstins(lines):
     text = " ".join([l for l, _ in lines])
-    found = re.findall(GSTIN_REGEX, text)
+    found = GSTIN_REGEX.findall(text)
     unique = list(dict.fromkeys(found))
     if len(unique) >= 2:
         return unique[0], "HIGH", unique[1], "HIGH"
@@ -98,11 +110,11 @@ def extract_gstins(lines):
 def inventory_score(line):
     score = 0
     low = line.lower()
-    if any(k in low for k in IGNORE_KEYWORDS):
+    if IGNORE_MATCHER.search(low):
         score -= 5
-    if re.search(r"\d+\.\d+", line):
+    if DECIMAL_RE.search(line):
         score += 2
-    if re.search(r"\d+\s*x\s*\d+", low):
+    if QTY_X_RE.search(low):
         score += 3
     return score
 
@@ -4,10 +4,16 @@
 
 import os, re, sys, socket
 import boto3
-import pandas as pd
 from pathlib import Path
 from datetime import datetime
 
+# Shared Textract helpers live in the repo root
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from textract_utils import BlockIndex, cluster_rows
+from excel_rollover import RolloverWorkbook, write_records
+
 # ================= CONFIG =================
 PRODUCT_MODE = "PRO"
 INPUT_DIR = "input"
@@ -56,24 +62,19 @@ def analyze_document_bytes(file_path):
     )["Blocks"]
 
 # ================= LINE GROUP =================
-def line_groups(blocks):
-    words = [b for b in blocks if b["BlockType"] == "WORD"]
-    lines = []
+def line_groups(index):
+    words = index.blocks("WORD")
+    rows = cluster_rows(
+        words, lambda w: round(w["Geometry"]["BoundingBox"]["Top"], 3),
+        tol=0.01, inclusive=True
+    )
 
-    for w in words:
-        y = round(w["Geometry"]["BoundingBox"]["Top"], 3)
-        for ln in lines:
-            if abs(ln["y"] - y) <= 0.01:
-                ln["words"].append(w)
-                break
-        else:
-            lines.append({"y": y, "words": [w]})
-
-    for ln in lines:
-        ln["words"].sort(key=lambda x: x["Geometry"]["BoundingBox"]["Left"])
-        ln["text"] = " ".join(w["Text"] for w in ln["words"])
+    lines = []
+    for y, row in rows:
+        row.sort(key=lambda x: x["Geometry"]["BoundingBox"]["Left"])
+        lines.append({"y": y, "words": row, "text": " ".join(w["Text"] for w in row)})
 
-    return sorted(lines, key=lambda x: x["y"])
+    return lines
 
 # ================= HEADER =================
 def extract_supplier(lines):
@@ -119,25 +120,8 @@ def extract_invoice_gst_rate(lines):
     return 9.0, 9.0   # SAFE DEFAULT (MOBILE)
 
 # ================= TABLE EXTRACTION =================
-def extract_tables(blocks):
-    block_map = {b["Id"]: b for b in blocks}
-    tables = []
-
-    for b in blocks:
-        if b["BlockType"] == "TABLE":
-            rows = {}
-            for rel in b.get("Relationships", []):
-                for cid in rel.get("Ids", []):
-                    cell = block_map[cid]
-                    if cell["BlockType"] == "CELL":
-                        text = ""
-                        for r in cell.get("Relationships", []):
-                            for wid in r.get("Ids", []):
-                                if block_map[wid]["BlockType"] == "WORD":
-                                    text += block_map[wid]["Text"] + " "
-                        rows.setdefault(cell["RowIndex"], {})[cell["ColumnIndex"]] = text.strip()
-            tables.append(rows)
-    return tables
+def extract_tables(index):
+    return index.tables()
 
 # ================= MAIN =================
 def main():
@@ -150,8 +134,9 @@ def main():
 
     for pdf in Path(INPUT_DIR).glob("*.pdf"):
         blocks = analyze_document_bytes(pdf)
-        lines = line_groups(blocks)
-        tables = extract_tables(blocks)
+        index = BlockIndex(blocks)
+        lines = line_groups(index)
+        tables = extract_tables(index)
 
         supplier_name = extract_supplier(lines)
         supplier_gstin, buyer_gstin = extract_gstins(lines)
@@ -242,14 +227,17 @@ def main():
     }]
 
     out = os.path.join(OUTPUT_DIR, f"GST_PRO_{datetime.now().strftime('%H%M')}.xlsx")
-    with pd.ExcelWriter(out, engine="xlsxwriter") as w:
-        pd.DataFrame(invoices).to_excel(w, "Invoices", index=False)
-        pd.DataFrame(sales).to_excel(w, "Tally_Sales", index=False)
-        pd.DataFrame(inventory).to_excel(w, "Tally_Inventory", index=False)
-        pd.DataFrame(missing).to_excel(w, "Missing_Fields", index=False)
-        pd.DataFrame(dashboard).to_excel(w, "Dashboard", index=False)
+    # streaming sheets: Tally_Inventory (2), _part2.xlsx ... past the row limit
+    with RolloverWorkbook(out) as book:
+        write_records(book, "Invoices", invoices)
+        write_records(book, "Tally_Sales", sales)
+        write_records(book, "Tally_Inventory", inventory)
+        write_records(book, "Missing_Fields", missing)
+        write_records(book, "Dashboard", dashboard)
 
     print("✅ PRO DONE:", out)
+    for extra in book.files[1:]:
+        print("   ➕ continued in:", extra)
 
 if __name__ == "__main__":
     main()
@@ -1,5 +1,17 @@
-import os, json, sys
+import os, sys, argparse, inspect
+import multiprocessing as mp
 from config import MODE, get_mode_config
+
+# Shared Textract helpers (repo root)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, ROOT_DIR)
+import textract_utils
+import ocr_patterns
+from textract_utils import load_columns, build_sidecars
+from result_sinks import open_sink, SINK_TYPES
+import profiling
+from profiling import profiled, span
+
 CFG = get_mode_config()
 from pipeline.invoice_number_extractor import extract_invoice_number
 from pipeline.invoice_date_extractor import extract_invoice_date
@@ -9,65 +21,190 @@ from pipeline.total_amount_extractor import extract_total_amount
 from pipeline.inventories_extractor import extract_inventories_advanced
 from pipeline.excel_writer import write_excel
 from pipeline.buyer_gstin_extractor import extract_buyer_gstin
+from pipeline.result_cache import ResultCache, extractor_fingerprints
+from pipeline.line_features import scan_lines
+
+# Set by run_elite_run (inherited / passed to pool workers)
+RESULT_CACHE = None
+
+# process_invoice result keys, in output order
+RESULT_KEYS = [
+    "invoice_no", "invoice_date", "supplier_name", "buyer_name", "supplier_gstin",
+    "buyer_gstin", "buyer_gstin_conf", "total_amount", "inventories"
+]
+
+@profiled("process_invoice")
+def process_invoice(json_file, groups=None):
+    """
+    groups: field groups (FIELD_GROUPS) to extract, None = all
+    The result cache passes only the stale groups of a cached invoice;
+    the result then holds just their keys (+ "file" and any inputs
+    they needed, e.g. inventories for total_amount).
+    """
+    want = (lambda g: True) if groups is None else groups.__contains__
 
-def process_invoice(json_file):
-    with open(json_file, "r", encoding="utf-8") as f:
-        blocks = json.load(f).get("Blocks", [])
+    # Only LINE blocks, as columns (text list + Top / Left arrays) -
+    # memory-mapped sidecar if built, else streamed from the JSON
+    with span("load_columns") as sp:
+        cols = load_columns(json_file, {"LINE"})
+        sp.set(rows_out=len(cols))
     
     file_name = os.path.basename(json_file)
     
     # यहाँ वेरिएबल का नाम 'lines' रखें ताकि extract_names(lines) काम करे
-    lines = [{"text": b.get("Text", ""), "geometry": b.get("Geometry", {})} 
-             for b in blocks if b.get("BlockType") == "LINE"]
+    lines = [{"text": text, "top": top} for text, top in zip(cols.texts(), cols.floats("top"))]
+
+    # One fused pass: lowercase, GSTIN/date/amount matches, keyword hits
+    # (every extractor below reuses these features)
+    with span("scan_lines", rows_in=len(lines)):
+        scan_lines(lines)
+
+    values = {}
 
     # Extraction Calls
-    inv_no = extract_invoice_number(lines).get("invoice_no", "N/A")
-    inv_date = extract_invoice_date(lines).get("invoice_date", "N/A")
-    gst_info = extract_gstins(lines)
-    supplier_gstin = gst_info.get("supplier_gstin")
-
-    buyer_gstin_info = extract_buyer_gstin(
-    lines,
-    supplier_gstin=supplier_gstin
-)
-
-    buyer_gstin = buyer_gstin_info["buyer_gstin"]
-    buyer_gstin_conf = buyer_gstin_info["confidence"]
+    with span("extract_fields", rows_in=len(lines)):
+        if want("invoice_no"):
+            values["invoice_no"] = extract_invoice_number(lines).get("invoice_no", "N/A")
+        if want("invoice_date"):
+            values["invoice_date"] = extract_invoice_date(lines).get("invoice_date", "N/A")
+        if want("supplier_gstin") or want("buyer_gstin"):
+            gst_info = extract_gstins(lines)
+            supplier_gstin = gst_info.get("supplier_gstin")
+            values["supplier_gstin"] = gst_info.get("supplier_gstin", "N/A")
+
+        if want("buyer_gstin"):
+            buyer_gstin_info = extract_buyer_gstin(
+                lines,
+                supplier_gstin=supplier_gstin
+            )
+
+            values["buyer_gstin"] = buyer_gstin_info["buyer_gstin"]
+            values["buyer_gstin_conf"] = buyer_gstin_info["confidence"]
     
-    # Error Fix: अब 'lines' यहाँ परिभाषित है
-    buyer_name, supplier_name = extract_names(lines)
+        # Error Fix: अब 'lines' यहाँ परिभाषित है
+        if want("names"):
+            values["buyer_name"], values["supplier_name"] = extract_names(lines)
     
-    total_val = extract_total_amount(lines).get("total_amount", 0)
-    items = extract_inventories_advanced(blocks)
+    if want("inventories") or want("total_amount"):
+        with span("extract_inventories") as sp:
+            items = extract_inventories_advanced(cols)
+            sp.set(rows_in=len(cols), rows_out=len(items))
+        values["inventories"] = items
     #Fallback Logic: यदि सीधा टोटल नहीं मिला, तो आइटम अमाउंट्स को जोड़ें
-    total_extracted = extract_total_amount(lines).get("total_amount", 0)
-    calculated_total = sum(float(str(i.get("amount", 0)).replace(',', '')) for i in items)
-    final_total = total_extracted if total_extracted > 0 else calculated_total
-
-    result = {
-        "file": file_name,
-        "invoice_no": inv_no,
-        "invoice_date": inv_date,      
-        "supplier_name": supplier_name,
-        "buyer_name": buyer_name,
-        "supplier_gstin": gst_info.get("supplier_gstin", "N/A"),
-        "buyer_gstin": buyer_gstin,
-        "buyer_gstin_conf": buyer_gstin_conf,
-        "total_amount": final_total,
-        "inventories": items
-    }
+    if want("total_amount"):
+        total_extracted = extract_total_amount(lines).get("total_amount", 0)
+        calculated_total = sum(float(str(i.get("amount", 0)).replace(',', '')) for i in items)
+        values["total_amount"] = total_extracted if total_extracted > 0 else calculated_total
+
+    result = {"file": file_name}
+    result.update((key, values[key]) for key in RESULT_KEYS if key in values)
     
     dbg = []
-    if inv_no == "N/A":
+    if want("invoice_no") and values["invoice_no"] == "N/A":
         dbg.append({"file": file_name, "field": "Invoice No", "value": "Missing"})
     
     return result, dbg
 
 
 
-def run_elite_run():
+def process_invoice_safe(json_file):
+    """
+    Per-file error isolation: (result, debug, error) instead of raising
+    Unchanged files come straight from RESULT_CACHE when enabled; if
+    only some extractors changed, just their field groups are re-run.
+    """
+    try:
+        if RESULT_CACHE:
+            hit = RESULT_CACHE.get(json_file)
+            if hit:
+                res, dbg, stale = hit
+                if not stale:
+                    return res, dbg, None
+                fresh, fresh_dbg = process_invoice(json_file, stale)
+                res.update(fresh)
+                if "invoice_no" in stale:
+                    dbg = fresh_dbg
+                RESULT_CACHE.put(json_file, res, dbg)
+                return res, dbg, None
+
+        res, dbg = process_invoice(json_file)
+
+        if RESULT_CACHE:
+            RESULT_CACHE.put(json_file, res, dbg)
+        return res, dbg, None
+    except Exception as e:
+        return None, [], str(e)
+
+
+def init_worker(cache):
+    global RESULT_CACHE
+    RESULT_CACHE = cache
+
+
+def make_result_cache(rebuild=False):
+    """
+    Cache keyed on extractor sources (per field group) + this
+    process_invoice version; entries of older shared code are pruned
+    """
+    fingerprints = extractor_fingerprints(
+        extra_files=[textract_utils.__file__, ocr_patterns.__file__],
+        extra_sources=[inspect.getsource(process_invoice)]
+    )
+    cache = ResultCache(fingerprints, rebuild=rebuild)
+    removed = cache.prune()
+    if removed:
+        print(f"🧹 Result cache: {removed} stale entries removed")
+    return cache
+
+
+def warm_up_extractors():
+    """
+    Run every extractor once so regex caches are built in the parent
+    (forked workers inherit them instead of recompiling)
+    """
+    sample = [{"text": "Tax Invoice No: INV-001 Date: 01-01-2026 Total 1,000.00",
+               "top": 0.1}]
+    extract_invoice_number(sample)
+    extract_invoice_date(sample)
+    extract_gstins(sample)
+    extract_buyer_gstin(sample)
+    extract_names(sample)
+    extract_total_amount(sample)
+
+
+def run_parallel(paths, workers, chunksize=None):
+    """
+    Process files on a pool forked once per run
+    Results come back in input order (same as a serial run).
+    """
+    if not chunksize:
+        chunksize = max(1, len(paths) // (workers * 4))
+
+    warm_up_extractors()
+    methods = mp.get_all_start_methods()
+    ctx = mp.get_context("fork" if "fork" in methods else None)
+
+    with ctx.Pool(processes=workers, initializer=init_worker, initargs=(RESULT_CACHE,)) as pool:
+        yield from pool.imap(process_invoice_safe, paths, chunksize=chunksize)
+
+
+def sink_base_path():
+    return os.path.join("output", f"results_{MODE}")
+
+
+@profiled("render_report")
+def render_report(sink, excel_mode="auto"):
+    """
+    Excel workbook rendered from the sink (not from memory)
+    """
+    streaming = {"auto": None, "standard": False, "streaming": True}[excel_mode]
+    return write_excel(sink.results(), sink.debug_rows(), MODE, CFG, streaming=streaming)
+
+
+def run_elite_run(workers=1, chunksize=None, use_cache=True, rebuild_cache=False,
+                  excel_mode="auto", sink_kind="jsonl"):
+    global RESULT_CACHE
     print(f"🚀 Started ELITE Run...")
-    results, all_debug = [], []
     input_dir = "textract_json"
     
     if not os.path.exists(input_dir):
@@ -78,23 +215,84 @@ def run_elite_run():
     limit = CFG.get("limit")
     if limit:
         files = files[:limit]
+
+    RESULT_CACHE = make_result_cache(rebuild_cache) if use_cache else None
+
+    paths = [os.path.join(input_dir, f) for f in files]
+    if workers > 1 and len(paths) > 1:
+        print(f"🧵 Workers: {workers}")
+        outcomes = run_parallel(paths, workers, chunksize)
+    else:
+        outcomes = map(process_invoice_safe, paths)
         
-    for f in files:
-        print(f"⚙️ Processing: {f}", end="\r")
-        try:
-            res, dbg = process_invoice(os.path.join(input_dir, f))
-            results.append(res)
-            all_debug.extend(dbg)
-        except Exception as e:
-            print(f"\n❌ Error in {f}: {e}")
-
-    output = write_excel(results, all_debug,MODE, CFG)
-    print(f"\n🎊 Project Complete! Final Report: {output}")
+    # हर इनवॉइस पूरा होते ही sink में सेव - crash पर भी progress बचा रहेगा
+    with open_sink(sink_kind, sink_base_path()) as sink:
+        for f, (res, dbg, err) in zip(files, outcomes):
+            print(f"⚙️ Processing: {f}", end="\r")
+            if err:
+                print(f"\n❌ Error in {f}: {err}")
+                continue
+            sink.append(res, dbg)
+
+        print(f"\n💾 Results saved: {sink.path} ({sink.count} invoices)")
+        output = render_report(sink, excel_mode)
+    print(f"🎊 Project Complete! Final Report: {output}")
+
+
+def render_from_sink(excel_mode="auto", sink_kind="jsonl"):
+    """
+    Rebuild the workbook from a saved sink (e.g. after a crashed run)
+    """
+    sink_path = sink_base_path() + SINK_TYPES[sink_kind][1]
+    if not os.path.exists(sink_path):
+        print(f"❌ Error: {sink_path} not found - run the extraction first")
+        return
+
+    with open_sink(sink_kind, sink_base_path(), mode="r") as sink:
+        output = render_report(sink, excel_mode)
+    print(f"🎊 Report rebuilt from {sink.path}: {output}")
+
+
+# ---------------- ARGUMENT PARSER ----------------
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Multi-vendor GST OCR batch")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Parallel worker processes (0 = all CPU cores)")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="Files per worker dispatch (default: auto)")
+    parser.add_argument("--build-sidecars", action="store_true",
+                        help="Convert textract_json/*.json to columnar .npy sidecars first")
+    parser.add_argument("--rebuild-cache", action="store_true",
+                        help="Ignore cached results and re-extract every file")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Don't read or write the result cache")
+    parser.add_argument("--excel-mode", choices=["auto", "standard", "streaming"], default="auto",
+                        help="Excel writer: styled in-memory, write-only streaming, or auto by row count")
+    parser.add_argument("--sink", choices=list(SINK_TYPES), default="jsonl",
+                        help="Where each result is saved as soon as it is extracted")
+    parser.add_argument("--from-sink", action="store_true",
+                        help="Skip extraction; render the report from the saved sink")
+    parser.add_argument("--profile", action="store_true",
+                        help="Record profiling spans (output/profile_summary.json + profile_trace.json)")
+    return parser.parse_args()
     
 
 if __name__ == "__main__":
-    if MODE == "ELITE":
-        run_elite_run()
+    args = parse_arguments()
+    workers = args.workers or os.cpu_count() or 1
+    if args.profile:
+        profiling.enable(output_dir="output")
+
+    if args.build_sidecars:
+        built = build_sidecars("textract_json")
+        print(f"🗂️ Sidecars built: {built}")
+
+    if args.from_sink:
+        render_from_sink(args.excel_mode, args.sink)
+    elif MODE == "ELITE":
+        run_elite_run(workers, args.chunksize, not args.no_cache, args.rebuild_cache,
+                      args.excel_mode, args.sink)
     else:
         print(f"⚠ MODE {MODE} selected, but elite runner active.")
-        run_elite_run()
+        run_elite_run(workers, args.chunksize, not args.no_cache, args.rebuild_cache,
+                      args.excel_mode, args.sink)
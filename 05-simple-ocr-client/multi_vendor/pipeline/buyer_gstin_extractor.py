@@ -1,9 +1,8 @@
-import re
+from ocr_patterns import GSTIN_STRICT_RE
+from pipeline.line_features import scan_lines
 
 # Strong GSTIN regex (India)
-GSTIN_REGEX = re.compile(
-    r"\b[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z][1-9A-Z]Z[0-9A-Z]\b"
-)
+GSTIN_REGEX = GSTIN_STRICT_RE
 
 def extract_buyer_gstin(lines, supplier_gstin=None):
     """
@@ -16,10 +15,9 @@ def extract_buyer_gstin(lines, supplier_gstin=None):
 
     found = []
 
-    for line in lines:
-        text = line.get("text", "").upper()
-
-        matches = GSTIN_REGEX.findall(text)
+    for line in scan_lines(lines):
+        # shared GSTIN hits, narrowed to the strict pattern
+        matches = [g for g in line["gstins"] if GSTIN_REGEX.fullmatch(g)]
         for gst in matches:
             if supplier_gstin and gst == supplier_gstin:
                 continue  # skip supplier GSTIN
@@ -1,13 +1,108 @@
 import os
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from excel_rollover import RolloverWorkbook, EXCEL_MAX_ROWS, BOOK_MAX_ROWS
 
+# Item rows above which "auto" switches to the streaming writer
+STREAMING_ROW_THRESHOLD = 50000
 
-def write_excel(results, all_debug, MODE, CFG):
+SUMMARY_HEADERS = [
+    "File Name", "Invoice No", "Invoice Date",
+    "Supplier Name", "Buyer Name", "Buyer GSTIN", "Total Amount"
+]
+ITEM_HEADERS = ["File Ref", "Item Description", "Qty", "Rate", "Amount"]
+TALLY_HEADERS = ["Date", "Particulars", "Vch Type", "Vch No", "Debit", "Credit"]
+MISSING_HEADERS = ["File", "Field", "Observation"]
+DASHBOARD_HEADERS = ["REPORT STATISTICS", "VALUE"]
+
+
+# ---------- Row builders (shared by both writers) ----------
+def summary_row(r):
+    return [
+        r["file"],
+        r["invoice_no"],
+        r["invoice_date"],
+        r["supplier_name"],
+        r["buyer_name"],
+        r["buyer_gstin"],
+        r["total_amount"]
+    ]
+
+
+def item_rows(results):
+    """
+    (file_index, row) for every inventory line
+    """
+    for f_idx, r in enumerate(results):
+        for item in r.get("inventories", []):
+            yield f_idx, [
+                r["file"],
+                item.get("item", ""),
+                item.get("qty", ""),
+                item.get("rate", ""),
+                item.get("amount", "")
+            ]
+
+
+def tally_row(r):
+    amount = r.get("total_amount", 0)
+    return [
+        r.get("invoice_date", ""),
+        r.get("buyer_name", ""),
+        "Sales",
+        r.get("invoice_no", ""),
+        None,        # Debit ALWAYS blank
+        amount       # Credit ONLY
+    ]
+
+
+def missing_rows(all_debug):
+    if all_debug:
+        for d in all_debug:
+            yield [d["file"], d["field"], d["value"]]
+    else:
+        yield ["All Files", "Global", "No Critical Errors Found"]
+
+
+def dashboard_rows(results, MODE, CFG):
+    total = len(results)
+    auto = sum(
+        1 for r in results
+        if r["invoice_no"] != "N/A"
+        and float(str(r["total_amount"]).replace(",", "")) > 0
+    )
+
+    yield ["Total Invoices Processed", total]
+    yield ["Status: AUTO (Success)", auto]
+    yield ["Status: REVIEW (Manual)", total - auto]
+    yield ["MODE", MODE]
+
+    # 🔐 VERY IMPORTANT FIX (NO DICT TO EXCEL)
+    for k, v in CFG.items():
+        yield [k, str(v)]
+
+
+def write_excel(results, all_debug, MODE, CFG, streaming=None):
+    """
+    streaming: True -> write-only streaming workbook, False -> styled
+    in-memory workbook, None -> streaming only for very large reports
+    Reports past the Excel row limit always stream (with rollover).
+    """
     output_dir = "output"
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
+    if streaming is not True:
+        item_count = sum(len(r.get("inventories", [])) for r in results)
+        if streaming is None:
+            streaming = item_count >= STREAMING_ROW_THRESHOLD
+        elif item_count >= EXCEL_MAX_ROWS:
+            print("⚠️ Item Details exceeds the Excel row limit - switching to streaming rollover")
+            streaming = True
+    if streaming:
+        return write_excel_streaming(results, all_debug, MODE, CFG, output_dir)
+
     wb = Workbook()
     if wb.active:
         wb.remove(wb.active)
@@ -26,11 +121,7 @@ def write_excel(results, all_debug, MODE, CFG):
     # ---------- 1. INVOICE SUMMARY ----------
     if CFG.get("invoice_summary"):
         ws_sum = wb.create_sheet("Invoice Summary")
-        headers = [
-            "File Name", "Invoice No", "Invoice Date",
-            "Supplier Name", "Buyer Name", "Buyer GSTIN", "Total Amount"
-        ]
-        ws_sum.append(headers)
+        ws_sum.append(SUMMARY_HEADERS)
 
         for cell in ws_sum[1]:
             cell.font = header_font
@@ -38,15 +129,7 @@ def write_excel(results, all_debug, MODE, CFG):
             cell.alignment = Alignment(horizontal="center")
 
         for i, r in enumerate(results, start=2):
-            ws_sum.append([
-                r["file"],
-                r["invoice_no"],
-                r["invoice_date"],
-                r["supplier_name"],
-                r["buyer_name"],
-                r["buyer_gstin"],
-                r["total_amount"]
-            ])
+            ws_sum.append(summary_row(r))
             fill = even_fill if i % 2 == 0 else PatternFill(fill_type=None)
             for cell in ws_sum[i]:
                 cell.fill = fill
@@ -55,7 +138,7 @@ def write_excel(results, all_debug, MODE, CFG):
     # ---------- 2. ITEM DETAILS ----------
     if CFG.get("item_details"):
         ws_item = wb.create_sheet("Item Details")
-        ws_item.append(["File Ref", "Item Description", "Qty", "Rate", "Amount"])
+        ws_item.append(ITEM_HEADERS)
 
         for cell in ws_item[1]:
             cell.font = header_font
@@ -63,25 +146,18 @@ def write_excel(results, all_debug, MODE, CFG):
             cell.alignment = Alignment(horizontal="center")
 
         row_idx = 2
-        for f_idx, r in enumerate(results):
+        for f_idx, row in item_rows(results):
             group_fill = even_fill if f_idx % 2 == 0 else PatternFill(fill_type=None)
-            for item in r.get("inventories", []):
-                ws_item.append([
-                    r["file"],
-                    item.get("item", ""),
-                    item.get("qty", ""),
-                    item.get("rate", ""),
-                    item.get("amount", "")
-                ])
-                for cell in ws_item[row_idx]:
-                    cell.fill = group_fill
-                    cell.border = border
-                row_idx += 1
+            ws_item.append(row)
+            for cell in ws_item[row_idx]:
+                cell.fill = group_fill
+                cell.border = border
+            row_idx += 1
 
     # ---------- 3. TALLY SALES ----------
     if CFG.get("tally_sales"):
         ws_tally = wb.create_sheet("Tally Sales")
-        ws_tally.append(["Date", "Particulars", "Vch Type", "Vch No", "Debit", "Credit"])
+        ws_tally.append(TALLY_HEADERS)
 
         for cell in ws_tally[1]:
             cell.font = header_font
@@ -89,58 +165,33 @@ def write_excel(results, all_debug, MODE, CFG):
             cell.alignment = Alignment(horizontal="center")
 
         for r in results:
-            amount = r.get("total_amount", 0)
-
-            ws_tally.append([
-               r.get("invoice_date", ""),
-               r.get("buyer_name", ""),
-               "Sales",
-               r.get("invoice_no", ""),
-               None,        # Debit ALWAYS blank
-               amount       # Credit ONLY
-               ])
+            ws_tally.append(tally_row(r))
 
     # ---------- 4. MISSING CORRECTION ----------
     if CFG.get("missing_correction"):
         ws_miss = wb.create_sheet("Missing Correction")
-        ws_miss.append(["File", "Field", "Observation"])
+        ws_miss.append(MISSING_HEADERS)
 
         for cell in ws_miss[1]:
             cell.font = header_font
             cell.fill = header_fill
             cell.alignment = Alignment(horizontal="center")
 
-        if all_debug:
-            for d in all_debug:
-                ws_miss.append([d["file"], d["field"], d["value"]])
-        else:
-            ws_miss.append(["All Files", "Global", "No Critical Errors Found"])
+        for row in missing_rows(all_debug):
+            ws_miss.append(row)
 
     # ---------- 5. DASHBOARD ----------
     if CFG.get("dashboard"):
         ws_dash = wb.create_sheet("Dashboard")
-        ws_dash.append(["REPORT STATISTICS", "VALUE"])
+        ws_dash.append(DASHBOARD_HEADERS)
 
         for cell in ws_dash[1]:
             cell.font = header_font
             cell.fill = header_fill
             cell.alignment = Alignment(horizontal="center")
 
-        total = len(results)
-        auto = len([
-            r for r in results
-            if r["invoice_no"] != "N/A"
-            and float(str(r["total_amount"]).replace(",", "")) > 0
-        ])
-
-        ws_dash.append(["Total Invoices Processed", total])
-        ws_dash.append(["Status: AUTO (Success)", auto])
-        ws_dash.append(["Status: REVIEW (Manual)", total - auto])
-        ws_dash.append(["MODE", MODE])
-
-        # 🔐 VERY IMPORTANT FIX (NO DICT TO EXCEL)
-        for k, v in CFG.items():
-            ws_dash.append([k, str(v)])
+        for row in dashboard_rows(results, MODE, CFG):
+            ws_dash.append(row)
 
     # ---------- Final Formatting ----------
     for sheet in wb.worksheets:
@@ -152,3 +203,81 @@ def write_excel(results, all_debug, MODE, CFG):
     file_path = os.path.join(output_dir, f"GST_Final_Report_{MODE}.xlsx")
     wb.save(file_path)
     return file_path
+
+
+def write_excel_streaming(results, all_debug, MODE, CFG, output_dir="output",
+                          max_rows=EXCEL_MAX_ROWS, book_rows=BOOK_MAX_ROWS):
+    """
+    Same five sheets and look, built with write-only workbooks
+    Rows go straight to disk; headers and the Item Details file-group
+    bands share named styles, borders / Invoice Summary bands are
+    conditional formats over whole ranges, so memory stays flat as
+    rows grow.
+    Past max_rows a sheet continues in "Item Details (2)", "(3)" ...
+    and past book_rows in GST_Final_Report_<MODE>_part2.xlsx ...,
+    with an Index sheet listing the parts.
+    """
+    even_fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+    side = Side(style="thin")
+    border = Border(left=side, right=side, top=side, bottom=side)
+
+    # ---------- Styles (registered in every part file) ----------
+    def setup(wb):
+        wb.add_named_style(NamedStyle(
+            name="mv_header",
+            font=Font(bold=True, color="FFFFFF"),
+            fill=PatternFill(start_color="1F4E78", end_color="1F4E78", fill_type="solid"),
+            alignment=Alignment(horizontal="center")
+        ))
+        wb.add_named_style(NamedStyle(name="mv_band", fill=even_fill, border=border))
+
+    def banded(cols, band_formula=None):
+        def finish(ws, last_row):
+            if last_row < 2:
+                return
+            ref = f"A2:{cols}{last_row}"
+            ws.conditional_formatting.add(ref, FormulaRule(formula=["TRUE"], border=border))
+            if band_formula:
+                ws.conditional_formatting.add(ref, FormulaRule(formula=[band_formula], fill=even_fill))
+        return finish
+
+    file_path = os.path.join(output_dir, f"GST_Final_Report_{MODE}.xlsx")
+    book = RolloverWorkbook(file_path, max_rows=max_rows, book_rows=book_rows, setup=setup)
+
+    # ---------- 1. INVOICE SUMMARY ----------
+    if CFG.get("invoice_summary"):
+        ws_sum = book.sheet("Invoice Summary", SUMMARY_HEADERS, "mv_header",
+                            finish=banded("G", "MOD(ROW(),2)=0"))
+        for r in results:
+            ws_sum.append(summary_row(r))
+
+    # ---------- 2. ITEM DETAILS ----------
+    if CFG.get("item_details"):
+        # file-group bands depend on the data, not the row number:
+        # even groups get the "mv_band" style cell by cell
+        ws_item = book.sheet("Item Details", ITEM_HEADERS, "mv_header", finish=banded("E"))
+        for f_idx, row in item_rows(results):
+            ws_item.append(row, style="mv_band" if f_idx % 2 == 0 else None)
+
+    # ---------- 3. TALLY SALES ----------
+    if CFG.get("tally_sales"):
+        ws_tally = book.sheet("Tally Sales", TALLY_HEADERS, "mv_header")
+        for r in results:
+            ws_tally.append(tally_row(r))
+
+    # ---------- 4. MISSING CORRECTION ----------
+    if CFG.get("missing_correction"):
+        ws_miss = book.sheet("Missing Correction", MISSING_HEADERS, "mv_header")
+        for row in missing_rows(all_debug):
+            ws_miss.append(row)
+
+    # ---------- 5. DASHBOARD ----------
+    if CFG.get("dashboard"):
+        ws_dash = book.sheet("Dashboard", DASHBOARD_HEADERS, "mv_header")
+        for row in dashboard_rows(results, MODE, CFG):
+            ws_dash.append(row)
+
+    files = book.close()
+    if len(files) > 1:
+        print(f"📚 Report split into {len(files)} workbooks (see Index sheet)")
+    return file_path
@@ -1,14 +1,13 @@
-import re
+from pipeline.line_features import scan_lines
 
 def extract_gstins(lines):
-    gst_re = r"\b\d{2}[A-Z]{5}\d{4}[A-Z]{1}[A-Z\d]{1}Z[A-Z\d]\b"
+    lines = scan_lines(lines)
     found = []
     for l in lines:
-        m = re.search(gst_re, l.get('text', "").upper())
-        if m:
+        if l["gstins"]:
             found.append({
-                "gst": m.group(0),
-                "top": l.get('geometry', {}).get('BoundingBox', {}).get('Top', 0)
+                "gst": l["gstins"][0],
+                "top": l.get("top", 0)
             })
 
     res = {"supplier_gstin": "Not Found", "buyer_gstin": "Not Found"}
@@ -1,38 +1,40 @@
 import re
+from textract_utils import cluster_row_indices
+from ocr_patterns import KeywordMatcher
 
-def extract_inventories_advanced(blocks):
+HEADER_KEYS = KeywordMatcher(["description", "qty", "rate", "amount"])
+STOP_KEYS = KeywordMatcher(["total", "bank", "gst", "amount in words"])
+NUM_RE = re.compile(r"(\d+(?:,\d{3})*(?:\.\d{1,3})?)")
+
+def extract_inventories_advanced(cols):
+    """
+    cols: LINE TextractColumns (textract_utils.load_columns)
+    Rows are grouped on the Top column, ordered by the Left column
+    """
     inventory_rows = []
-    lines = [b for b in blocks if b.get("BlockType") == "LINE"]
+    texts = cols.texts()
+    left = cols.floats("left")
     
-    rows = {}
-    for b in lines:
-        t = b['Geometry']['BoundingBox']['Top']
-        found = False
-        for k in rows.keys():
-            if abs(k - t) < 0.012:
-                rows[k].append(b)
-                found = True
-                break
-        if not found: rows[t] = [b]
+    rows = cluster_row_indices(cols.top, tol=0.012)
 
     table_started = False
-    for t in sorted(rows.keys()):
-        parts = sorted(rows[t], key=lambda x: x['Geometry']['BoundingBox']['Left'])
-        row_text = " ".join([p.get('Text', '') for p in parts])
+    for t, row in rows:
+        parts = sorted(row, key=left.__getitem__)
+        row_text = " ".join([texts[i] for i in parts])
         low = row_text.lower()
 
-        if any(k in low for k in ["description", "qty", "rate", "amount"]):
+        if HEADER_KEYS.search(low):
             table_started = True
             continue
         
         if table_started:
-            if any(k in low for k in ["total", "bank", "gst", "amount in words"]): break
+            if STOP_KEYS.search(low): break
             
             # Description: बायीं तरफ का टेक्स्ट
-            item_desc = " ".join([p['Text'] for p in parts if p['Geometry']['BoundingBox']['Left'] < 0.40])
+            item_desc = " ".join([texts[i] for i in parts if left[i] < 0.40])
             
             # Numbers: केवल 1-4 डिजिट के नंबर Qty हो सकते हैं (लंबी ID को छोड़ देगा)
-            all_nums = re.findall(r"(\d+(?:,\d{3})*(?:\.\d{1,3})?)", row_text.replace('₹',''))
+            all_nums = NUM_RE.findall(row_text.replace('₹',''))
             
             if len(item_desc) > 3 and all_nums:
                 # Qty: आमतौर पर पहला या दूसरा छोटा नंबर
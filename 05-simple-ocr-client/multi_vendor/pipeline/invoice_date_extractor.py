@@ -1,19 +1,17 @@
 #invoice_date_extractor.py
-import re
-
-DATE_RE = r"\b(\d{1,2}[\/\-\.][A-Za-z]{3}[\/\-\.]\d{2,4}|\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4})\b"
+from pipeline.line_features import scan_lines, has_any, DATE_KEYS
 
 def extract_invoice_date(lines):
+    lines = scan_lines(lines)
+
     for i, l in enumerate(lines[:20]):
-        if any(k in l.get("text", "").lower() for k in ["date", "dated"]):
-            m = re.search(DATE_RE, l.get("text", ""))
-            if m:
-                return {"invoice_date": m.group(1)}
+        if has_any(l, DATE_KEYS):
+            if l["date"]:
+                return {"invoice_date": l["date"]}
 
     for l in lines:
-        m = re.search(DATE_RE, l.get("text", ""))
-        if m:
-            return {"invoice_date": m.group(1)}
+        if l["date"]:
+            return {"invoice_date": l["date"]}
 
     return {"invoice_date": None}
 
@@ -1,4 +1,6 @@
 import re
+from ocr_patterns import label_prefix_re
+from pipeline.line_features import scan_lines, INVOICE_LABELS
 
 INVOICE_REGEX = re.compile(
     r'\b([A-Z]{1,5}[-/ ]?\d{1,6}[-/ ]?\d{0,4}|\d{3,10})\b'
@@ -6,15 +8,16 @@ INVOICE_REGEX = re.compile(
 
 INVALID_WORDS = ["GSTIN", "STATE", "DATE", "TOTAL", "AMOUNT"]
 
-LABELS = [
-    "invoice no", "inv no", "invoice number",
-    "invoice#", "inv#", "bill no", "bill#", "tax invoice"
-]
+LABELS = INVOICE_LABELS
+# "...<label>" strippers, compiled once instead of per line
+LABEL_PREFIX = {lb: label_prefix_re(lb) for lb in LABELS}
+
+NON_ID_CHARS = re.compile(r'[^A-Za-z0-9/-]')
 
 
 def clean_value(val: str) -> str:
     val = val.strip().replace(":", "").replace("#", "")
-    val = re.sub(r'[^A-Za-z0-9/-]', '', val)
+    val = NON_ID_CHARS.sub('', val)
     return val
 
 
@@ -48,15 +51,16 @@ def extract_invoice_number(lines):
     Returns: {"invoice_no": value or "N/A"}
     """
 
+    lines = scan_lines(lines)
+
     # ---- PASS 1: Label based search ----
     for i, l in enumerate(lines[:25]):
         text = l.get("text", "").strip()
-        low = text.lower()
 
         for lb in LABELS:
-            if lb in low:
+            if lb in l["keys"]:
                 # Same line extraction
-                after = re.sub(r'(?i).*' + re.escape(lb), '', text)
+                after = LABEL_PREFIX[lb].sub('', text)
                 after = clean_value(after)
 
                 if is_valid_invoice(after):
@@ -0,0 +1,53 @@
+#line_features.py
+# Precompiled patterns (repo root)
+from ocr_patterns import GSTIN_RE, DATE_RE, AMOUNT_RE
+
+# -------- Keyword groups (shared by all extractors) --------
+INVOICE_LABELS = [
+    "invoice no", "inv no", "invoice number",
+    "invoice#", "inv#", "bill no", "bill#", "tax invoice"
+]
+DATE_KEYS = ["date", "dated"]
+TOTAL_KEYS = ["total", "payable", "grand", "net amount"]
+NAME_NOISE = ["invoice", "tax", "gst", "date", "original", "bill to", "buyer", "consignee", "ship to"]
+BUYER_KEYS = ["bill to", "buyer", "consignee", "party"]
+
+ALL_KEYS = sorted(set(INVOICE_LABELS + DATE_KEYS + TOTAL_KEYS + NAME_NOISE + BUYER_KEYS))
+
+
+def scan_lines(lines):
+    """
+    Fused one-pass scanner: computes shared per-line features once
+      low / up  : lower / upper case text
+      gstins    : GSTIN matches (upper case text)
+      date      : first date match or None
+      amount    : first x,xxx.xx amount (float) or None
+      keys      : set of keyword hits from ALL_KEYS
+    Features are stored on the line dicts, so calling it again is free.
+    """
+    if not lines or "keys" in lines[0]:
+        return lines
+
+    for l in lines:
+        text = l.get("text", "")
+        low = text.lower()
+        up = text.upper()
+
+        m_date = DATE_RE.search(text)
+        m_amt = AMOUNT_RE.search(low)
+
+        l["low"] = low
+        l["up"] = up
+        l["gstins"] = GSTIN_RE.findall(up)
+        l["date"] = m_date.group(1) if m_date else None
+        l["amount"] = float(m_amt.group(1).replace(",", "")) if m_amt else None
+        l["keys"] = {k for k in ALL_KEYS if k in low}
+
+    return lines
+
+
+def has_any(line, keys):
+    """
+    True if the line hit any of the given keywords
+    """
+    return not line["keys"].isdisjoint(keys)
@@ -0,0 +1,146 @@
+#result_cache.py
+import os
+import glob
+import json
+import hashlib
+
+CACHE_DIR = os.path.join(".cache", "results")
+
+# Field group -> (extractor files it depends on, result keys it fills)
+# Editing one extractor only re-runs the groups that use it.
+FIELD_GROUPS = {
+    "invoice_no": (["invoice_number_extractor.py"], ["invoice_no"]),
+    "invoice_date": (["invoice_date_extractor.py"], ["invoice_date"]),
+    "names": (["name_extractor.py"], ["supplier_name", "buyer_name"]),
+    "supplier_gstin": (["gstin_extractor.py"], ["supplier_gstin"]),
+    "buyer_gstin": (["gstin_extractor.py", "buyer_gstin_extractor.py"], ["buyer_gstin", "buyer_gstin_conf"]),
+    "total_amount": (["total_amount_extractor.py", "inventories_extractor.py"], ["total_amount"]),
+    "inventories": (["inventories_extractor.py"], ["inventories"]),
+}
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _hash_files(files, sources=()):
+    h = hashlib.sha256()
+    for path in files:
+        h.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            h.update(f.read())
+    for src in sources:
+        h.update(src.encode())
+    return h.hexdigest()
+
+
+def extractor_fingerprints(extra_files=(), extra_sources=()):
+    """
+    Version of the extraction code, per field group
+    "shared": line_features.py scanner + helpers / process_invoice source
+              passed by the caller (+ any *_extractor.py no group lists)
+    <group>: that group's extractor files
+    Editing a shared file changes every group; editing one extractor
+    only the groups in FIELD_GROUPS that use it.
+    """
+    pipeline_dir = os.path.dirname(os.path.abspath(__file__))
+    grouped = {name for files, _ in FIELD_GROUPS.values() for name in files}
+    unlisted = sorted(p for p in glob.glob(os.path.join(pipeline_dir, "*_extractor.py"))
+                      if os.path.basename(p) not in grouped)
+    shared = [os.path.join(pipeline_dir, "line_features.py")] + unlisted + list(extra_files)
+
+    fps = {"shared": _hash_files(shared, extra_sources)}
+    for group, (files, _) in FIELD_GROUPS.items():
+        fps[group] = _hash_files([os.path.join(pipeline_dir, f) for f in files])
+    return fps
+
+
+class ResultCache:
+    """
+    On-disk cache of process_invoice() output
+    Key: SHA-256 of the Textract JSON + shared fingerprint; each entry
+    stores its group fingerprints, so get() can tell which field
+    groups are stale. prune() deletes entries of other shared code
+    by file name alone.
+    """
+
+    def __init__(self, fingerprints, cache_dir=CACHE_DIR, rebuild=False):
+        self.fingerprints = fingerprints
+        self.cache_dir = cache_dir
+        self.rebuild = rebuild
+        self._paths = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, json_file):
+        # hash each input once even when get() misses and put() follows
+        if json_file not in self._paths:
+            key = f"{file_sha256(json_file)}_{self.fingerprints['shared'][:16]}"
+            self._paths[json_file] = os.path.join(self.cache_dir, key + ".json")
+        return self._paths[json_file]
+
+    def _load(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or "fingerprints" not in entry:
+            return None
+        return entry
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get(self, json_file):
+        """
+        (result, debug, stale groups) from cache, or None on miss /
+        forced rebuild / changed shared code. An empty stale set is a
+        full hit; otherwise only those groups need extracting again.
+        """
+        if self.rebuild:
+            return None
+
+        path = self._path(json_file)
+        if not os.path.exists(path):
+            return None
+
+        entry = self._load(path)
+        if entry is None:
+            return None
+
+        stale = {g for g in FIELD_GROUPS if entry["fingerprints"].get(g) != self.fingerprints[g]}
+
+        # Same content may arrive under a new file name
+        file_name = os.path.basename(json_file)
+        entry["result"]["file"] = file_name
+        for d in entry["debug"]:
+            d["file"] = file_name
+        return entry["result"], entry["debug"], stale
+
+    def put(self, json_file, result, debug):
+        path = self._path(json_file)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"fingerprints": self.fingerprints, "result": result, "debug": debug},
+                      f, ensure_ascii=False)
+        os.replace(tmp, path)  # atomic - safe with parallel workers
+
+    def prune(self):
+        """
+        Delete entries built by different shared code (their key can
+        never match again); returns how many were removed
+        """
+        suffix = f"_{self.fingerprints['shared'][:16]}.json"
+        removed = 0
+        for path in glob.glob(os.path.join(self.cache_dir, "*.json")):
+            if not path.endswith(suffix):
+                self._remove(path)
+                removed += 1
+        return removed
@@ -1,15 +1,11 @@
-import re
+from pipeline.line_features import scan_lines, has_any, TOTAL_KEYS
 
 def extract_total_amount(lines):
-    amount_re = r"(\d{1,3}(?:,\d{3})*(?:\.\d{2}))"
     candidates = []
-    for l in lines:
-        t = l.get("text", "").lower()
-        if any(k in t for k in ["total", "payable", "grand", "net amount"]):
-            m = re.search(amount_re, t)
-            if m:
-                val = float(m.group(1).replace(",", ""))
-                candidates.append(val)
+    for l in scan_lines(lines):
+        if has_any(l, TOTAL_KEYS):
+            if l["amount"] is not None:
+                candidates.append(l["amount"])
     
     if candidates:
         return {"total_amount": max(candidates)}
@@ -1,10 +1,17 @@
 import os
 import re
+import sys
 import boto3
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
 
+# Shared Textract helpers live in the repo root
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from textract_utils import BlockIndex, cluster_rows
+
 # ================= CONFIG =================
 INPUT_DIR = "input"
 OUTPUT_DIR = "output"
@@ -25,29 +32,22 @@ def analyze_document_bytes(file_path):
     )
     return res["Blocks"]
 
-def get_words(blocks):
-    return [b for b in blocks if b["BlockType"] == "WORD"]
+def get_words(index):
+    return index.blocks("WORD")
 
-def line_groups(blocks, y_tol=0.01):
-    lines = []
-    words = get_words(blocks)
-
-    for w in words:
-        y = round(w["Geometry"]["BoundingBox"]["Top"], 3)
-        placed = False
-        for ln in lines:
-            if abs(ln["y"] - y) <= y_tol:
-                ln["words"].append(w)
-                placed = True
-                break
-        if not placed:
-            lines.append({"y": y, "words": [w]})
+def line_groups(index, y_tol=0.01):
+    words = get_words(index)
+    rows = cluster_rows(
+        words, lambda w: round(w["Geometry"]["BoundingBox"]["Top"], 3),
+        tol=y_tol, inclusive=True
+    )
 
-    for ln in lines:
-        ln["words"].sort(key=lambda x: x["Geometry"]["BoundingBox"]["Left"])
-        ln["text"] = " ".join(w["Text"] for w in ln["words"])
+    lines = []
+    for y, row in rows:
+        row.sort(key=lambda x: x["Geometry"]["BoundingBox"]["Left"])
+        lines.append({"y": y, "words": row, "text": " ".join(w["Text"] for w in row)})
 
-    return sorted(lines, key=lambda x: x["y"])
+    return lines
 
 # ================= HEADER EXTRACTION =================
 
@@ -95,29 +95,8 @@ def extract_grand_total(lines):
 
 # ================= TABLE EXTRACTION =================
 
-def extract_tables(blocks):
-    block_map = {b["Id"]: b for b in blocks}
-    tables = []
-
-    for b in blocks:
-        if b["BlockType"] == "TABLE":
-            rows = {}
-            for r in b.get("Relationships", []):
-                if r["Type"] == "CHILD":
-                    for cid in r["Ids"]:
-                        cell = block_map[cid]
-                        if cell["BlockType"] == "CELL":
-                            row = cell["RowIndex"]
-                            col = cell["ColumnIndex"]
-                            txt = ""
-                            for cr in cell.get("Relationships", []):
-                                if cr["Type"] == "CHILD":
-                                    for wid in cr["Ids"]:
-                                        if block_map[wid]["BlockType"] == "WORD":
-                                            txt += block_map[wid]["Text"] + " "
-                            rows.setdefault(row, {})[col] = txt.strip()
-            tables.append(rows)
-    return tables
+def extract_tables(index):
+    return index.tables()
 
 def is_summary_row(text):
     BAD = ["TOTAL", "TAXABLE", "CGST", "SGST", "AMOUNT"]
@@ -140,8 +119,9 @@ def main():
         print("Processing:", f.name)
 
         blocks = analyze_document_bytes(f)
-        lines = line_groups(blocks)
-        tables = extract_tables(blocks)
+        index = BlockIndex(blocks)
+        lines = line_groups(index)
+        tables = extract_tables(index)
 
         invoice_no = extract_invoice_no(lines)
         invoice_date = extract_invoice_date(lines)
@@ -1,10 +1,15 @@
 import os
-import pandas as pd
+import sys
 from datetime import datetime
 from core_agent_ready import process_invoice
 from pathlib import Path
 import xml.etree.ElementTree as ET
 
+# shared libs live at the repo root
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+from excel_rollover import RolloverWorkbook, write_records
+
 INPUT_DIR = "input"
 OUTPUT_DIR = "output"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -56,15 +61,18 @@ def main():
         f"GST_REPORT_{datetime.now().strftime('%H%M%S')}.xlsx"
     )
 
-    with pd.ExcelWriter(xlsx, engine="xlsxwriter") as w:
-        pd.DataFrame(invoices).to_excel(w, "Invoices", index=False)
-        pd.DataFrame(sales).to_excel(w, "Tally_Sales", index=False)
-        pd.DataFrame(inventory).to_excel(w, "Tally_Inventory", index=False)
-        pd.DataFrame(missing).to_excel(w, "Missing_Fields", index=False)
+    # streaming sheets: Tally_Sales (2), _part2.xlsx ... past the row limit
+    with RolloverWorkbook(xlsx) as book:
+        write_records(book, "Invoices", invoices)
+        write_records(book, "Tally_Sales", sales)
+        write_records(book, "Tally_Inventory", inventory)
+        write_records(book, "Missing_Fields", missing)
 
     xml = generate_tally_xml(sales, "TALLY_IMPORT.xml")
 
     print("✅ Excel:", xlsx)
+    for extra in book.files[1:]:
+        print("   ➕ continued in:", extra)
     print("✅ XML:", xml)
 
 if __name__ == "__main__":
@@ -1,5 +1,12 @@
+import os
+import sys
 import pandas as pd
 
+# shared libs live at the repo root
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, ROOT_DIR)
+from automation_utils import optimize_dtypes
+
 # Load data
 df = pd.read_csv("data/sales_data.csv")
 
@@ -7,6 +14,9 @@ df = pd.read_csv("data/sales_data.csv")
 df["amount"] = pd.to_numeric(df["amount"], errors="coerce").fillna(0)
 df["date"] = pd.to_datetime(df["date"], errors="coerce")
 
+# Smaller dtypes: country / status as categories, downcast numbers
+df = optimize_dtypes(df, category_columns=["country", "status"])
+
 # Remove invalid rows (amount <= 0)
 clean_df = df[df["amount"] > 0].copy()
 
@@ -0,0 +1,272 @@
+# File: async_fetcher.py
+# Concurrent page fetching for the scrapers (asyncio)
+# Reusable across ALL projects!
+#
+#   results = fetch_all(urls, concurrency=8, per_host=2, min_interval=0.5)
+#   for r in results:
+#       if r.ok:
+#           data = parse(r.content)
+#
+# Global concurrency cap + per-host politeness (max in-flight and a
+# minimum gap between request starts) instead of a blanket sleep.
+# Timeouts, connection errors, 429 and 5xx are retried with exponential
+# backoff (Retry-After honoured). Uses aiohttp when installed, otherwise
+# automation_utils.fetch_webpage (pooled session) in worker threads.
+# Pages go through the on-disk HTTP cache (http_cache.py): stored pages
+# are revalidated, offline mode never touches the network.
+
+import asyncio
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+
+from automation_utils import fetch_webpage, http_session
+from http_cache import HttpCache, default_http_cache
+
+try:
+    import aiohttp
+except ImportError:  # thread transport below
+    aiohttp = None
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# ============================================
+# RESULT
+# ============================================
+
+class FetchResult:
+    """
+    Outcome of one URL: content (bytes) when ok, error text otherwise
+    elapsed: seconds of the last request (queueing / politeness waits
+             not included)
+    """
+
+    __slots__ = ("url", "status", "content", "headers", "elapsed", "attempts", "error", "from_cache")
+
+    def __init__(self, url, status=None, content=None, headers=None,
+                 elapsed=0.0, attempts=0, error=None, from_cache=False):
+        self.url = url
+        self.status = status
+        self.content = content
+        self.headers = headers or {}
+        self.elapsed = elapsed
+        self.attempts = attempts
+        self.error = error
+        self.from_cache = from_cache
+
+    @property
+    def ok(self):
+        return self.error is None and self.status is not None and 200 <= self.status < 300
+
+    def __repr__(self):
+        return f"FetchResult({self.url!r}, status={self.status}, attempts={self.attempts}, error={self.error!r})"
+
+# ============================================
+# POLITENESS
+# ============================================
+
+class HostGate:
+    """
+    Per-host limits: at most max_in_flight requests open, and request
+    starts spaced at least min_interval seconds apart
+    """
+
+    def __init__(self, max_in_flight, min_interval):
+        self.slots = asyncio.Semaphore(max_in_flight)
+        self.min_interval = min_interval
+        self.next_start = 0.0
+        self.lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.slots.acquire()
+        async with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + self.min_interval
+        if start > now:
+            await asyncio.sleep(start - now)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.slots.release()
+        return False
+
+# ============================================
+# TRANSPORTS
+# ============================================
+
+class _AiohttpTransport:
+    def __init__(self, concurrency, per_host, timeout, headers):
+        self.session = aiohttp.ClientSession(
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            connector=aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host),
+        )
+        self.errors = (aiohttp.ClientError, asyncio.TimeoutError)
+
+    async def get(self, url, headers=None):
+        async with self.session.get(url, headers=headers) as resp:
+            return resp.status, await resp.read(), dict(resp.headers)
+
+    async def close(self):
+        await self.session.close()
+
+
+class _ThreadTransport:
+    """
+    automation_utils.fetch_webpage in worker threads, on its own pooled
+    session (thread + keep-alive pool sized to the concurrency; retries
+    stay here so they respect the host gate)
+    """
+
+    def __init__(self, concurrency, per_host, timeout, headers):
+        self.session = http_session(headers, retries=0, pool_size=concurrency)
+        self.timeout = timeout
+        self.errors = (requests.exceptions.RequestException,)
+        self.pool = ThreadPoolExecutor(max_workers=concurrency)
+
+    def _get(self, url, headers):
+        resp = fetch_webpage(url, headers=headers, timeout=self.timeout, session=self.session,
+                             raise_for_status=False, cache=False)
+        return resp.status_code, resp.content, dict(resp.headers)
+
+    async def get(self, url, headers=None):
+        return await asyncio.get_running_loop().run_in_executor(self.pool, self._get, url, headers)
+
+    async def close(self):
+        self.pool.shutdown(wait=False)
+        self.session.close()
+
+# ============================================
+# FETCHER
+# ============================================
+
+class AsyncFetcher:
+    """
+    concurrency: requests in flight across all hosts
+    per_host: requests in flight to one host
+    min_interval: seconds between request starts to one host
+    retries: extra attempts after the first (timeouts, connection
+             errors, 429 / 5xx); wait = backoff * 2**attempt + jitter
+    cache: True = shared HTTP cache, False = none, or an HttpCache
+    """
+
+    def __init__(self, concurrency=8, per_host=2, min_interval=0.5, timeout=10,
+                 retries=3, backoff=0.5, headers=None, transport=None, cache=True):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.headers = dict(headers or {})
+        self.transport = transport
+        self.cache = default_http_cache() if cache is True else (cache if isinstance(cache, HttpCache) else None)
+        self._gates = {}
+        self._slots = None
+        self._transport = None
+
+    async def __aenter__(self):
+        self._slots = asyncio.Semaphore(self.concurrency)
+        if self.transport is None:
+            self.transport = _AiohttpTransport if aiohttp is not None else _ThreadTransport
+        self._transport = self.transport(self.concurrency, self.per_host, self.timeout, self.headers)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._transport.close()
+        return False
+
+    def _gate(self, url):
+        host = urlsplit(url).netloc.lower()
+        if host not in self._gates:
+            self._gates[host] = HostGate(self.per_host, self.min_interval)
+        return self._gates[host]
+
+    def _delay(self, attempt, headers):
+        retry_after = (headers or {}).get("Retry-After")
+        if retry_after and str(retry_after).isdigit():
+            return float(retry_after)
+        return self.backoff * (2 ** attempt) + random.uniform(0, self.backoff)
+
+    async def fetch(self, url):
+        """
+        GET one URL under the global + per-host limits, with retries
+        """
+        store = self.cache
+        entry = store.get(url, self.headers) if store else None
+        if store and (store.offline or (entry and store.is_fresh(entry))):
+            if entry is None:
+                logging.error(f"Offline: {url} is not in the HTTP cache")
+                return FetchResult(url, error="not in HTTP cache (offline)")
+            return FetchResult(url, status=entry["status"], content=store.body(entry),
+                               headers=entry["headers"], from_cache=True)
+
+        result = FetchResult(url)
+        for attempt in range(self.retries + 1):
+            result.attempts = attempt + 1
+            headers = None
+            try:
+                async with self._gate(url), self._slots:
+                    start = time.perf_counter()
+                    status, content, headers = await asyncio.wait_for(
+                        self._transport.get(url, store.validators(entry) if store else None),
+                        timeout=self.timeout
+                    )
+                    result.elapsed = time.perf_counter() - start
+                result.status, result.headers = status, headers
+                if status == 304 and entry:
+                    store.refresh(entry, headers)
+                    result.status, result.content, result.error = entry["status"], store.body(entry), None
+                    result.from_cache = True
+                    break
+                if status in RETRY_STATUS and attempt < self.retries:
+                    result.error = f"HTTP {status}"
+                elif 200 <= status < 300:
+                    result.content, result.error = content, None
+                    if store:
+                        store.put(url, self.headers, status, headers, content)
+                    break
+                else:
+                    result.error = f"HTTP {status}"
+                    break
+            except (asyncio.TimeoutError, *self._transport.errors) as e:
+                result.error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+                if attempt == self.retries:
+                    break
+            wait = self._delay(attempt, headers)
+            logging.warning(f"Retry {attempt + 1}/{self.retries} for {url} in {wait:.1f}s ({result.error})")
+            await asyncio.sleep(wait)
+
+        if result.ok:
+            logging.info(f"Fetched {url} ({result.status}, {result.elapsed:.2f}s, {result.attempts} attempt(s)"
+                         f"{', not modified' if result.from_cache else ''})")
+        else:
+            logging.error(f"Failed {url}: {result.error}")
+        return result
+
+    async def fetch_all(self, urls, on_result=None):
+        """
+        Fetch every URL concurrently; results keep the input order.
+        on_result(result) is called as each one finishes.
+        """
+        async def one(url):
+            result = await self.fetch(url)
+            if on_result:
+                on_result(result)
+            return result
+        return await asyncio.gather(*(one(u) for u in urls))
+
+
+def fetch_all(urls, on_result=None, **options):
+    """
+    Blocking helper: AsyncFetcher(**options).fetch_all(urls)
+    """
+    async def run():
+        async with AsyncFetcher(**options) as fetcher:
+            return await fetcher.fetch_all(urls, on_result)
+    return asyncio.run(run())
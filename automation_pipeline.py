@@ -0,0 +1,251 @@
+# File: automation_pipeline.py
+# Declarative pipeline on top of automation_utils STEP 1-6
+# Projects list their stages by name + config; every stage output is
+# cached under a fingerprint of (input file, upstream stages, config),
+# so a rerun only executes the stages downstream of what changed.
+#
+#   pipeline = Pipeline("abc_traders", [
+#       ("load_csv", {"path": "data/sales.csv"}),
+#       ("normalize_columns", {"column_aliases": COLUMN_ALIASES}),
+#       ("validate_columns", {"required_columns": REQUIRED_COLUMNS}),
+#       ("remove_duplicates", {}),
+#       ("handle_missing_data", {"strategy": "drop"}),
+#       ("save_to_excel", {"path": "output/clean.xlsx"}),
+#   ])
+#   df = pipeline.run()
+#   pipeline.report("ABC Traders", output_dir)
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import time
+
+import automation_utils as au
+
+# ============================================
+# STAGE REGISTRY
+# ============================================
+# kind: "source" -> makes the frame (fingerprint includes the file stat)
+#       "transform" -> df in, df (or (df, count)) out, output cached
+#       "check" -> df in, bool out; False stops the pipeline
+#       "sink" -> df in, side effect (file); skipped if already written
+
+STAGES = {}
+
+
+def register_stage(name, kind="transform"):
+    """
+    Decorator: make a function usable as a pipeline stage
+    """
+    def wrap(func):
+        STAGES[name] = (func, kind)
+        return func
+    return wrap
+
+
+for _name, _kind in [
+    ("load_csv", "source"), ("load_excel", "source"),
+    ("validate_columns", "check"), ("validate_data_types", "check"),
+    ("validate_not_null", "check"),
+    ("remove_duplicates", "transform"), ("handle_missing_data", "transform"),
+    ("normalize_columns", "transform"), ("clean_text_columns", "transform"),
+    ("optimize_dtypes", "transform"), ("apply_business_rules", "transform"),
+    ("save_to_excel", "sink"), ("save_to_csv", "sink"),
+]:
+    register_stage(_name, _kind)(getattr(au, _name))
+
+# ============================================
+# FINGERPRINTS
+# ============================================
+
+def _code_id(func):
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        return getattr(func, "__qualname__", repr(func))
+
+
+def _config_id(value):
+    """
+    JSON-able view of a stage config (functions -> their source)
+    """
+    if callable(value):
+        return _code_id(value)
+    if isinstance(value, dict):
+        return {str(k): _config_id(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        items = [_config_id(v) for v in value]
+        return sorted(items, key=repr) if isinstance(value, set) else items
+    return value
+
+
+def stage_fingerprint(upstream, name, config, kind):
+    func = STAGES[name][0]
+    parts = [upstream, name, _code_id(func), _config_id(config)]
+    if kind == "source":
+        path = config.get("path")
+        if path and os.path.exists(path):
+            st = os.stat(path)
+            parts.append([os.path.abspath(path), st.st_size, st.st_mtime_ns])
+    raw = json.dumps(parts, sort_keys=True, default=repr)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+# ============================================
+# PIPELINE
+# ============================================
+
+class Pipeline:
+    """
+    Ordered stages, evaluated lazily from the last valid cache
+
+    stages: [(stage name, config dict), ...]
+    cache_dir: stage outputs + stats so far (pickle, one file per
+               stage - older fingerprints of the same stage are replaced)
+    """
+
+    def __init__(self, name, stages, cache_dir=".pipeline_cache"):
+        self.name = name
+        self.stages = [(s, dict(c or {})) for s, c in stages]
+        self.cache_dir = os.path.join(cache_dir, name)
+        self.stats = []
+        for s, _ in self.stages:
+            if s not in STAGES:
+                raise ValueError(f"Unknown stage '{s}' (registered: {', '.join(sorted(STAGES))})")
+
+    def fingerprints(self):
+        fps, upstream = [], ""
+        for name, config in self.stages:
+            kind = STAGES[name][1]
+            fp = stage_fingerprint(upstream, name, config, kind)
+            fps.append(fp)
+            if kind != "sink":
+                # checks don't change the frame, but chaining them means a
+                # changed check invalidates every cache after it - a resumed
+                # run can never skip over it
+                upstream = fp
+        return fps
+
+    def _cache_file(self, idx, name, fp):
+        return os.path.join(self.cache_dir, f"{idx:02d}_{name}_{fp[:16]}.pkl")
+
+    def _marker_file(self, idx, name, fp):
+        return os.path.join(self.cache_dir, f"{idx:02d}_{name}_{fp[:16]}.done")
+
+    def _store(self, path, obj=None):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        prefix = os.path.basename(path).rsplit("_", 1)[0] + "_"
+        for old in os.listdir(self.cache_dir):
+            if old.startswith(prefix) and old != os.path.basename(path):
+                os.remove(os.path.join(self.cache_dir, old))
+        with open(path + ".tmp", "wb") as f:
+            if obj is not None:
+                pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+
+    def run(self, force=False):
+        """
+        Run the pipeline; returns the final DataFrame (None if a source
+        or check failed). force=True ignores every cache.
+        """
+        fps = self.fingerprints()
+        self.stats = []
+
+        # latest frame-producing stage with a valid cache
+        start, df = 0, None
+        if not force:
+            for idx in range(len(self.stages) - 1, -1, -1):
+                name, _ = self.stages[idx]
+                if STAGES[name][1] not in ("source", "transform"):
+                    continue
+                cached = self._cache_file(idx, name, fps[idx])
+                if os.path.exists(cached):
+                    with open(cached, "rb") as f:
+                        saved = pickle.load(f)
+                    df, start = saved["df"], idx + 1
+                    # row counts of the skipped stages, from when they ran
+                    self.stats = [dict(s, status="cached", seconds=0.0) for s in saved["stats"]]
+                    break
+
+        for idx, (name, config) in enumerate(self.stages):
+            func, kind = STAGES[name]
+            if idx < start:
+                continue
+
+            rows_in = len(df) if df is not None else None
+            marker = self._marker_file(idx, name, fps[idx])
+            if kind == "sink" and not force and os.path.exists(marker) \
+                    and os.path.exists(config.get("path", "")):
+                self.stats.append({"stage": name, "status": "up-to-date", "seconds": 0.0,
+                                   "rows_in": rows_in, "rows_out": rows_in})
+                continue
+
+            t0 = time.perf_counter()
+            if kind == "source":
+                result = func(**config)
+            else:
+                result = func(df, **config)
+            seconds = time.perf_counter() - t0
+
+            stat = {"stage": name, "status": "ran", "seconds": seconds, "rows_in": rows_in}
+            if kind == "check":
+                stat["rows_out"] = rows_in
+                self.stats.append(stat)
+                if not result:
+                    logging.error(f"Pipeline {self.name}: check '{name}' failed")
+                    print(f"❌ Pipeline stopped at '{name}'")
+                    return None
+                continue
+            if kind == "sink":
+                stat["rows_out"] = rows_in
+                self.stats.append(stat)
+                if result is not False:
+                    self._store(marker)
+                continue
+
+            if isinstance(result, tuple):  # (df, count) stages
+                result, stat["count"] = result[0], result[1]
+            if result is None:
+                self.stats.append(stat)
+                logging.error(f"Pipeline {self.name}: stage '{name}' returned nothing")
+                print(f"❌ Pipeline stopped at '{name}'")
+                return None
+            df = result
+            stat["rows_out"] = len(df)
+            self.stats.append(stat)
+            self._store(self._cache_file(idx, name, fps[idx]), {"df": df, "stats": self.stats})
+
+        ran = sum(1 for s in self.stats if s["status"] == "ran")
+        logging.info(f"Pipeline {self.name}: {ran}/{len(self.stages)} stages ran "
+                     f"({sum(s['seconds'] for s in self.stats):.2f}s)")
+        print(f"⚙️ Pipeline {self.name}: {ran}/{len(self.stages)} stages ran, "
+              f"{len(self.stages) - ran} reused")
+        return df
+
+    def operations(self):
+        """
+        Stage stats in generate_summary_report's `operations` format
+        """
+        ops = {}
+        for i, s in enumerate(self.stats, start=1):
+            rows = f"{s['rows_in'] if s['rows_in'] is not None else '-'} -> " \
+                   f"{s['rows_out'] if s['rows_out'] is not None else '-'} rows"
+            extra = f", count {s['count']}" if "count" in s else ""
+            ops[f"{i}. {s['stage']}"] = f"{s['status']}, {s['seconds']:.2f}s, {rows}{extra}"
+        return ops
+
+    def report(self, client_name, output_dir, input_file=None):
+        """
+        generate_summary_report() fed from the last run
+        """
+        rows = [s["rows_out"] for s in self.stats if s["rows_out"] is not None]
+        if input_file is None:
+            input_file = next((c.get("path") for n, c in self.stages
+                               if STAGES[n][1] == "source"), "")
+        return au.generate_summary_report(
+            client_name, input_file,
+            rows[0] if rows else 0, rows[-1] if rows else 0,
+            self.operations(), output_dir
+        )
@@ -3,18 +3,105 @@
 # Reusable across ALL projects!
 
 import pandas as pd
+import numpy as np
 import os
 import logging
 from datetime import datetime
 import json
+import time
+import functools
+
+from input_cache import default_cache
+from http_cache import HttpCache, default_http_cache
+import profiling
+from profiling import profiled
 
 # ============================================
 # STEP 1: INPUT FUNCTIONS
 # ============================================
 
-def load_csv(path, encoding='utf-8'):
+try:
+    import pyarrow  # noqa: F401 - enables the Arrow CSV engine
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+SNIFF_ROWS = 1000  # rows read with the C parser to find text columns
+
+
+@profiled()
+def projection_columns(required_columns, column_aliases=None):
+    """
+    Every header name that can feed a required column
+    (standard name + its aliases) - pass as load_csv(usecols=...)
+    """
+    column_aliases = column_aliases or {}
+    wanted = []
+    for col in required_columns:
+        wanted.append(col)
+        wanted.extend(column_aliases.get(col, []))
+    return list(dict.fromkeys(wanted))
+
+
+@profiled()
+def expand_dtypes(dtype_map, column_aliases=None):
+    """
+    {'Amount': 'float64'} -> same dtype for every alias of Amount too,
+    so a client config can use standard names before normalization
+    """
+    column_aliases = column_aliases or {}
+    expanded = {}
+    for col, dtype in (dtype_map or {}).items():
+        expanded[col] = dtype
+        for alias in column_aliases.get(col, []):
+            expanded.setdefault(alias, dtype)
+    return expanded
+
+
+def _read_csv_fast(path, encoding, usecols, dtype, engine):
+    """
+    Header-resolved projection + dtype map, Arrow parser when possible
+    """
+    header = pd.read_csv(path, encoding=encoding, nrows=0).columns
+    if usecols is not None:
+        wanted = set(usecols) if not callable(usecols) else None
+        usecols = [c for c in header if (usecols(c) if wanted is None else c in wanted)]
+    dtype = {c: t for c, t in (dtype or {}).items() if c in header}
+
+    if engine == "auto":
+        engine = "pyarrow" if HAS_PYARROW else "c"
+
+    if engine == "pyarrow":
+        # Arrow infers ISO dates as dates; keep text columns as text
+        # so the frame matches what the C parser returns
+        sample = pd.read_csv(path, encoding=encoding, usecols=usecols, nrows=SNIFF_ROWS)
+        arrow_dtype = {
+            c: str for c in sample.columns
+            if not (pd.api.types.is_numeric_dtype(sample[c]) or pd.api.types.is_bool_dtype(sample[c]))
+        }
+        arrow_dtype.update(dtype)
+        try:
+            return pd.read_csv(path, encoding=encoding, usecols=usecols,
+                               dtype=arrow_dtype or None, engine="pyarrow")
+        except Exception as e:
+            logging.warning(f"Arrow CSV parser failed ({e}), falling back to C parser")
+
+    return pd.read_csv(path, encoding=encoding, usecols=usecols, dtype=dtype or None)
+
+
+@profiled()
+def load_csv(path, encoding='utf-8', usecols=None, dtype=None, engine=None, cache=True):
     """
     Universal CSV loader with error handling
+
+    Fast path (all optional):
+    usecols: column names to keep (e.g. projection_columns(REQUIRED_COLUMNS,
+             COLUMN_ALIASES)); names missing from the file are ignored
+    dtype:   explicit dtype map, skips type inference for those columns
+    engine:  'auto' -> Arrow parser if pyarrow is installed, else C parser;
+             'pyarrow' / 'c' to force one. Default None = plain read_csv.
+    cache:   reuse the parsed frame from the input cache while the file
+             (path/size/mtime) and options are unchanged; False to skip
     """
     if not os.path.exists(path):
         logging.error(f"File not found: {path}")
@@ -22,7 +109,19 @@ def load_csv(path, encoding='utf-8'):
         return None
     
     try:
-        df = pd.read_csv(path, encoding=encoding)
+        store = default_cache() if cache else None
+        key = store.key(path, "csv", {
+            "encoding": encoding, "usecols": usecols, "dtype": dtype, "engine": engine
+        }) if store else None
+        df = store.get(key) if key else None
+
+        if df is None:
+            if usecols is None and dtype is None and engine is None:
+                df = pd.read_csv(path, encoding=encoding)
+            else:
+                df = _read_csv_fast(path, encoding, usecols, dtype, engine or "c")
+            if key and not df.empty:
+                store.put(key, df)
         
         if df.empty:
             logging.error("CSV file is empty")
@@ -38,22 +137,33 @@ def load_csv(path, encoding='utf-8'):
         print(f"❌ Error: {str(e)}")
         return None
 
-def load_excel(path, sheet_name=0):
+@profiled()
+def load_excel(path, sheet_name=0, cache=True):
     """
     Universal Excel loader
+    cache: reuse the parsed sheet from the input cache (see load_csv)
     """
     if not os.path.exists(path):
         logging.error(f"File not found: {path}")
         return None
     
     try:
-        df = pd.read_excel(path, sheet_name=sheet_name)
+        # sheet_name=None / list returns a dict of sheets - not cached
+        store = default_cache() if cache and isinstance(sheet_name, (int, str)) else None
+        key = store.key(path, "excel", {"sheet_name": sheet_name}) if store else None
+        df = store.get(key) if key else None
+
+        if df is None:
+            df = pd.read_excel(path, sheet_name=sheet_name)
+            if key:
+                store.put(key, df)
         logging.info(f"Loaded {len(df)} rows from Excel")
         return df
     except Exception as e:
         logging.error(f"Error reading Excel: {str(e)}")
         return None
 
+@profiled()
 def load_json(path):
     """
     Universal JSON loader
@@ -71,6 +181,7 @@ def load_json(path):
 # STEP 2: VALIDATION FUNCTIONS
 # ============================================
 
+@profiled()
 def validate_columns(df, required_columns):
     """
     Universal column validator
@@ -85,6 +196,7 @@ def validate_columns(df, required_columns):
     logging.info("All required columns present")
     return True
 
+@profiled()
 def validate_data_types(df, type_map):
     """
     Validate column data types
@@ -112,6 +224,7 @@ def validate_data_types(df, type_map):
         return False
     return True
 
+@profiled()
 def validate_not_null(df, columns):
     """
     Check if specified columns have null values
@@ -130,18 +243,195 @@ def validate_not_null(df, columns):
 # STEP 3: CLEANING FUNCTIONS
 # ============================================
 
+_NA_TOKEN = "\x00NA"
+_HASH_KEY_2 = "a5e1f09b27c4d8e3"  # second, independent row hash (16 chars)
+
+
+def _canonical_column(series):
+    """
+    Column as tagged text that doesn't depend on the inferred dtype:
+    numbers -> "n:<float64>", bools -> "b:", text -> "s:", and one
+    token for every missing value (an all-empty float64 column equals
+    an empty text column). 1 and 1.0 match, 123 and "123" don't -
+    same as concat + drop_duplicates.
+    """
+    na = series.isna().to_numpy()
+    if pd.api.types.is_bool_dtype(series):
+        text = "b:" + series.astype(str).to_numpy(dtype=object)
+    elif pd.api.types.is_numeric_dtype(series):
+        text = "n:" + series.to_numpy(dtype="float64", na_value=np.nan).astype(str).astype(object)
+    elif pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty"):
+        text = "s:" + series.astype(object).where(~na, "").to_numpy(dtype=object)
+    else:  # mixed object column
+        def tag(v):
+            if isinstance(v, (bool, np.bool_)):
+                return f"b:{v}"
+            if isinstance(v, (int, float, np.number)):
+                return f"n:{np.float64(v)}"
+            return f"s:{v}"
+        text = np.array([tag(v) for v in series.to_numpy(dtype=object)], dtype=object)
+    text[na] = _NA_TOKEN
+    return text
+
+
+def canonical_frame(df, subset=None):
+    """
+    Subset columns as _canonical_column() values, so chunks / files
+    where pandas inferred different dtypes for a column (int vs float,
+    all-empty float64 vs text) hash the same
+    Columns are picked by name, in subset / df order - callers
+    hashing several files must give them one column order first.
+    """
+    if isinstance(subset, str):
+        subset = [subset]
+    columns = list(subset) if subset is not None else list(df.columns)
+    return pd.DataFrame({col: _canonical_column(df[col]) for col in columns})
+
+
+@profiled()
+def row_hashes(df, subset=None, hash_key=None):
+    """
+    64-bit hash per row over the subset columns
+    hash_key: 16-char key for an independent second hash
+    """
+    if isinstance(subset, str):
+        subset = [subset]
+    frame = df[list(subset)] if subset is not None else df
+    if hash_key:
+        return pd.util.hash_pandas_object(frame, index=False, hash_key=hash_key).to_numpy()
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+@profiled()
 def remove_duplicates(df, subset=None):
     """
     Universal duplicate remover
+    Dedupes on a 64-bit row-hash array instead of drop_duplicates over
+    the whole frame; only rows whose hash repeats are compared exactly,
+    so hash collisions can never drop a row.
     """
     initial = len(df)
-    df = df.drop_duplicates(subset=subset)
+    if isinstance(subset, str):
+        subset = [subset]
+
+    hashes = pd.Series(row_hashes(df, subset))
+    keep = ~hashes.duplicated().to_numpy()
+    repeated = hashes.duplicated(keep=False).to_numpy()
+    if repeated.any():
+        # exact check inside the (small) set of hash-duplicate rows
+        candidates = df[repeated]
+        exact = ~candidates.duplicated(subset=subset).to_numpy()
+        keep[repeated] = exact
+    df = df[keep]
     removed = initial - len(df)
     
     logging.info(f"Duplicates removed: {removed}")
     print(f"🧹 Duplicates removed: {removed}")
     return df, removed
 
+
+@profiled()
+def remove_duplicates_files(paths, output_path, subset=None, chunksize=500_000,
+                            buckets=64, spill_dir=None, encoding='utf-8'):
+    """
+    Dedupe many CSVs (e.g. a year of daily files) larger than memory
+    Keeps the first occurrence across all files, in file order, and
+    writes the unique rows to output_path (CSV).
+
+    1. stream every file in chunks, spill (row hash, row id) pairs to
+       `buckets` files on disk by hash
+    2. dedupe bucket by bucket -> on-disk keep mask (1 byte per row)
+    3. stream the files again and write the kept rows
+    Memory is one chunk + one bucket. Every file is reordered to the
+    first file's columns (a file with other columns is a ValueError)
+    and values are canonicalised (canonical_frame), so column order or
+    dtype drift between files / chunks doesn't hide duplicates.
+    Trade-off: unlike remove_duplicates, rows are never compared
+    exactly (that needs them back from disk). Identity is two
+    independent 64-bit hashes, so two different rows collide with
+    probability ~n^2 / 2^129 - negligible even at billions of rows.
+    Returns (rows written, removed).
+    """
+    import shutil
+    import tempfile
+
+    if isinstance(paths, str):
+        paths = [paths]
+    if isinstance(subset, str):
+        subset = [subset]
+    columns = None
+    for path in paths:
+        header = list(pd.read_csv(path, nrows=0, encoding=encoding).columns)
+        if columns is None:
+            columns = header
+        elif set(header) != set(columns):
+            raise ValueError(f"{path}: columns {header} differ from {paths[0]}: {columns}")
+
+    def chunks(path):
+        # one column order for every file, so rows hash / write alike
+        for chunk in pd.read_csv(path, chunksize=chunksize, encoding=encoding):
+            yield chunk.reindex(columns=columns)
+
+    work = tempfile.mkdtemp(prefix="dedupe_", dir=spill_dir)
+    pair = np.dtype([("hash", "<u8"), ("hash2", "<u8"), ("row", "<u8")])
+
+    try:
+        # ---------- 1. hash + partition ----------
+        bucket_files = [open(os.path.join(work, f"bucket_{b:03d}.bin"), "ab") for b in range(buckets)]
+        total = 0
+        try:
+            for path in paths:
+                for chunk in chunks(path):
+                    canon = canonical_frame(chunk, subset)
+                    h = row_hashes(canon)
+                    h2 = row_hashes(canon, hash_key=_HASH_KEY_2)
+                    rows = np.arange(total, total + len(chunk), dtype="<u8")
+                    which = h % buckets
+                    for b in np.unique(which):
+                        sel = which == b
+                        out = np.empty(int(sel.sum()), dtype=pair)
+                        out["hash"], out["hash2"], out["row"] = h[sel], h2[sel], rows[sel]
+                        out.tofile(bucket_files[b])
+                    total += len(chunk)
+        finally:
+            for f in bucket_files:
+                f.close()
+
+        if total == 0:
+            logging.warning("No rows to dedupe")
+            return 0, 0
+
+        # ---------- 2. dedupe per bucket ----------
+        keep = np.memmap(os.path.join(work, "keep.bin"), dtype=bool, mode="w+", shape=(total,))
+        for b in range(buckets):
+            arr = np.fromfile(os.path.join(work, f"bucket_{b:03d}.bin"), dtype=pair)
+            if len(arr):
+                # rows were appended in order -> first index = first occurrence
+                first = np.unique(arr[["hash", "hash2"]], return_index=True)[1]
+                keep[arr["row"][first]] = True
+        keep.flush()
+
+        # ---------- 3. write the kept rows ----------
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        offset, written, header = 0, 0, True
+        for path in paths:
+            for chunk in chunks(path):
+                mask = np.asarray(keep[offset:offset + len(chunk)])
+                offset += len(chunk)
+                kept = chunk[mask]
+                kept.to_csv(output_path, mode="w" if header else "a", header=header, index=False)
+                header = False
+                written += len(kept)
+        del keep
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    removed = total - written
+    logging.info(f"Duplicates removed across {len(paths)} files: {removed}")
+    print(f"🧹 Duplicates removed: {removed} ({len(paths)} files, {total} rows)")
+    return written, removed
+
+@profiled()
 def handle_missing_data(df, strategy='drop', fill_value=None):
     """
     Universal missing data handler
@@ -163,6 +453,7 @@ def handle_missing_data(df, strategy='drop', fill_value=None):
     
     return df, removed
 
+@profiled()
 def normalize_columns(df, column_aliases):
     """
     Universal column normalizer
@@ -179,20 +470,95 @@ def normalize_columns(df, column_aliases):
     
     return df
 
+@profiled()
 def clean_text_columns(df, columns):
     """
     Strip whitespace, convert to title case
+    Categorical columns (see optimize_dtypes) are cleaned once per
+    category instead of once per row.
     """
     for col in columns:
         if col in df.columns:
-            df[col] = df[col].astype(str).str.strip().str.title()
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = _clean_categories(df[col])
+            else:
+                df[col] = df[col].astype(str).str.strip().str.title()
     
     return df
 
+
+def _clean_categories(series):
+    """
+    strip().title() on the categories, then merge categories that
+    became equal ("delhi " / "Delhi") - same values as the row-wise path
+    """
+    missing = pd.Series([None], dtype=object).astype(str).str.strip().str.title()[0]
+    if isinstance(missing, str) and series.isna().any():
+        # older pandas: astype(str) turns missing into "None" -> keep that
+        series = series.cat.add_categories([missing]).fillna(missing)
+    cats = series.cat.categories
+    cleaned = pd.Index(cats.astype(str)).str.strip().str.title()
+    uniques = pd.Index(cleaned.unique())
+    remap = uniques.get_indexer(cleaned)
+    codes = series.cat.codes.to_numpy()
+    codes = np.where(codes >= 0, remap[codes], -1)  # -1 = missing
+    return pd.Series(pd.Categorical.from_codes(codes, uniques), index=series.index, name=series.name)
+
+
+CATEGORY_MAX_RATIO = 0.5  # text column -> category when unique / rows <= this
+
+
+def _is_text(series):
+    return series.dtype == object or isinstance(series.dtype, pd.StringDtype)
+
+
+@profiled()
+def optimize_dtypes(df, category_columns=None, max_ratio=CATEGORY_MAX_RATIO, report=True):
+    """
+    Shrink a loaded frame before cleaning
+    - integers -> smallest int / uint that fits
+    - floats -> float32 only when every value survives the round trip
+    - low-cardinality text (City, Product, Country ...) -> category
+    category_columns: always convert these; others only if
+    unique / rows <= max_ratio
+    Logs memory before / after (report=False: silent, e.g. per chunk).
+    """
+    before = df.memory_usage(deep=True).sum() if report else 0
+    df = df.copy()
+    forced = set(category_columns or [])
+
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series):
+            continue
+
+        if pd.api.types.is_integer_dtype(series):
+            kind = "unsigned" if len(series) and series.min() >= 0 else "integer"
+            df[col] = pd.to_numeric(series, downcast=kind)
+
+        elif pd.api.types.is_float_dtype(series):
+            small = series.astype("float32")
+            same = (small.astype("float64") == series) | series.isna()
+            if same.all():
+                df[col] = small
+
+        elif _is_text(series) and len(series):
+            if col in forced or series.nunique(dropna=True) / len(series) <= max_ratio:
+                df[col] = series.astype("category")
+
+    if not report:
+        return df
+    after = df.memory_usage(deep=True).sum()
+    saved = (1 - after / before) * 100 if before else 0
+    logging.info(f"Dtypes optimized: {before / 1e6:.2f} MB -> {after / 1e6:.2f} MB ({saved:.0f}% saved)")
+    print(f"🧠 Memory: {before / 1e6:.2f} MB -> {after / 1e6:.2f} MB ({saved:.0f}% saved)")
+    return df
+
 # ============================================
 # STEP 4: BUSINESS RULES (CUSTOM PER PROJECT)
 # ============================================
 
+@profiled()
 def apply_business_rules(df, rules_function):
     """
     Apply custom business logic
@@ -210,6 +576,7 @@ def apply_business_rules(df, rules_function):
 # STEP 5: OUTPUT FUNCTIONS
 # ============================================
 
+@profiled()
 def save_to_excel(df, path, sheet_name='Sheet1'):
     """
     Universal Excel saver
@@ -224,6 +591,7 @@ def save_to_excel(df, path, sheet_name='Sheet1'):
         logging.error(f"Error saving Excel: {str(e)}")
         return False
 
+@profiled()
 def save_to_csv(df, path):
     """
     Universal CSV saver
@@ -238,6 +606,7 @@ def save_to_csv(df, path):
         logging.error(f"Error saving CSV: {str(e)}")
         return False
 
+@profiled()
 def create_output_directory(client_name, base_dir='output'):
     """
     Create client-wise, date-wise output structure
@@ -252,9 +621,12 @@ def create_output_directory(client_name, base_dir='output'):
 # STEP 6: REPORTING & LOGGING
 # ============================================
 
-def setup_logging(log_file='logs/automation.log'):
+def setup_logging(log_file='logs/automation.log', profile=None):
     """
     Universal logging setup
+    Profiling spans (profile_summary.json / profile_trace.json) are
+    written next to this log; profile=True turns them on
+    (or AUTOMATION_PROFILE=1).
     """
     if os.path.dirname(log_file):
         os.makedirs(os.path.dirname(log_file), exist_ok=True)
@@ -271,6 +643,12 @@ def setup_logging(log_file='logs/automation.log'):
     
     print(f"📝 Logging to: {log_file}")
 
+    profiling.set_output_dir(os.path.dirname(log_file) or ".")
+    if profile:
+        profiling.enable()
+        print(f"⏱️ Profiling to: {os.path.dirname(log_file) or '.'}")
+
+@profiled()
 def generate_summary_report(
     client_name,
     input_file,
@@ -326,6 +704,7 @@ Status: ✅ COMPLETED SUCCESSFULLY
 # HELPER UTILITIES
 # ============================================
 
+@profiled()
 def print_dataframe_info(df, title="DataFrame Info"):
     """
     Pretty print dataframe information
@@ -341,31 +720,376 @@ def print_dataframe_info(df, title="DataFrame Info"):
 def timer_decorator(func):
     """
     Measure execution time
+    (kept for old callers - also records a profiling span)
     """
     import time
+    import functools
+    traced = profiled()(func)
+
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         start = time.time()
-        result = func(*args, **kwargs)
+        result = traced(*args, **kwargs)
         end = time.time()
         print(f"⏱️ {func.__name__} took {end-start:.2f}s")
         return result
     return wrapper
 
 # Database connection (future)
+@profiled()
 def connect_to_db(config):
     pass
 
 # Email sending (future)
+@profiled()
 def send_email_report(to, subject, body, attachment):
     pass
 
 # Web scraping base (for Project 4)
-def fetch_webpage(url):
-    pass
+# One shared requests.Session: keep-alive pool (TLS handshake once per
+# host), gzip / brotli decoding, urllib3 retries with exponential backoff
+# on 429 / 5xx (Retry-After honoured) and a timing record per request.
 
-def parse_html(html):
-    pass
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry
+except ImportError:  # only the scraping helpers need it
+    requests = None
+
+try:
+    import brotli  # noqa: F401 - urllib3 decodes "br" when present
+    HAS_BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        HAS_BROTLI = True
+    except ImportError:
+        HAS_BROTLI = False
+
+HTTP_RETRY_STATUS = (429, 500, 502, 503, 504)
+HTTP_TIMEOUT = 10
+HTTP_METRICS_MAX = 10000  # most recent requests kept for http_stats()
+
+_http_session = None
+_http_metrics = []
+
+
+def http_session(headers=None, retries=3, backoff=0.5, pool_size=10):
+    """
+    New pooled Session (fetch_webpage uses a shared one - pass your own
+    via session= for different retry / pool settings)
+
+    pool_size: keep-alive connections kept per host
+    retries: attempts after the first on connection errors and
+             429 / 5xx; waits backoff, 2*backoff, 4*backoff...
+    """
+    if requests is None:
+        raise ImportError("requests is required: pip install requests")
+    session = requests.Session()
+    session.headers["Accept-Encoding"] = "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+    session.headers.update(headers or {})
+    retry = Retry(
+        total=retries, connect=retries, read=retries, status=retries,
+        backoff_factor=backoff, status_forcelist=HTTP_RETRY_STATUS,
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+        respect_retry_after_header=True, raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_http_session():
+    global _http_session
+    if _http_session is None:
+        _http_session = http_session()
+    return _http_session
+
+
+def _http_store(cache):
+    """
+    cache=True -> shared HttpCache, False / None -> no cache, or an HttpCache
+    """
+    if cache is True:
+        return default_http_cache()
+    return cache if isinstance(cache, HttpCache) else None
+
+
+def _cached_response(store, entry, url):
+    """
+    requests.Response built from a cache entry (response.from_cache = True)
+    """
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response._content = store.body(entry)
+    response.headers = requests.structures.CaseInsensitiveDict(entry["headers"])
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.url = url
+    response.from_cache = True
+    return response
+
+
+@profiled()
+def fetch_webpage(url, headers=None, timeout=HTTP_TIMEOUT, session=None,
+                  raise_for_status=True, cache=True):
+    """
+    GET a page through the shared pooled session
+
+    cache: True = on-disk HTTP cache (http_cache.py) - stored pages are
+           revalidated with If-None-Match / If-Modified-Since and a 304
+           reuses the stored body; offline mode serves only from it.
+           False = always download. Or pass an HttpCache.
+
+    Returns the requests.Response (from_cache=True when served from
+    disk); network errors (after retries), offline cache misses and,
+    with raise_for_status, 4xx / 5xx raise requests.exceptions.RequestException
+    """
+    session = session or get_http_session()
+    store = _http_store(cache)
+    request_headers = dict(session.headers, **(headers or {}))
+    entry = store.get(url, request_headers) if store else None
+
+    record = {"url": url, "status": None, "seconds": 0.0, "bytes": 0,
+              "encoding": None, "retries": 0, "cache": None, "error": None}
+    start = time.perf_counter()
+    try:
+        if store and (store.offline or (entry and store.is_fresh(entry))):
+            if entry is None:
+                raise requests.exceptions.ConnectionError(f"Offline: {url} is not in the HTTP cache")
+            response = _cached_response(store, entry, url)
+            record.update(status=response.status_code, cache="hit")
+            return response
+
+        response = session.get(url, headers=dict(headers or {}, **(store.validators(entry) if store else {})),
+                               timeout=timeout)
+        record["status"] = response.status_code
+        record["encoding"] = response.headers.get("Content-Encoding")
+        history = getattr(response.raw, "retries", None)
+        record["retries"] = len(history.history) if history else 0
+        record["bytes"] = len(response.content)
+
+        if store and response.status_code == 304 and entry:
+            store.refresh(entry, response.headers)
+            response = _cached_response(store, entry, url)
+            record["cache"] = "revalidated"
+        elif store and store.put(url, request_headers, response.status_code, response.headers, response.content):
+            record["cache"] = "stored"
+
+        if raise_for_status:
+            response.raise_for_status()
+        return response
+    except Exception as e:
+        record["error"] = type(e).__name__
+        raise
+    finally:
+        record["seconds"] = time.perf_counter() - start
+        _http_metrics.append(record)
+        if len(_http_metrics) > HTTP_METRICS_MAX:
+            del _http_metrics[:len(_http_metrics) - HTTP_METRICS_MAX]
+        logging.info(f"GET {url} -> {record['status'] or record['error']} "
+                     f"({record['seconds']:.2f}s, {record['bytes']} bytes, {record['retries']} retries"
+                     f"{', cache ' + record['cache'] if record['cache'] else ''})")
+
+
+def http_stats(session=None):
+    """
+    Timing summary of the requests made so far (bytes = body bytes
+    downloaded) + keep-alive connections opened per host (one TLS
+    handshake each)
+    """
+    records = list(_http_metrics)
+    times = sorted(r["seconds"] for r in records)
+    stats = {
+        "requests": len(records),
+        "errors": sum(1 for r in records if r["error"]),
+        "retries": sum(r["retries"] for r in records),
+        "cache_hits": sum(1 for r in records if r["cache"] == "hit"),
+        "revalidated": sum(1 for r in records if r["cache"] == "revalidated"),
+        "bytes": sum(r["bytes"] for r in records),
+        "total_seconds": sum(times),
+        "avg_seconds": sum(times) / len(times) if times else 0.0,
+        "p95_seconds": times[int(0.95 * (len(times) - 1))] if times else 0.0,
+        "connections": {},
+    }
+    session = session or _http_session
+    if session is not None:
+        for prefix in ("http://", "https://"):
+            pools = session.get_adapter(prefix).poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                stats["connections"][f"{pool.scheme}://{pool.host}:{pool.port}"] = pool.num_connections
+    return stats
+
+
+def reset_http_metrics():
+    del _http_metrics[:]
+
+# HTML parsing: one CSS-selector API over the fastest installed backend
+#   selectolax (lexbor engine) > lxml + cssselect > BeautifulSoup("lxml")
+#   > BeautifulSoup("html.parser", always available with bs4)
+# Field specs: "span.text" -> text of the first match,
+#              "a.next@href" -> attribute of the first match
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as LexborHTMLParser
+    except ImportError:
+        LexborHTMLParser = None
+
+try:
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+except ImportError:  # cssselect is a separate package
+    CSSSelector = None
+    try:
+        import lxml.html  # noqa: F401 - still a faster parser for bs4
+        HAS_LXML = True
+    except ImportError:
+        HAS_LXML = False
+else:
+    HAS_LXML = True
+
+try:
+    from bs4 import BeautifulSoup, UnicodeDammit
+except ImportError:
+    BeautifulSoup = UnicodeDammit = None
+
+HTML_BACKENDS = ("selectolax", "lxml", "bs4-lxml", "bs4")
+
+
+def html_backends():
+    """
+    Installed backends, fastest first
+    """
+    available = {
+        "selectolax": LexborHTMLParser is not None,
+        "lxml": CSSSelector is not None,
+        "bs4-lxml": BeautifulSoup is not None and HAS_LXML,
+        "bs4": BeautifulSoup is not None,
+    }
+    return [name for name in HTML_BACKENDS if available[name]]
+
+
+@functools.lru_cache(maxsize=256)
+def _lxml_selector(css):
+    return CSSSelector(css)
+
+
+def _lxml_document(html):
+    """
+    lxml.html.fromstring(bytes) reads a page without <meta charset> as
+    latin-1, so UTF-8 text comes out garbled - decode first (BOM /
+    declared charset / UTF-8 / cp1252, same as bs4) and hand lxml
+    UTF-8 bytes with the encoding set
+    """
+    if not isinstance(html, bytes):
+        return lxml.html.fromstring(html)
+    if UnicodeDammit is not None:
+        text = UnicodeDammit(html, is_html=True).unicode_markup
+        if text is not None:
+            html = text.encode("utf-8")
+    else:
+        try:
+            html.decode("utf-8")
+        except UnicodeDecodeError:
+            return lxml.html.fromstring(html)  # lxml's own guess (meta charset / latin-1)
+    return lxml.html.fromstring(html, parser=lxml.html.HTMLParser(encoding="utf-8"))
+
+
+class HtmlPage:
+    """
+    Parsed page with the same select / text / attr calls on every backend
+    """
+
+    def __init__(self, html, backend):
+        self.backend = backend
+        if backend == "selectolax":
+            self.root = LexborHTMLParser(html)
+        elif backend == "lxml":
+            # lxml rejects an empty document
+            self.root = _lxml_document(html) if html and html.strip() else None
+        elif backend == "bs4-lxml":
+            self.root = BeautifulSoup(html, "lxml")
+        else:
+            self.root = BeautifulSoup(html, "html.parser")
+
+    def select(self, css, node=None):
+        node = self.root if node is None else node
+        if node is None:
+            return []
+        if self.backend == "selectolax":
+            return node.css(css)
+        if self.backend == "lxml":
+            return _lxml_selector(css)(node)
+        return node.select(css)
+
+    def text(self, node):
+        if self.backend == "selectolax":
+            return node.text(deep=True).strip()
+        if self.backend == "lxml":
+            return node.text_content().strip()
+        return node.get_text().strip()
+
+    def attr(self, node, name):
+        if self.backend == "selectolax":
+            return node.attributes.get(name)
+        return node.get(name)
+
+    def value(self, spec, node=None, default=""):
+        """
+        First match of a field spec ("css" or "css@attribute")
+        """
+        css, _, attribute = spec.partition("@")
+        found = self.select(css, node)
+        if not found:
+            return default
+        if attribute:
+            value = self.attr(found[0], attribute)
+            return default if value is None else value
+        return self.text(found[0])
+
+    def values(self, spec, node=None):
+        """
+        Every match of a field spec
+        """
+        css, _, attribute = spec.partition("@")
+        found = self.select(css, node)
+        if attribute:
+            return [v for v in (self.attr(n, attribute) for n in found) if v is not None]
+        return [self.text(n) for n in found]
+
+    def records(self, item_selector, fields):
+        """
+        One dict per item_selector match, fields = {name: field spec}
+        looked up inside that item
+        """
+        return [
+            {name: self.value(spec, item) for name, spec in fields.items()}
+            for item in self.select(item_selector)
+        ]
+
+
+@profiled()
+def parse_html(html, backend="auto"):
+    """
+    Parse HTML (bytes / str) -> HtmlPage
+
+    backend: "auto" (fastest installed) or one of HTML_BACKENDS
+    """
+    available = html_backends()
+    if backend in (None, "auto"):
+        if not available:
+            raise ImportError("No HTML parser: pip install selectolax (or lxml cssselect / beautifulsoup4)")
+        backend = available[0]
+    elif backend not in available:
+        raise ValueError(f"HTML backend '{backend}' not installed (available: {', '.join(available)})")
+    return HtmlPage(html, backend)
 
 # API calling (future)
+@profiled()
 def call_api(url, method, data):
     pass
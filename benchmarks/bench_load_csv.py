@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark: automation_utils.load_csv default vs fast-path options
+Synthetic sales file, 40 columns of which a job needs 4
+(Customer Name / Product / Amount / City, the 02-csv-to-excel config).
+Every variant runs in a fresh process so peak RSS is comparable.
+
+Run from repo root:
+    python benchmarks/bench_load_csv.py                 # 10M rows
+    python benchmarks/bench_load_csv.py --rows 1000000
+"""
+
+import os
+import sys
+import time
+import argparse
+import resource
+import subprocess
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+import automation_utils
+from automation_utils import load_csv, projection_columns, expand_dtypes
+
+REQUIRED_COLUMNS = ["Name", "Product", "Amount", "City"]
+COLUMN_ALIASES = {
+    "Name": ["CustomerName", "Customer Name", "customer_name", "NAME", "name"],
+    "Product": ["product", "Item", "item_name"],
+    "Amount": ["amount", "Price", "Total", "total_amount"],
+    "City": ["city", "Location", "location"]
+}
+COLUMN_DTYPES = {"Amount": "float64"}
+
+EXTRA_COLUMNS = 36
+WRITE_CHUNK = 500_000
+
+VARIANTS = {
+    "default":            dict(),
+    "usecols":            dict(usecols=True, engine="c"),
+    "usecols+dtype":      dict(usecols=True, dtype=True, engine="c"),
+    "usecols+dtype+auto": dict(usecols=True, dtype=True, engine="auto"),
+}
+
+
+def make_file(path, rows, seed=42):
+    rng = np.random.default_rng(seed)
+    names = np.array([f"Customer {i}" for i in range(5000)])
+    products = np.array(["Laptop", "Mobile", "Tablet", "Monitor", "Printer"])
+    cities = np.array(["Delhi", "Mumbai", "Kolkata", "Chennai", "Pune"])
+
+    for start in range(0, rows, WRITE_CHUNK):
+        n = min(WRITE_CHUNK, rows - start)
+        chunk = {
+            "Customer Name": names[rng.integers(0, len(names), n)],
+            "Product": products[rng.integers(0, len(products), n)],
+            "Amount": rng.integers(100, 100000, n),
+            "City": cities[rng.integers(0, len(cities), n)],
+        }
+        for i in range(EXTRA_COLUMNS):
+            if i % 2:
+                chunk[f"extra_{i}"] = rng.integers(0, 1000, n)
+            else:
+                chunk[f"extra_{i}"] = np.char.add("x", rng.integers(0, 50, n).astype(str))
+        pd.DataFrame(chunk).to_csv(path, mode="w" if start == 0 else "a",
+                                   header=start == 0, index=False)
+
+
+def run_variant(path, name):
+    opts = dict(VARIANTS[name])
+    if opts.pop("usecols", False):
+        opts["usecols"] = projection_columns(REQUIRED_COLUMNS, COLUMN_ALIASES)
+    if opts.pop("dtype", False):
+        opts["dtype"] = expand_dtypes(COLUMN_DTYPES, COLUMN_ALIASES)
+
+    rss0 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    start = time.perf_counter()
+    df = load_csv(path, **opts)
+    elapsed = time.perf_counter() - start
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 - rss0
+    frame = df.memory_usage(deep=True).sum() / 1e6
+    print(f"RESULT {elapsed:.2f} {rss:.0f} {frame:.0f} {df.shape[1]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="load_csv fast-path benchmark")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--file", default=os.path.join("benchmarks", "data", "sales_40col.csv"))
+    parser.add_argument("--variant", help=argparse.SUPPRESS)
+    parser.add_argument("--generate", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        return run_variant(args.file, args.variant)
+    if args.generate:
+        return make_file(args.file, args.rows)
+
+    if not os.path.exists(args.file) or sum(1 for _ in open(args.file)) - 1 != args.rows:
+        os.makedirs(os.path.dirname(args.file), exist_ok=True)
+        print(f"📝 Generating {args.rows:,} rows x {4 + EXTRA_COLUMNS} columns -> {args.file}")
+        # own process: peak RSS is inherited across exec on Linux
+        subprocess.run([sys.executable, __file__, "--file", args.file,
+                        "--rows", str(args.rows), "--generate"], check=True)
+
+    size_mb = os.path.getsize(args.file) / 1e6
+    print(f"File: {size_mb:,.0f} MB | Arrow engine: {'yes' if automation_utils.HAS_PYARROW else 'no'}")
+    print(f"{'variant':>20} | {'time':>8} | {'peak RSS':>9} | {'frame':>8} | cols")
+    print("-" * 62)
+
+    for name in VARIANTS:
+        out = subprocess.run(
+            [sys.executable, __file__, "--file", args.file, "--variant", name],
+            capture_output=True, text=True
+        ).stdout
+        line = next((l for l in out.splitlines() if l.startswith("RESULT")), None)
+        if line is None:
+            print(f"{name:>20} | failed")
+            continue
+        t, rss, frame, cols = line.split()[1:]
+        print(f"{name:>20} | {float(t):>7.2f}s | {rss:>6} MB | {frame:>5} MB | {cols}")
+
+
+if __name__ == "__main__":
+    main()
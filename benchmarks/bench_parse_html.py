@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: automation_utils.parse_html backends on saved pages
+Parses every fixture page with each installed backend and extracts the
+scraper's records (QUOTE_SELECTOR / QUOTE_FIELDS from the 04 config),
+plus the old BeautifulSoup("html.parser") + find_all code as baseline.
+Records must match the baseline on every backend.
+
+benchmarks/fixtures/ holds pages in the quotes.toscrape.com layout;
+--save refreshes them from the live site. quotes_no_charset.html has
+no <meta charset> (UTF-8 text must still decode on every backend).
+
+Run from repo root:
+    python benchmarks/bench_parse_html.py
+    python benchmarks/bench_parse_html.py --repeat 500
+    python benchmarks/bench_parse_html.py --save 3
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "04-web-scraping-automation"))
+
+from automation_utils import parse_html, html_backends, fetch_webpage
+from config import BASE_URL, HEADERS, QUOTE_SELECTOR, QUOTE_FIELDS
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def old_parse(content):
+    """
+    scrape_single_page before parse_html (baseline)
+    """
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(content, "html.parser")
+    quotes = soup.find_all("span", class_="text")
+    authors = soup.find_all("small", class_="author")
+    return [{"quote": q.text.strip(), "author": a.text.strip()} for q, a in zip(quotes, authors)]
+
+
+def save_pages(count):
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for n in range(1, count + 1):
+        response = fetch_webpage(f"{BASE_URL}/page/{n}/", headers=HEADERS)
+        path = os.path.join(FIXTURE_DIR, f"quotes_page_{n}.html")
+        with open(path, "wb") as f:
+            f.write(response.content)
+        print(f"💾 {path} ({len(response.content):,} bytes)")
+
+
+def time_parser(parse, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for content in pages:
+            parse(content)
+    return (time.perf_counter() - start) / (repeat * len(pages))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="parse_html backend benchmark")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--save", type=int, metavar="PAGES", help="download fixture pages first")
+    args = parser.parse_args()
+
+    if args.save:
+        save_pages(args.save)
+
+    files = sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html")))
+    if not files:
+        print(f"❌ No fixture pages in {FIXTURE_DIR} (use --save)")
+        return
+    pages = []
+    for path in files:
+        with open(path, "rb") as f:
+            pages.append(f.read())
+
+    expected = [old_parse(content) for content in pages]
+    variants = [("old bs4 find_all", old_parse)]
+    for backend in html_backends():
+        variants.append((backend, lambda content, b=backend:
+                         parse_html(content, b).records(QUOTE_SELECTOR, QUOTE_FIELDS)))
+
+    size_kb = sum(len(p) for p in pages) / 1024
+    print(f"Pages: {len(pages)} ({size_kb:,.0f} KB) x {args.repeat} | backends: {', '.join(html_backends())}")
+    print(f"{'backend':>18} | {'per page':>10} | {'speedup':>7} | records")
+    print("-" * 56)
+
+    baseline = None
+    for name, parse in variants:
+        same = [parse(content) for content in pages] == expected
+        per_page = time_parser(parse, pages, args.repeat)
+        baseline = baseline or per_page
+        print(f"{name:>18} | {per_page * 1000:>7.3f} ms | {baseline / per_page:>6.1f}x | "
+              f"{'match' if same else 'DIFFERENT'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: quadratic row grouping vs textract_utils.cluster_rows
+Synthetic WORD blocks, ~12 words per visual row with small jitter.
+Rows are 0.015 apart and keep going past 1.0 to emulate a long,
+multi-page item table (row count grows with word count).
+
+Run from repo root:
+    python benchmarks/bench_row_clustering.py
+"""
+
+import os
+import sys
+import time
+import random
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from textract_utils import cluster_rows
+
+SIZES = [100, 1000, 5000, 20000, 50000]
+QUADRATIC_MAX = 20000  # old approach takes minutes beyond this
+
+
+def make_words(n, words_per_row=12, row_gap=0.015):
+    words = []
+    for i in range(n):
+        row = i // words_per_row
+        words.append({
+            "BlockType": "WORD",
+            "Text": f"w{i}",
+            "Geometry": {"BoundingBox": {
+                "Top": row * row_gap + random.uniform(0, 0.004),
+                "Left": random.random()
+            }}
+        })
+    random.shuffle(words)
+    return words
+
+
+def old_line_groups(words, y_tol=0.01):
+    """Previous per-row linear scan (phase3 / gst_ocr_pro / core_agent_ready)"""
+    lines = []
+    for w in words:
+        y = round(w["Geometry"]["BoundingBox"]["Top"], 3)
+        for ln in lines:
+            if abs(ln["y"] - y) <= y_tol:
+                ln["words"].append(w)
+                break
+        else:
+            lines.append({"y": y, "words": [w]})
+    return sorted(lines, key=lambda x: x["y"])
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def top(w):
+    return round(w["Geometry"]["BoundingBox"]["Top"], 3)
+
+
+def main():
+    random.seed(42)
+
+    print(f"{'words':>8} | {'quadratic':>10} | {'sweep':>10}")
+    print("-" * 36)
+
+    for n in SIZES:
+        words = make_words(n)
+
+        old = timed(old_line_groups, words) if n <= QUADRATIC_MAX else None
+        new = timed(cluster_rows, words, top, 0.01, True)
+
+        fmt = lambda t: f"{t * 1000:>8.1f}ms" if t is not None else f"{'skipped':>10}"
+        print(f"{n:>8} | {fmt(old)} | {fmt(new)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Regression check: duplicate counts of the chunked (--chunksize) run
+must equal the in-memory drop_duplicates run
+
+Each case is a small CSV whose columns pandas infers differently per
+chunk (all-empty Product in one chunk, int-then-text Product), which
+used to make the same row hash differently across chunks.
+Exits 1 if any case differs.
+
+Run from repo root:
+    python benchmarks/check_chunk_dedupe.py
+"""
+
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PROJECT_DIR = os.path.join(ROOT_DIR, "02-csv-to-excel-automation")
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, PROJECT_DIR)
+
+os.chdir(PROJECT_DIR)  # the script logs to logs/automation.log
+from csv_to_excel_automation import clean_data, clean_chunk, infer_dtypes, HashSeen
+
+HEADER = "Name,Product,Amount,City\n"
+
+CASES = {
+    # chunk 2 has an all-empty Product (float64 NaN vs object NaN)
+    "empty product across chunks": [
+        "Amit,Laptop,50000,Delhi",
+        "Suresh,,30000,Kolkata",
+        "Suresh,,30000,Kolkata",
+        "Rita,,20000,Mumbai",
+    ],
+    # Product is int in chunk 1, text in chunk 2
+    "int then text product": [
+        "Amit,123,50000,Delhi",
+        "Rita,456,20000,Mumbai",
+        "Amit,123,50000,Delhi",
+        "Suresh,Mobile,30000,Kolkata",
+    ],
+    # Amount is int in chunk 1, float (NaN) in chunk 2
+    "int then missing amount": [
+        "Amit,Laptop,50000,Delhi",
+        "Rita,Mobile,20000,Mumbai",
+        "Amit,Laptop,50000,Delhi",
+        "Suresh,Mobile,,Kolkata",
+    ],
+}
+
+
+def in_memory(path):
+    _, dups, _, _ = clean_data(pd.read_csv(path))
+    return dups
+
+
+def chunked(path, chunksize):
+    seen, dups = HashSeen(), 0
+    dtypes = infer_dtypes(path, chunksize)
+    for chunk in pd.read_csv(path, chunksize=chunksize, dtype=dtypes):
+        dups += clean_chunk(chunk, seen)[1]
+    return dups
+
+
+def main():
+    failed = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, rows in CASES.items():
+            path = os.path.join(tmp, "case.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(HEADER + "\n".join(rows) + "\n")
+            expected = in_memory(path)
+            for chunksize in (1, 2, 3):
+                got = chunked(path, chunksize)
+                ok = got == expected
+                failed += not ok
+                print(f"{'✅' if ok else '❌'} {name} (chunksize {chunksize}): "
+                      f"{got} duplicates, in-memory {expected}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,418 @@
+# File: crawl_frontier.py
+# Frontier crawler on top of async_fetcher + automation_utils.parse_html
+# Reusable across ALL projects!
+#
+#   crawler = Crawler(
+#       [f"{BASE_URL}/page/1/"],
+#       extract=lambda page, url: page.records("div.quote", FIELDS),
+#       next_selector="li.next a@href",
+#       follow_patterns=[r"/tag/[^/]+/page/\d+/$"],
+#       checkpoint_path="checkpoints/quotes.json",
+#   )
+#   records = crawler.run()        # resumes if a checkpoint exists
+#
+# Pages are discovered (next links + links matching follow_patterns)
+# instead of a fixed page range. Visited / queued URLs are deduplicated
+# with a set, or a Bloom filter for big crawls. Every checkpoint_every
+# pages the new records and newly seen URLs are appended to disk (the
+# frontier is the unfetched tail of the seen-URL log, so nothing is
+# rewritten in full); a rerun after a crash / Ctrl+C continues from there.
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+from collections import deque
+from itertools import islice
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from async_fetcher import AsyncFetcher
+from automation_utils import parse_html
+
+BLOOM_THRESHOLD = 100000  # dedupe="auto" switches to a Bloom filter past this many pages
+BLOOM_SYNC_URLS = 10000   # new URLs between rewrites of the Bloom bits file
+
+# ============================================
+# URL DEDUPE
+# ============================================
+
+def normalize_url(url):
+    """
+    Same page -> same string: lowercase scheme / host, no fragment,
+    "/" for an empty path
+    """
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, ""))
+
+
+class UrlSet:
+    """
+    Exact seen-URL set (memory grows with the crawl)
+    """
+
+    kind = "set"
+
+    def __init__(self, urls=None):
+        self.urls = set(urls or [])
+
+    def add(self, url):
+        self.urls.add(url)
+
+    def __contains__(self, url):
+        return url in self.urls
+
+    def __len__(self):
+        return len(self.urls)
+
+    def state(self):
+        return {"kind": self.kind}  # the URLs themselves live in the seen log
+
+    @classmethod
+    def from_state(cls, state):
+        return cls()
+
+
+class BloomFilter:
+    """
+    Fixed-size seen-URL filter: capacity URLs at ~error_rate false
+    positives (a false positive skips a page, never fetches one twice)
+    """
+
+    kind = "bloom"
+
+    def __init__(self, capacity=1000000, error_rate=0.001, bits=None, count=0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray((self.size + 7) // 8)
+        self.count = count
+
+    def _positions(self, url):
+        digest = hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, url):
+        for pos in self._positions(url):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, url):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(url))
+
+    def __len__(self):
+        return self.count
+
+    def state(self):
+        return {"kind": self.kind, "capacity": self.capacity, "error_rate": self.error_rate}
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(state["capacity"], state["error_rate"])
+
+    def save(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(self.bits)
+        os.replace(tmp, path)
+
+    def load(self, path, count):
+        with open(path, "rb") as f:
+            self.bits = bytearray(f.read())
+        self.count = count
+
+
+def make_seen(dedupe, max_pages=None):
+    """
+    dedupe: "set", "bloom" or "auto" (Bloom filter only when max_pages
+            is past BLOOM_THRESHOLD; unlimited crawls keep the exact
+            set - pass "bloom" for a known huge one)
+    """
+    if dedupe == "auto":
+        dedupe = "bloom" if max_pages is not None and max_pages > BLOOM_THRESHOLD else "set"
+    if dedupe == "bloom":
+        return BloomFilter(capacity=max(BLOOM_THRESHOLD, (max_pages or 0) * 20))
+    if dedupe == "set":
+        return UrlSet()
+    raise ValueError(f"Unknown dedupe '{dedupe}' (set / bloom / auto)")
+
+
+def _seen_from_state(state):
+    return BloomFilter.from_state(state) if state["kind"] == "bloom" else UrlSet.from_state(state)
+
+# ============================================
+# CRAWLER
+# ============================================
+
+class Crawler:
+    """
+    Breadth-first crawl from start_urls
+
+    extract(page, url) -> list of records (page = parse_html HtmlPage)
+    next_selector: field spec of the "next page" link (always followed)
+    follow_patterns: regexes; any link whose absolute URL matches is queued
+    same_host: only queue links on the start URLs' hosts
+    max_pages / max_depth: stop limits (None = no limit)
+    checkpoint_path: state JSON; records go to <path minus .json>.jsonl,
+                     seen URLs to .seen (+ .bloom bits for a Bloom filter)
+    checkpoint_every: pages between checkpoints
+    fetch_options: AsyncFetcher settings (concurrency, per_host, ...)
+    """
+
+    def __init__(self, start_urls, extract, next_selector=None, follow_patterns=None,
+                 same_host=True, max_pages=None, max_depth=None, dedupe="auto",
+                 checkpoint_path=None, checkpoint_every=20, html_backend="auto",
+                 on_page=None, **fetch_options):
+        self.start_urls = [normalize_url(u) for u in start_urls]
+        self.extract = extract
+        self.next_selector = next_selector
+        self.follow_patterns = [re.compile(p) for p in (follow_patterns or [])]
+        self.hosts = {urlsplit(u).netloc for u in self.start_urls} if same_host else None
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.dedupe = dedupe
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.html_backend = html_backend
+        self.on_page = on_page
+        self.fetch_options = fetch_options
+
+        self.frontier = deque()
+        self.seen = None
+        self.pages = 0
+        self.records_written = 0
+        self.failed = []
+        self.retry = 0         # leading frontier entries re-queued on resume (not in the seen log)
+        self.pending = []      # records since the last checkpoint
+        self.new_seen = []     # [url, depth] queued since the last checkpoint
+        self.seen_lines = 0    # entries / bytes in the seen log
+        self.seen_bytes = 0
+        self.bloom_lines = 0   # seen log entries covered by the .bloom file
+        self.resumed = False
+
+    # ---------- state ----------
+
+    def _checkpoint_file(self, ext):
+        base = self.checkpoint_path[:-5] if self.checkpoint_path.endswith(".json") else self.checkpoint_path
+        return base + ext
+
+    @property
+    def results_path(self):
+        return self._checkpoint_file(".jsonl")
+
+    @property
+    def seen_path(self):
+        return self._checkpoint_file(".seen")
+
+    @property
+    def bloom_path(self):
+        return self._checkpoint_file(".bloom")
+
+    def _start(self):
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if not state.get("done"):
+                self._restore(state)
+                return
+        self.seen = make_seen(self.dedupe, self.max_pages)
+        for url in self.start_urls:
+            self._push(url, 0)
+        if self.checkpoint_path:
+            for path in (self.results_path, self.seen_path, self.bloom_path):
+                if os.path.exists(path):
+                    os.remove(path)  # files of an earlier, finished crawl
+
+    def _restore(self, state):
+        self.seen = _seen_from_state(state["seen"])
+        replay_from = 0
+        if self.seen.kind == "bloom" and os.path.exists(self.bloom_path):
+            self.seen.load(self.bloom_path, state["bloom_lines"])
+            replay_from = self.bloom_lines = state["bloom_lines"]
+
+        # seen log: drop entries appended after the last state file, then
+        # rebuild the seen filter and the frontier (entries from queued_from on)
+        self.seen_lines, self.seen_bytes = state["seen_lines"], state["seen_bytes"]
+        self.frontier = deque()
+        if os.path.exists(self.seen_path):
+            with open(self.seen_path, "r+b") as f:
+                f.truncate(self.seen_bytes)
+            with open(self.seen_path, "r", encoding="utf-8") as f:
+                for i, line in enumerate(f):
+                    url, depth = json.loads(line)
+                    if i >= replay_from:
+                        self.seen.add(url)
+                    if i >= state["queued_from"]:
+                        self.frontier.append((url, depth))
+
+        self.pages = state["pages"] - len(state["failed"])  # retried below, counted again
+        self.records_written = state["records"]
+        self.failed = []
+        # failed pages get another try: back to the front of the queue
+        # (they are already in the seen filter, so _push would skip them)
+        retry = [(url, depth) for url, depth in state["retry"] + state["failed"]]
+        self.frontier.extendleft(reversed(retry))
+        self.retry = len(retry)
+        self.resumed = True
+        # drop records written after the checkpoint - their pages are
+        # still in the restored frontier and get fetched again
+        lines = []
+        if os.path.exists(self.results_path):
+            with open(self.results_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if len(lines) == self.records_written:
+                        break
+                    lines.append(line)
+        with open(self.results_path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        self.records_written = len(lines)
+        print(f"♻️ Resuming crawl: {self.pages} pages done, {len(self.frontier)} queued, "
+              f"{self.records_written} records")
+        logging.info(f"Resumed crawl from {self.checkpoint_path} ({self.pages} pages done)")
+
+    def checkpoint(self, done=False):
+        """
+        Append new records and seen URLs, then atomically replace the
+        (small) state file; the Bloom bits are rewritten only every
+        BLOOM_SYNC_URLS new URLs - a resume replays the log tail
+        """
+        if not self.checkpoint_path:
+            return
+        os.makedirs(os.path.dirname(self.checkpoint_path) or ".", exist_ok=True)
+        if self.pending:
+            with open(self.results_path, "a", encoding="utf-8") as f:
+                for record in self.pending:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.records_written += len(self.pending)
+            self.pending = []
+        if self.new_seen:
+            with open(self.seen_path, "ab") as f:
+                for entry in self.new_seen:
+                    f.write((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+                self.seen_bytes = f.tell()
+            self.seen_lines += len(self.new_seen)
+            self.new_seen = []
+        state = {
+            "start_urls": self.start_urls, "done": done, "pages": self.pages,
+            "records": self.records_written, "failed": self.failed,
+            "retry": list(islice(self.frontier, self.retry)),
+            # the rest of the frontier = last entries of the seen log
+            "queued_from": self.seen_lines - (len(self.frontier) - self.retry),
+            "seen_lines": self.seen_lines, "seen_bytes": self.seen_bytes,
+            "bloom_lines": self.bloom_lines, "seen": self.seen.state(),
+        }
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.checkpoint_path)
+        if self.seen.kind == "bloom" and self.seen_lines - self.bloom_lines >= BLOOM_SYNC_URLS:
+            self.seen.save(self.bloom_path)
+            self.bloom_lines = self.seen_lines  # recorded by the next state file
+        logging.info(f"Checkpoint: {self.pages} pages, {len(self.frontier)} queued, {self.records_written} records")
+
+    # ---------- links ----------
+
+    def _push(self, url, depth):
+        url = normalize_url(url)
+        if url in self.seen:
+            return False
+        if self.hosts is not None and urlsplit(url).netloc not in self.hosts:
+            return False
+        self.seen.add(url)  # queued = seen, so a page is never queued twice
+        self.frontier.append((url, depth))
+        if self.checkpoint_path:
+            self.new_seen.append([url, depth])
+        return True
+
+    def links(self, page, url):
+        """
+        Next link + every link matching follow_patterns (absolute URLs)
+        """
+        found = []
+        if self.next_selector:
+            found.extend(page.values(self.next_selector))
+        if self.follow_patterns:
+            for href in page.values("a@href"):
+                absolute = urljoin(url, href)
+                if any(p.search(absolute) for p in self.follow_patterns):
+                    found.append(absolute)
+        return [urljoin(url, href) for href in found]
+
+    # ---------- run ----------
+
+    def _limit_reached(self):
+        return self.max_pages is not None and self.pages >= self.max_pages
+
+    async def _crawl(self):
+        batch_size = max(1, self.fetch_options.get("concurrency", 8)) * 2
+        since_checkpoint = 0
+        async with AsyncFetcher(**self.fetch_options) as fetcher:
+            while self.frontier and not self._limit_reached():
+                room = batch_size if self.max_pages is None else min(batch_size, self.max_pages - self.pages)
+                batch = [self.frontier.popleft() for _ in range(min(room, len(self.frontier)))]
+                retry = self.retry
+                self.retry = max(0, retry - len(batch))
+                try:
+                    results = await fetcher.fetch_all([url for url, _ in batch])
+                except BaseException:
+                    self.frontier.extendleft(reversed(batch))  # not done - keep them queued
+                    self.retry = retry
+                    raise
+
+                for (url, depth), result in zip(batch, results):
+                    self.pages += 1
+                    if not result.ok:
+                        self.failed.append((url, depth))
+                        print(f"   ❌ Network error: {url} - {result.error}")
+                        continue
+                    try:
+                        page = parse_html(result.content, self.html_backend)
+                        records = self.extract(page, url)
+                    except Exception as e:
+                        self.failed.append((url, depth))
+                        print(f"   ❌ Unexpected error: {e}")
+                        logging.error(f"Unexpected error on {url}: {e}")
+                        continue
+                    self.pending.extend(records)
+                    if self.on_page:
+                        self.on_page(url, records, result)
+                    if self.max_depth is None or depth < self.max_depth:
+                        for link in self.links(page, url):
+                            self._push(link, depth + 1)
+
+                since_checkpoint += len(batch)
+                if since_checkpoint >= self.checkpoint_every:
+                    self.checkpoint()
+                    since_checkpoint = 0
+
+    def run(self):
+        """
+        Crawl until the frontier is empty or max_pages; returns every
+        record (including those from before a resume)
+        """
+        self._start()
+        try:
+            asyncio.run(self._crawl())
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            self.checkpoint()
+            print(f"\n⏸️ Crawl interrupted - checkpoint saved: {self.checkpoint_path}")
+            raise
+        # failed pages keep the crawl open: a rerun retries them
+        self.checkpoint(done=not self.frontier and not self.failed)
+        logging.info(f"Crawl finished: {self.pages} pages, {len(self.failed)} failed, "
+                     f"{len(self.frontier)} still queued")
+        return self.records()
+
+    def records(self):
+        if not self.checkpoint_path:
+            return list(self.pending)
+        out = []
+        if os.path.exists(self.results_path):
+            with open(self.results_path, "r", encoding="utf-8") as f:
+                out = [json.loads(line) for line in f if line.strip()]
+        return out + self.pending
@@ -0,0 +1,253 @@
+# File: excel_rollover.py
+# Streaming Excel writer that rolls over past the row limit
+# Reusable across ALL report writers!
+#
+#   "Item Details" -> "Item Details (2)" -> "Item Details (3)" ...
+#   report.xlsx    -> report_part2.xlsx  -> report_part3.xlsx ...
+#
+# Every part is a write-only (streaming) worksheet, so rows go straight
+# to disk and a rollover costs no extra memory. When anything rolled
+# over, an "Index" sheet in the first workbook lists all the parts.
+
+import os
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, Border, Side, NamedStyle
+
+# ============================================
+# LIMITS
+# ============================================
+
+EXCEL_MAX_ROWS = 1048576            # hard sheet limit (header included)
+BOOK_MAX_ROWS = 3 * EXCEL_MAX_ROWS  # rows per workbook file before the next file
+HEADER_STYLE = "rollover_header"    # bold / thin border / centered (pandas look)
+
+INDEX_HEADERS = ["Sheet", "Part", "Workbook", "Worksheet", "First Record", "Last Record", "Records"]
+
+
+def part_sheet_name(name, n):
+    """
+    Item Details, Item Details (2), Item Details (3) ...
+    """
+    return name if n == 1 else f"{name} ({n})"
+
+
+def part_file_path(path, n):
+    """
+    report.xlsx, report_part2.xlsx, report_part3.xlsx ...
+    """
+    if n == 1:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}_part{n}{ext}"
+
+
+def _add_header_style(wb):
+    side = Side(style="thin")
+    wb.add_named_style(NamedStyle(
+        name=HEADER_STYLE,
+        font=Font(bold=True),
+        border=Border(left=side, right=side, top=side, bottom=side),
+        alignment=Alignment(horizontal="center", vertical="top")
+    ))
+
+# ============================================
+# WORKBOOK
+# ============================================
+
+class RolloverWorkbook:
+    """
+    One logical workbook, written as one or more .xlsx files
+
+    max_rows:  rows per worksheet part (header included)
+    book_rows: rows per workbook file; the sheet being written
+               continues in the next file
+    setup:     setup(wb) for every new file (e.g. add named styles)
+
+    with RolloverWorkbook(path) as book:
+        items = book.sheet("Item Details", ITEM_HEADERS)
+        for row in rows:
+            items.append(row)
+    book.files -> every file written
+    """
+
+    def __init__(self, path, max_rows=EXCEL_MAX_ROWS, book_rows=BOOK_MAX_ROWS,
+                 setup=None, index_sheet="Index"):
+        self.path = path
+        self.max_rows = max_rows
+        self.book_rows = book_rows
+        self.setup = setup
+        self.index_sheet = index_sheet
+        self.files = []
+        self.parts = []          # one entry per worksheet part (for the index)
+        self._sheets = []
+        self._first = None
+        self._book = None
+        self._book_no = 0
+        self._book_used = 0
+        self._new_book()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+
+    def _new_book(self):
+        wb = Workbook(write_only=True)
+        _add_header_style(wb)
+        if self.setup:
+            self.setup(wb)
+        self._book_no += 1
+        self._book = wb
+        self._book_used = 0
+        self.files.append(part_file_path(self.path, self._book_no))
+        if self._first is None:
+            self._first = wb
+
+    def _roll_book(self):
+        # finish every part still open in this file, then move on
+        for sheet in self._sheets:
+            if sheet.ws is not None and sheet.book_no == self._book_no:
+                sheet.finish_part()
+        if self._book is not self._first:
+            self._book.save(self.files[-1])
+        self._new_book()
+
+    def sheet(self, name, headers=(), header_style=HEADER_STYLE, start=None, finish=None):
+        """
+        New logical sheet, written part by part
+
+        start(ws) runs when a part is created (before the header),
+        finish(ws, last_row) once a part is complete (conditional
+        formats over the part's range etc.).
+        """
+        sheet = RolloverSheet(self, name, list(headers), header_style, start, finish)
+        self._sheets.append(sheet)
+        sheet.start_part()
+        return sheet
+
+    def close(self):
+        for sheet in self._sheets:
+            if sheet.ws is not None:
+                sheet.finish_part()
+
+        if len(self.parts) > len(self._sheets):
+            self._write_index()
+
+        if self._book is not self._first:
+            self._book.save(self.files[-1])
+        self._first.save(self.files[0])
+        return self.files
+
+    def _write_index(self):
+        ws = self._first.create_sheet(self.index_sheet)
+        ws.append([self._header_cell(ws, h, HEADER_STYLE) for h in INDEX_HEADERS])
+        for p in self.parts:
+            ws.append([p["sheet"], p["part"], os.path.basename(p["file"]), p["worksheet"],
+                       p["first"], p["last"], p["records"]])
+        self._first.move_sheet(ws.title, offset=-(len(self._first.worksheets) - 1))
+
+    @staticmethod
+    def _header_cell(ws, value, style):
+        cell = WriteOnlyCell(ws, value=value)
+        if style:
+            cell.style = style
+        return cell
+
+# ============================================
+# SHEET
+# ============================================
+
+class RolloverSheet:
+    """
+    Logical sheet: append() rows, parts are opened as needed
+    """
+
+    def __init__(self, book, name, headers, header_style, start, finish):
+        self.book = book
+        self.name = name
+        self.headers = headers
+        self.header_style = header_style
+        self.start = start
+        self.finish = finish
+        self.records = 0
+        self.part_no = 0
+        self.book_no = 0
+        self.ws = None
+        self._part = None
+        self._used = 0                       # data rows in the current part
+        self._head = 1 if headers else 0
+        self._capacity = book.max_rows - self._head
+        if self._capacity < 1:
+            raise ValueError("max_rows leaves no room for data rows")
+
+    def start_part(self):
+        book = self.book
+        if book._book_used >= book.book_rows:
+            book._roll_book()
+        self.part_no += 1
+        self.book_no = book._book_no
+        self.ws = book._book.create_sheet(part_sheet_name(self.name, self.part_no))
+        self._used = 0
+        self._part = {
+            "sheet": self.name, "part": self.part_no, "file": book.files[-1],
+            "worksheet": self.ws.title, "first": self.records + 1,
+            "last": self.records, "records": 0
+        }
+        book.parts.append(self._part)
+        if self.start:
+            self.start(self.ws)
+        if self.headers:
+            self.ws.append([book._header_cell(self.ws, h, self.header_style) for h in self.headers])
+            book._book_used += 1
+
+    def finish_part(self):
+        if self.finish:
+            self.finish(self.ws, self._head + self._used)
+        self.ws = None
+
+    def append(self, row, style=None):
+        """
+        style: named style applied to every cell of the row
+        """
+        book = self.book
+        if self.ws is None or self._used >= self._capacity or book._book_used >= book.book_rows:
+            if self.ws is not None:
+                self.finish_part()
+            self.start_part()
+        if style:
+            row = [book._header_cell(self.ws, value, style) for value in row]
+        self.ws.append(row)
+        self._used += 1
+        book._book_used += 1
+        self.records += 1
+        self._part["last"] = self.records
+        self._part["records"] += 1
+
+# ============================================
+# RECORDS (list of dicts, DataFrame-style)
+# ============================================
+
+def record_columns(records):
+    """
+    Column order pd.DataFrame(records) would use: keys by first appearance
+    """
+    cols = {}
+    for r in records:
+        for k in r:
+            cols.setdefault(k, None)
+    return list(cols)
+
+
+def write_records(book, name, records):
+    """
+    Write a list of dicts as one logical sheet (rolls over as needed)
+    Missing keys become empty cells, like pandas.
+    """
+    cols = record_columns(records)
+    sheet = book.sheet(name, cols)
+    for r in records:
+        sheet.append([r.get(c) for c in cols])
+    return sheet
@@ -0,0 +1,205 @@
+# File: http_cache.py
+# On-disk HTTP cache for automation_utils.fetch_webpage / async_fetcher
+# Scraper reruns (parsing fixes, scheduled jobs) revalidate pages with
+# If-None-Match / If-Modified-Since instead of downloading them again;
+# a 304 reuses the stored body. Offline mode serves only from the cache.
+#
+#   cache = HttpCache()
+#   entry = cache.get(url)
+#   headers = cache.validators(entry)       # conditional request
+#   ... 304 -> cache.refresh(entry, resp_headers), body = cache.body(entry)
+#   ... 200 -> cache.put(url, request_headers, 200, resp_headers, body)
+
+import hashlib
+import json
+import logging
+import os
+import time
+import zlib
+
+# ============================================
+# SETTINGS
+# ============================================
+
+CACHE_DIR = os.environ.get(
+    "AUTOMATION_HTTP_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "automation_http")
+)
+CACHE_MAX_BYTES = int(os.environ.get("AUTOMATION_HTTP_CACHE_MAX_MB", "512")) * 1024 * 1024
+CACHE_ENABLED = os.environ.get("AUTOMATION_HTTP_CACHE", "1") != "0"
+OFFLINE = os.environ.get("AUTOMATION_OFFLINE") == "1"
+MAX_AGE = float(os.environ.get("AUTOMATION_HTTP_CACHE_MAX_AGE", "0"))
+
+# request headers that change the response (part of the key) and the
+# value assumed when a client doesn't send one
+KEY_HEADERS = {"Accept": "*/*", "Accept-Language": ""}
+# response headers not kept: the body is stored decoded
+DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+# ============================================
+# CACHE
+# ============================================
+
+class HttpCache:
+    """
+    One <key>.json (status, headers, validators, stored_at) +
+    <key>.body (zlib compressed) per URL + key headers
+
+    offline: get() is the only source - callers must not hit the network
+    max_age: seconds a stored page is used without revalidation
+             (0 = always revalidate when online)
+    Least recently used entries are evicted past max_bytes.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES,
+                 offline=OFFLINE, max_age=MAX_AGE):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.max_age = max_age
+
+    def key(self, url, headers=None):
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        parts = [url] + [f"{h}={headers.get(h.lower(), default)}" for h, default in KEY_HEADERS.items()]
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def _files(self, key):
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return base + ".json", base + ".body"
+
+    def get(self, url, headers=None):
+        """
+        Stored entry (dict, body not loaded) or None
+        """
+        key = self.key(url, headers)
+        meta_path, body_path = self._files(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(body_path):
+            return None
+        entry["key"] = key
+        return entry
+
+    def body(self, entry):
+        _, body_path = self._files(entry["key"])
+        with open(body_path, "rb") as f:
+            data = zlib.decompress(f.read())
+        os.utime(body_path)  # mark as recently used
+        return data
+
+    def is_fresh(self, entry):
+        return self.max_age > 0 and time.time() - entry["stored_at"] < self.max_age
+
+    def validators(self, entry):
+        """
+        Conditional request headers for a stored entry
+        """
+        if not entry:
+            return {}
+        out = {}
+        if entry.get("etag"):
+            out["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            out["If-Modified-Since"] = entry["last_modified"]
+        return out
+
+    def _write_meta(self, key, entry):
+        meta_path, _ = self._files(key)
+        entry = {k: v for k, v in entry.items() if k != "key"}
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def put(self, url, request_headers, status, response_headers, body):
+        """
+        Store a 200 response (no-store responses are skipped)
+        """
+        response_headers = dict(response_headers or {})
+        lower = {k.lower(): v for k, v in response_headers.items()}
+        if status != 200 or "no-store" in lower.get("cache-control", ""):
+            return False
+        key = self.key(url, request_headers)
+        meta_path, body_path = self._files(key)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        with open(body_path + ".tmp", "wb") as f:
+            f.write(zlib.compress(body, 6))
+        os.replace(body_path + ".tmp", body_path)
+        self._write_meta(key, {
+            "url": url, "status": status, "stored_at": time.time(),
+            "headers": {k: v for k, v in response_headers.items() if k.lower() not in DROP_HEADERS},
+            "etag": lower.get("etag"), "last_modified": lower.get("last-modified"),
+            "size": len(body),
+        })
+        self.evict()
+        return True
+
+    def refresh(self, entry, response_headers=None):
+        """
+        After a 304: newer validators / headers, stored_at = now
+        """
+        for k, v in (response_headers or {}).items():
+            if k.lower() not in DROP_HEADERS:
+                entry["headers"][k] = v
+            if k.lower() == "etag":
+                entry["etag"] = v
+            elif k.lower() == "last-modified":
+                entry["last_modified"] = v
+        entry["stored_at"] = time.time()
+        self._write_meta(entry["key"], entry)
+
+    def entries(self):
+        """
+        (mtime, size, key) per stored body, oldest use first
+        """
+        if not os.path.isdir(self.cache_dir):
+            return []
+        out = []
+        for sub in os.listdir(self.cache_dir):
+            folder = os.path.join(self.cache_dir, sub)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if name.endswith(".body"):
+                    try:
+                        st = os.stat(os.path.join(folder, name))
+                    except OSError:
+                        continue
+                    out.append((st.st_mtime, st.st_size, name[:-5]))
+        return sorted(out)
+
+    def remove(self, key):
+        for p in self._files(key):
+            if os.path.exists(p):
+                os.remove(p)
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            self.remove(key)
+            total -= size
+            logging.info(f"HTTP cache evicted: {key}")
+
+    def clear(self):
+        for _, _, key in self.entries():
+            self.remove(key)
+
+
+_default = None
+
+
+def default_http_cache():
+    """
+    Shared cache used by fetch_webpage / async_fetcher (None if disabled)
+    """
+    global _default
+    if not CACHE_ENABLED and not OFFLINE:
+        return None
+    if _default is None:
+        _default = HttpCache()
+    return _default
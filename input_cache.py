@@ -0,0 +1,213 @@
+# File: input_cache.py
+# Parsed-input cache for automation_utils.load_csv / load_excel
+# Re-running a job on the same big export skips the CSV / openpyxl
+# parse: the DataFrame is stored once as an uncompressed Feather
+# (Arrow IPC) file and memory-mapped on every later load.
+
+import datetime
+import hashlib
+import json
+import logging
+import numbers
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # cache is optional - loaders just parse every time
+    pa = feather = None
+
+# ============================================
+# SETTINGS
+# ============================================
+
+CACHE_DIR = os.environ.get(
+    "AUTOMATION_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "automation_inputs")
+)
+CACHE_MAX_BYTES = int(os.environ.get("AUTOMATION_CACHE_MAX_MB", "2048")) * 1024 * 1024
+CACHE_ENABLED = os.environ.get("AUTOMATION_CACHE", "1") != "0"
+
+LABELS_KEY = b"automation_labels"  # schema metadata: original column labels
+
+# ============================================
+# COLUMN LABELS
+# ============================================
+# Arrow field names are always str - a 2024 header (or header=None's
+# 0, 1, 2 ...) would come back as "2024". The real labels are kept as
+# [type, value] pairs in the schema metadata.
+
+def _encode_labels(columns):
+    """
+    JSON for the labels, or None if one can't be encoded (tuples ...)
+    """
+    out = []
+    for label in columns:
+        if isinstance(label, str):
+            out.append(["str", label])
+        elif isinstance(label, bool):
+            out.append(["bool", label])
+        elif isinstance(label, numbers.Integral):
+            out.append(["int", int(label)])
+        elif isinstance(label, numbers.Real):
+            out.append(["float", float(label)])
+        elif isinstance(label, datetime.datetime):
+            out.append(["datetime", label.isoformat()])
+        else:
+            return None
+    return json.dumps(out)
+
+
+def _decode_labels(raw):
+    labels = []
+    for kind, value in json.loads(raw):
+        if kind == "datetime":
+            value = datetime.datetime.fromisoformat(value)
+        labels.append(value)
+    return labels
+
+# ============================================
+# CACHE
+# ============================================
+
+class InputCache:
+    """
+    One .feather file per (absolute path, size, mtime, loader, options)
+
+    A changed source file gets a new key, so stale entries are never
+    read - they just age out. Least recently used entries are evicted
+    once the directory grows past max_bytes (file mtime = last use).
+    Frames Arrow can't store leave an empty <key>.skip marker, so the
+    conversion isn't retried on every load of the same file.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @property
+    def available(self):
+        return feather is not None
+
+    def key(self, path, loader, options):
+        """
+        Cache key, or None when the call can't be cached
+        (callable options, missing file, no pyarrow)
+        """
+        if not self.available or any(callable(v) for v in options.values()):
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        raw = json.dumps(
+            [os.path.abspath(path), st.st_size, st.st_mtime_ns, loader, options],
+            sort_keys=True, default=repr
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _file(self, key, suffix=".feather"):
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def get(self, key):
+        """
+        Cached DataFrame (memory-mapped read) or None
+        """
+        if key is None:
+            return None
+        target = self._file(key)
+        try:
+            table = feather.read_table(target, memory_map=True)
+        except (OSError, pa.ArrowException):
+            return None
+        os.utime(target)  # mark as recently used
+        logging.info(f"Input cache hit: {target}")
+        labels = (table.schema.metadata or {}).get(LABELS_KEY)
+        df = table.to_pandas()
+        if labels is not None:
+            df.columns = _decode_labels(labels)
+        return df
+
+    def put(self, key, df):
+        """
+        Store a parsed frame; frames Arrow can't represent
+        (mixed-type object columns etc.) are simply not cached
+        """
+        if key is None:
+            return False
+        skip = self._file(key, ".skip")
+        if os.path.exists(skip):
+            return False
+        os.makedirs(self.cache_dir, exist_ok=True)
+        target = self._file(key)
+        try:
+            labels = _encode_labels(df.columns)
+            if labels is None:
+                raise ValueError("column labels are not str / number / datetime")
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            table = table.replace_schema_metadata({**(table.schema.metadata or {}), LABELS_KEY: labels})
+            feather.write_feather(table, target + ".tmp", compression="uncompressed")
+            os.replace(target + ".tmp", target)
+        except (pa.ArrowException, TypeError, ValueError, OSError) as e:
+            logging.debug(f"Input cache skipped ({e})")
+            if os.path.exists(target + ".tmp"):
+                os.remove(target + ".tmp")
+            try:
+                open(skip, "w").close()
+            except OSError:
+                pass
+            return False
+        self.evict()
+        return True
+
+    def entries(self):
+        """
+        (mtime, size, path) of every cache file / skip marker, oldest first
+        """
+        if not os.path.isdir(self.cache_dir):
+            return []
+        out = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith((".feather", ".skip")):
+                p = os.path.join(self.cache_dir, name)
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    continue
+                out.append((st.st_mtime, st.st_size, p))
+        return sorted(out)
+
+    def evict(self):
+        """
+        Drop least recently used files until the total fits max_bytes
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(p)
+            except OSError:
+                continue
+            total -= size
+            logging.info(f"Input cache evicted: {p}")
+
+    def clear(self):
+        for _, _, p in self.entries():
+            os.remove(p)
+
+
+_default = None
+
+
+def default_cache():
+    """
+    Shared cache used by automation_utils (None if disabled / no pyarrow)
+    """
+    global _default
+    if not CACHE_ENABLED or feather is None:
+        return None
+    if _default is None:
+        _default = InputCache()
+    return _default
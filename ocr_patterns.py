@@ -0,0 +1,90 @@
+# File: ocr_patterns.py
+# Shared precompiled regexes + keyword matcher
+# Reusable across ALL OCR extractor packages!
+
+import re
+from functools import lru_cache
+
+# ============================================
+# PRECOMPILED PATTERNS
+# ============================================
+
+# GSTIN (India) - loose check digit / strict check digit
+GSTIN_RE = re.compile(r"\b\d{2}[A-Z]{5}\d{4}[A-Z]{1}[A-Z\d]{1}Z[A-Z\d]\b")
+GSTIN_STRICT_RE = re.compile(r"\b[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z][1-9A-Z]Z[0-9A-Z]\b")
+GSTIN_PREFIX_RE = re.compile(r"\d{2}[A-Z]{5}")
+
+# Dates: 08-Feb-2026 / 08-02-2026 / 2026-02-08
+DATE_MON_RE = re.compile(r"\b(\d{1,2}[\/\-\.][A-Za-z]{3}[\/\-\.]\d{2,4})\b")
+DATE_DMY_RE = re.compile(r"\b(\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4})\b")
+DATE_YMD_RE = re.compile(r"\b(\d{4}[\/\-\.]\d{1,2}[\/\-\.]\d{1,2})\b")
+DATE_RE = re.compile(
+    r"\b(\d{1,2}[\/\-\.][A-Za-z]{3}[\/\-\.]\d{2,4}|\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4})\b"
+)
+DATE_LIKE_RE = re.compile(r"\d{2}[/-]\d{2}")
+
+# Amounts: 1,234.56
+AMOUNT_RE = re.compile(r"(\d{1,3}(?:,\d{3})*(?:\.\d{2}))")
+
+
+@lru_cache(maxsize=None)
+def label_prefix_re(label):
+    """
+    `<anything> label` (case-insensitive) - strips a label and
+    everything before it from a line. Compiled once per label.
+    """
+    return re.compile(r"(?i).*" + re.escape(label))
+
+
+@lru_cache(maxsize=None)
+def label_re(label):
+    """
+    Case-insensitive label as a raw regex, compiled once per label
+    """
+    return re.compile(r"(?i)" + label)
+
+
+# ============================================
+# KEYWORD MATCHER
+# ============================================
+
+class KeywordMatcher:
+    """
+    Multi-keyword substring matcher
+
+    A compiled alternation (C regex engine) finds the first possible
+    hit, so lines without any keyword never reach the Python loop;
+    lines with one run `{k for k in keywords if k in text}` (one
+    C-level `in` check per keyword).
+    Matching is case-sensitive; pass lowercase text for lowercase keywords.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(k for k in keywords if k))
+        self._first = re.compile("|".join(
+            re.escape(k) for k in sorted(self.keywords, key=len, reverse=True)
+        )) if self.keywords else None
+
+    def find_all(self, text):
+        """
+        Set of every keyword found in text
+        """
+        if not self.search(text):
+            return set()
+        return {k for k in self.keywords if k in text}
+
+    def search(self, text):
+        """
+        True if any keyword is found
+        """
+        return bool(self._first and self._first.search(text))
+
+    def first(self, text):
+        """
+        Earliest keyword in self.keywords order that occurs in text, or None
+        """
+        hits = self.find_all(text)
+        for kw in self.keywords:
+            if kw in hits:
+                return kw
+        return None
@@ -0,0 +1,310 @@
+# File: profiling.py
+# Hierarchical profiling spans (replaces timer_decorator)
+# Reusable across ALL projects!
+#
+#   @profiled()                         # decorator
+#   def load_csv(path): ...
+#
+#   with span("ocr.extract") as sp:     # context manager
+#       ...
+#       sp.set(rows_out=len(items))
+#
+# Each span records wall / CPU time, rows in / out and (optionally)
+# the tracemalloc peak above its start. write_reports() saves a JSON
+# summary + a Chrome trace (chrome://tracing, Perfetto) next to the log.
+# Disabled (default) a decorated call costs one flag check.
+# Enable: AUTOMATION_PROFILE=1, or setup_logging(..., profile=True).
+
+import atexit
+import functools
+import glob
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+
+# ============================================
+# STATE
+# ============================================
+
+_enabled = False
+_memory = False
+_output_dir = os.environ.get("AUTOMATION_PROFILE_DIR", "logs")
+_main_pid = os.getpid()
+_records = []          # finished spans of this process
+_local = threading.local()
+_lock = threading.Lock()
+
+SUMMARY_FILE = "profile_summary.json"
+TRACE_FILE = "profile_trace.json"
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable(output_dir=None, memory=True):
+    """
+    Start recording spans; memory=True also tracks tracemalloc peaks
+    (slower - allocations are traced)
+    """
+    global _enabled, _memory, _output_dir
+    if output_dir:
+        _output_dir = output_dir
+    _memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if not _enabled:
+        atexit.register(write_reports)
+        # part files left by an earlier (crashed) run
+        for stale in glob.glob(os.path.join(_output_dir, ".profile_spans_*.jsonl")):
+            os.remove(stale)
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def set_output_dir(path):
+    global _output_dir
+    _output_dir = path or "."
+
+# ============================================
+# SPANS
+# ============================================
+
+def _rows(obj):
+    """
+    Row count of a DataFrame / list result ((df, count) -> df)
+    """
+    if isinstance(obj, tuple) and obj:
+        obj = obj[0]
+    if hasattr(obj, "shape") and hasattr(obj, "columns"):
+        return len(obj)
+    if isinstance(obj, list):
+        return len(obj)
+    return None
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **values):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    """
+    One timed region; nested spans become its children
+    """
+
+    def __init__(self, name, rows_in=None, rows_out=None, **args):
+        self.name = name
+        self.args = args
+        self.rows_in = rows_in
+        self.rows_out = rows_out
+        self.child_wall = 0.0
+        self.child_peak = 0
+
+    def set(self, rows_in=None, rows_out=None, **args):
+        if rows_in is not None:
+            self.rows_in = rows_in
+        if rows_out is not None:
+            self.rows_out = rows_out
+        self.args.update(args)
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None or _local.pid != os.getpid():
+            # fresh thread, or a forked worker (parent spans aren't ours)
+            stack = _local.stack = []
+            _local.pid = os.getpid()
+        self.parent = stack[-1] if stack else None
+        self.path = f"{self.parent.path}/{self.name}" if self.parent else self.name
+        stack.append(self)
+
+        if _memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if self.parent:
+                self.parent.child_peak = max(self.parent.child_peak, peak)
+            self.mem_start = current
+            tracemalloc.reset_peak()
+        else:
+            self.mem_start = None
+
+        self.ts = time.time_ns() // 1000
+        self.cpu0 = time.process_time()
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.t0
+        cpu = time.process_time() - self.cpu0
+
+        peak = None
+        if self.mem_start is not None and tracemalloc.is_tracing():
+            top = max(tracemalloc.get_traced_memory()[1], self.child_peak)
+            peak = max(0, top - self.mem_start)
+            if self.parent:
+                self.parent.child_peak = max(self.parent.child_peak, top)
+
+        _local.stack.pop()
+        if self.parent:
+            self.parent.child_wall += wall
+
+        record = {
+            "name": self.name, "path": self.path, "ts": self.ts,
+            "wall": wall, "self": wall - self.child_wall, "cpu": cpu,
+            "peak": peak, "rows_in": self.rows_in, "rows_out": self.rows_out,
+            "pid": os.getpid(), "tid": threading.get_ident(),
+            "error": exc_type.__name__ if exc_type else None, "args": self.args,
+        }
+        with _lock:
+            _records.append(record)
+        if not self.parent and os.getpid() != _main_pid:
+            _flush_worker()
+        return False
+
+
+def span(name, **args):
+    """
+    Context manager span (a no-op object while profiling is off)
+    """
+    if not _enabled:
+        return _NOOP
+    return Span(name, **args)
+
+
+def profiled(name=None):
+    """
+    Decorator: one span per call, rows in / out taken from the first
+    argument and the return value when they are DataFrames / lists
+    """
+    def deco(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with Span(label) as sp:
+                if args:
+                    sp.rows_in = _rows(args[0])
+                result = func(*args, **kwargs)
+                sp.rows_out = _rows(result)
+                return result
+        return wrapper
+    return deco
+
+# ============================================
+# REPORTS
+# ============================================
+
+def _worker_file(pid):
+    return os.path.join(_output_dir, f".profile_spans_{pid}.jsonl")
+
+
+def _flush_worker():
+    """
+    Pool workers never run atexit - append finished spans to a part
+    file that the main process merges in write_reports()
+    """
+    global _records
+    pid = os.getpid()
+    with _lock:
+        records, _records = _records, []
+    records = [r for r in records if r["pid"] == pid]  # not the parent's copies
+    if not records:
+        return
+    os.makedirs(_output_dir, exist_ok=True)
+    with open(_worker_file(os.getpid()), "a", encoding="utf-8") as f:
+        for r in records:
+            f.write(json.dumps(r, default=str) + "\n")
+
+
+def summarize(records):
+    """
+    Aggregate spans by path: calls, total / self / max wall, CPU,
+    rows and the largest memory peak - slowest first
+    """
+    table = {}
+    for r in records:
+        row = table.setdefault(r["path"], {
+            "path": r["path"], "calls": 0, "wall_total": 0.0, "self_total": 0.0,
+            "wall_max": 0.0, "cpu_total": 0.0, "rows_in": 0, "rows_out": 0,
+            "peak_max": None, "errors": 0,
+        })
+        row["calls"] += 1
+        row["wall_total"] += r["wall"]
+        row["self_total"] += r["self"]
+        row["wall_max"] = max(row["wall_max"], r["wall"])
+        row["cpu_total"] += r["cpu"]
+        row["rows_in"] += r["rows_in"] or 0
+        row["rows_out"] += r["rows_out"] or 0
+        if r["peak"] is not None:
+            row["peak_max"] = max(row["peak_max"] or 0, r["peak"])
+        if r["error"]:
+            row["errors"] += 1
+    return sorted(table.values(), key=lambda x: x["wall_total"], reverse=True)
+
+
+def chrome_trace(records):
+    events = []
+    for r in records:
+        args = dict(r["args"], cpu_ms=round(r["cpu"] * 1000, 3))
+        for key in ("rows_in", "rows_out", "peak", "error"):
+            if r[key] is not None:
+                args[key] = r[key]
+        events.append({
+            "name": r["name"], "cat": r["path"].split("/")[0], "ph": "X",
+            "ts": r["ts"], "dur": round(r["wall"] * 1e6, 1),
+            "pid": r["pid"], "tid": r["tid"], "args": args,
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_reports(output_dir=None):
+    """
+    profile_summary.json + profile_trace.json (this process and any
+    pool workers); returns (summary path, trace path) or None
+    """
+    if os.getpid() != _main_pid:
+        return _flush_worker()
+    out = output_dir or _output_dir
+    with _lock:
+        records = list(_records)
+    for part in glob.glob(os.path.join(out, ".profile_spans_*.jsonl")):
+        with open(part, "r", encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+        os.remove(part)
+    with _lock:
+        _records[:] = records  # merged parts stay for a later call
+    if not records:
+        return None
+
+    os.makedirs(out, exist_ok=True)
+    summary_path = os.path.join(out, SUMMARY_FILE)
+    trace_path = os.path.join(out, TRACE_FILE)
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump({"spans": len(records), "summary": summarize(records)}, f, indent=2)
+    with open(trace_path, "w", encoding="utf-8") as f:
+        json.dump(chrome_trace(records), f)
+    logging.info(f"Profile written: {summary_path}, {trace_path}")
+    return summary_path, trace_path
+
+
+if os.environ.get("AUTOMATION_PROFILE") == "1":
+    enable(memory=os.environ.get("AUTOMATION_PROFILE_MEMORY", "1") != "0")
@@ -0,0 +1,294 @@
+# File: result_sinks.py
+# Incremental result sinks for batch extraction
+# Each invoice (+ its items) is saved as soon as it is extracted,
+# so a crash mid-batch keeps everything finished so far.
+
+import glob
+import json
+import os
+import sqlite3
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet sink is optional
+    pa = pq = None
+
+# ============================================
+# BASE SINK
+# ============================================
+
+class ResultSink:
+    """
+    Append-only store of extraction results
+
+    append(result, debug) while extracting, then results() /
+    debug_rows() to read everything back (e.g. to render Excel).
+    mode: "w" start fresh, "a" keep existing records, "r" read only
+    """
+
+    def __init__(self, path, mode="w"):
+        self.path = path
+        self.mode = mode
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def append(self, result, debug=()):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+    def records(self):
+        """
+        (result, debug) pairs in append order - streamed from storage
+        """
+        raise NotImplementedError
+
+    def results(self):
+        return SinkView(self, "result")
+
+    def debug_rows(self):
+        return SinkView(self, "debug")
+
+    @staticmethod
+    def _split(result):
+        # invoice fields / item rows are stored separately
+        head = {k: v for k, v in result.items() if k != "inventories"}
+        return head, list(result.get("inventories", []))
+
+
+class SinkView:
+    """
+    Re-iterable, len()-able view over a sink
+    Lets the Excel writers loop over results several times
+    without loading the whole batch into memory.
+    """
+
+    def __init__(self, sink, kind):
+        self.sink = sink
+        self.kind = kind
+        self._len = None
+
+    def __iter__(self):
+        for result, debug in self.sink.records():
+            if self.kind == "result":
+                yield result
+            else:
+                yield from debug
+
+    def __len__(self):
+        if self._len is None:
+            self._len = sum(1 for _ in self)
+        return self._len
+
+    def __bool__(self):
+        return len(self) > 0
+
+# ============================================
+# JSONL
+# ============================================
+
+class JsonlSink(ResultSink):
+    """
+    One JSON line per invoice: {"result": ..., "debug": [...]}
+    Flushed after every invoice; a half-written last line is skipped.
+    """
+
+    def __init__(self, path, mode="w"):
+        super().__init__(path, mode)
+        self._f = None
+        if mode in ("w", "a"):
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._f = open(path, mode, encoding="utf-8")
+
+    def append(self, result, debug=()):
+        self._f.write(json.dumps({"result": result, "debug": list(debug)}, ensure_ascii=False) + "\n")
+        self._f.flush()
+        self.count += 1
+
+    def close(self):
+        if self._f:
+            self._f.close()
+            self._f = None
+
+    def records(self):
+        if self._f:
+            self._f.flush()
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # truncated by a crash
+                yield rec["result"], rec["debug"]
+
+# ============================================
+# SQLITE
+# ============================================
+
+class SqliteSink(ResultSink):
+    """
+    invoices (+ debug column) / items tables, one transaction per invoice
+    """
+
+    def __init__(self, path, mode="w"):
+        super().__init__(path, mode)
+        if mode == "w" and os.path.exists(path):
+            os.remove(path)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS invoices (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                file TEXT, data TEXT, debug TEXT
+            );
+            CREATE TABLE IF NOT EXISTS items (
+                invoice_seq INTEGER, position INTEGER, file TEXT, data TEXT
+            );
+            CREATE INDEX IF NOT EXISTS items_by_invoice ON items (invoice_seq, position);
+        """)
+
+    def append(self, result, debug=()):
+        head, items = self._split(result)
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO invoices (file, data, debug) VALUES (?, ?, ?)",
+                (head.get("file"), json.dumps(head, ensure_ascii=False),
+                 json.dumps(list(debug), ensure_ascii=False))
+            )
+            self.conn.executemany(
+                "INSERT INTO items VALUES (?, ?, ?, ?)",
+                [(cur.lastrowid, i, head.get("file"), json.dumps(item, ensure_ascii=False))
+                 for i, item in enumerate(items)]
+            )
+        self.count += 1
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def records(self):
+        invoices = self.conn.execute("SELECT seq, data, debug FROM invoices ORDER BY seq")
+        for seq, data, debug in invoices:
+            result = json.loads(data)
+            result["inventories"] = [
+                json.loads(d) for (d,) in self.conn.execute(
+                    "SELECT data FROM items WHERE invoice_seq = ? ORDER BY position", (seq,)
+                )
+            ]
+            yield result, json.loads(debug)
+
+# ============================================
+# PARQUET (optional, needs pyarrow)
+# ============================================
+
+class ParquetSink(ResultSink):
+    """
+    Directory of part files: invoices/part-N.parquet + items/part-N.parquet
+    Every `batch_size` invoices become one new part (written atomically),
+    so memory is bounded by one batch and finished parts survive a crash.
+    """
+
+    def __init__(self, path, mode="w", batch_size=500):
+        if pa is None:
+            raise ImportError("pyarrow is required for the Parquet sink (pip install pyarrow)")
+        super().__init__(path, mode)
+        self.batch_size = batch_size
+        self._invoices, self._items = [], []
+
+        for sub in ("invoices", "items"):
+            if mode != "r":
+                os.makedirs(os.path.join(path, sub), exist_ok=True)
+            if mode == "w":
+                for old in glob.glob(os.path.join(path, sub, "*.parquet")):
+                    os.remove(old)
+        self._part = len(self._parts("invoices"))
+        self._seq = 0
+        if mode == "a":
+            self._seq = sum(pq.ParquetFile(p).metadata.num_rows for p in self._parts("invoices"))
+
+    def _parts(self, sub):
+        return sorted(glob.glob(os.path.join(self.path, sub, "part-*.parquet")))
+
+    def append(self, result, debug=()):
+        head, items = self._split(result)
+        seq = self._seq
+        self._invoices.append({
+            "seq": seq, "file": head.get("file"),
+            "data": json.dumps(head, ensure_ascii=False),
+            "debug": json.dumps(list(debug), ensure_ascii=False)
+        })
+        self._items.extend({
+            "invoice_seq": seq, "position": i, "file": head.get("file"),
+            "data": json.dumps(item, ensure_ascii=False)
+        } for i, item in enumerate(items))
+        self._seq += 1
+        self.count += 1
+        if len(self._invoices) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._invoices:
+            return
+        name = f"part-{self._part:06d}.parquet"
+        # items first: an invoices part only appears once its items exist
+        for sub, rows in (("items", self._items), ("invoices", self._invoices)):
+            target = os.path.join(self.path, sub, name)
+            table = pa.Table.from_pylist(rows, schema=self._schema(sub))
+            pq.write_table(table, target + ".tmp")
+            os.replace(target + ".tmp", target)
+        self._part += 1
+        self._invoices, self._items = [], []
+
+    @staticmethod
+    def _schema(sub):
+        if sub == "invoices":
+            return pa.schema([("seq", pa.int64()), ("file", pa.string()),
+                              ("data", pa.string()), ("debug", pa.string())])
+        return pa.schema([("invoice_seq", pa.int64()), ("position", pa.int64()),
+                          ("file", pa.string()), ("data", pa.string())])
+
+    def records(self):
+        self.flush()
+        for inv_path in self._parts("invoices"):
+            items_path = os.path.join(self.path, "items", os.path.basename(inv_path))
+            grouped = {}
+            for row in pq.read_table(items_path).to_pylist():
+                grouped.setdefault(row["invoice_seq"], []).append((row["position"], row["data"]))
+            for row in pq.read_table(inv_path).to_pylist():
+                result = json.loads(row["data"])
+                result["inventories"] = [json.loads(d) for _, d in sorted(grouped.get(row["seq"], []))]
+                yield result, json.loads(row["debug"])
+
+# ============================================
+# FACTORY
+# ============================================
+
+SINK_TYPES = {
+    "jsonl": (JsonlSink, ".jsonl"),
+    "sqlite": (SqliteSink, ".sqlite"),
+    "parquet": (ParquetSink, ".parquet"),
+}
+
+
+def open_sink(kind, base_path, mode="w"):
+    """
+    open_sink("jsonl", "output/results") -> JsonlSink on output/results.jsonl
+    """
+    if kind not in SINK_TYPES:
+        raise ValueError(f"Unknown sink '{kind}' (choose from {', '.join(SINK_TYPES)})")
+    cls, ext = SINK_TYPES[kind]
+    return cls(base_path + ext, mode)
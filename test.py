@@ -4,7 +4,6 @@
 Termux 100% Compatible | No Syntax Errors
 """
 
-import json
 import os
 import re
 try:
@@ -17,6 +16,8 @@ except ImportError as e:
     print("📦 Install: pip install openpyxl num2words")
     exit(1)
 
+from textract_utils import BlockIndex, iter_blocks
+
 # =====================================================
 # CONFIG
 # =====================================================
@@ -57,49 +58,27 @@ def safe_write(sheet, cell_ref, value):
             break
     cell.value = value
 
-def extract_table(response, table_idx):
-    blocks = response["Blocks"]
-    block_map = {b["Id"]: b for b in blocks}
-    tables = [b for b in blocks if b["BlockType"] == "TABLE"]
-    table = tables[table_idx]
-    
-    data = {}
-    for rel in table.get("Relationships", []):
-        if rel["Type"] == "CHILD":
-            for cid in rel["Ids"]:
-                cell = block_map[cid]
-                if cell["BlockType"] == "CELL":
-                    r = cell["RowIndex"]
-                    c = cell["ColumnIndex"]
-                    text = ""
-                    for crel in cell.get("Relationships", []):
-                        if crel["Type"] == "CHILD":
-                            for wid in crel["Ids"]:
-                                word = block_map[wid]
-                                if word["BlockType"] == "WORD":
-                                    text += word["Text"] + " "
-                    if r not in data: data[r] = {}
-                    data[r][c] = text.strip()
-    return data
+def extract_table(index, table_idx):
+    table = index.blocks("TABLE")[table_idx]
+    return index.table_rows(table)
 
 # =====================================================
 # LOAD DATA
 # =====================================================
 print("📄 Loading JSON...")
-with open(JSON_FILE, "r", encoding="utf-8") as f:
-    response = json.load(f)
+index = BlockIndex(iter_blocks(JSON_FILE, {"TABLE", "CELL", "WORD"}))
 
 print("📊 Loading Excel...")
 wb = load_workbook(TEMPLATE_FILE)
 sheet = wb.active
-tables = [b for b in response["Blocks"] if b["BlockType"] == "TABLE"]
+tables = index.blocks("TABLE")
 
 # =====================================================
 # FILL MAIN TABLE
 # =====================================================
 print("🔍 Filling data...")
 for idx in range(len(tables)):
-    table_data = extract_table(response, idx)
+    table_data = extract_table(index, idx)
     
     for row_idx in table_data:
         row = table_data[row_idx]
@@ -142,7 +121,7 @@ safe_write(sheet, "I23", sub_total)
 # =====================================================
 print("📊 Processing GST/Deductions/Summary...")
 for idx in range(len(tables)):
-    table_data = extract_table(response, idx)
+    table_data = extract_table(index, idx)
     
     for row in table_data.values():
         row_text = normalize(" ".join(row.values()))
@@ -0,0 +1,475 @@
+# File: textract_utils.py
+# Shared AWS Textract helpers
+# Reusable across ALL OCR projects!
+
+import json
+import os
+from bisect import bisect_left, bisect_right
+
+try:
+    import numpy as np
+except ImportError:  # sidecar cache is optional
+    np = None
+
+# ============================================
+# BLOCK INDEX
+# ============================================
+
+class BlockIndex:
+    """
+    Single-pass index over Textract blocks
+
+    Builds the id map, per-type buckets and parent -> children
+    adjacency once per document, so table / form / line consumers
+    don't have to rebuild `{b["Id"]: b}` on every call.
+    """
+
+    def __init__(self, blocks):
+        self.by_id = {}
+        self.by_type = {}
+        self.children = {}
+        self.values = {}
+        self._text = {}
+        self._tables = {}
+
+        for b in blocks:
+            bid = b.get("Id")
+            self.by_id[bid] = b
+            self.by_type.setdefault(b.get("BlockType"), []).append(b)
+
+            for rel in b.get("Relationships", []):
+                if rel["Type"] == "CHILD":
+                    self.children.setdefault(bid, []).extend(rel["Ids"])
+                elif rel["Type"] == "VALUE":
+                    self.values.setdefault(bid, []).extend(rel["Ids"])
+
+    def blocks(self, block_type):
+        """
+        All blocks of one BlockType, in document order
+        """
+        return self.by_type.get(block_type, [])
+
+    def child_blocks(self, block, block_type=None):
+        """
+        CHILD blocks of a block, optionally filtered by BlockType
+        """
+        kids = [self.by_id[i] for i in self.children.get(block["Id"], []) if i in self.by_id]
+        if block_type:
+            kids = [k for k in kids if k.get("BlockType") == block_type]
+        return kids
+
+    def value_blocks(self, block):
+        """
+        VALUE blocks linked to a KEY block (forms)
+        """
+        return [self.by_id[i] for i in self.values.get(block["Id"], []) if i in self.by_id]
+
+    def text(self, block):
+        """
+        Joined WORD text under a block (cell, key, value) - cached
+        """
+        bid = block["Id"]
+        if bid not in self._text:
+            self._text[bid] = " ".join(
+                w.get("Text", "") for w in self.child_blocks(block, "WORD")
+            ).strip()
+        return self._text[bid]
+
+    def table_rows(self, table):
+        """
+        TABLE block -> {row_index: {column_index: text}} - cached
+        """
+        tid = table["Id"]
+        if tid not in self._tables:
+            rows = {}
+            for cell in self.child_blocks(table, "CELL"):
+                rows.setdefault(cell["RowIndex"], {})[cell["ColumnIndex"]] = self.text(cell)
+            self._tables[tid] = rows
+        return self._tables[tid]
+
+    def tables(self):
+        """
+        All tables of the document as row dicts
+        """
+        return [self.table_rows(t) for t in self.blocks("TABLE")]
+
+
+# ============================================
+# ROW CLUSTERING
+# ============================================
+
+def cluster_rows(items, top, tol=0.012, inclusive=False):
+    """
+    Group blocks into visual rows by their Top coordinate
+    items: blocks (LINE / WORD dicts)
+    top: function block -> Top value
+    tol: max distance from the row's first (highest) block
+    inclusive: True -> `<= tol`, False -> `< tol`
+
+    Sort once, then sweep: each row takes every following block
+    within `tol` of its first block. O(n log n) instead of comparing
+    every block against every row found so far.
+
+    Returns [(row_top, [blocks...]), ...] ordered top to bottom.
+    """
+    rows = cluster_row_indices([top(it) for it in items], tol, inclusive)
+    return [(anchor, [items[k] for k in idx]) for anchor, idx in rows]
+
+
+def cluster_row_indices(tops, tol=0.012, inclusive=False):
+    """
+    cluster_rows() on a column of Top values (list or numpy array,
+    e.g. TextractColumns.top) - no block dicts needed
+    Returns [(row_top, [row indices...]), ...] ordered top to bottom.
+    """
+    n = len(tops)
+    if not n:
+        return []
+
+    if np is not None:
+        tops = np.asarray(tops, dtype=np.float64)
+        order = np.argsort(tops, kind="stable")
+        sorted_tops = tops[order]
+        ends = np.searchsorted(sorted_tops, sorted_tops + tol,
+                               side="right" if inclusive else "left").tolist()
+        order, sorted_tops = order.tolist(), sorted_tops.tolist()
+    else:
+        order = sorted(range(n), key=tops.__getitem__)
+        sorted_tops = [tops[k] for k in order]
+        bisect = bisect_right if inclusive else bisect_left
+        ends = [bisect(sorted_tops, t + tol) for t in sorted_tops]
+
+    rows = []
+    i = 0
+    while i < n:
+        j = max(ends[i], i + 1)
+        rows.append((sorted_tops[i], order[i:j]))
+        i = j
+    return rows
+
+
+# ============================================
+# STREAMING JSON READER
+# ============================================
+
+class _JsonStream:
+    """
+    Minimal buffered tokenizer over a JSON text file
+    Decodes one value at a time with the stdlib C scanner.
+    """
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        data = self.f.read(self.chunk_size)
+        if not data:
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch):
+        if self.peek() != ch:
+            raise ValueError(f"Expected '{ch}' at offset {self.pos} in Textract JSON")
+        self.pos += 1
+
+    def skip_comma(self):
+        if self.peek() == ",":
+            self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Value cut by the chunk boundary - read more and retry
+                if not self._fill():
+                    raise
+                continue
+
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buf) and isinstance(obj, (int, float)) and self._fill():
+                continue
+
+            self.pos = end
+            return obj
+
+
+def iter_blocks(path, block_types=None, chunk_size=1 << 16):
+    """
+    Stream Textract blocks from a response JSON one at a time
+    block_types: optional set of BlockType values to keep (e.g. {"LINE"})
+
+    Only one block is decoded at a time, so memory stays bounded
+    by the blocks the caller keeps, not by the file size.
+    """
+    wanted = set(block_types) if block_types else None
+
+    with open(path, "r", encoding="utf-8") as f:
+        stream = _JsonStream(f, chunk_size)
+        stream.expect("{")
+
+        while stream.peek() not in ("}", ""):
+            key = stream.value()
+            stream.expect(":")
+
+            if key == "Blocks":
+                stream.expect("[")
+                while stream.peek() not in ("]", ""):
+                    block = stream.value()
+                    if wanted is None or block.get("BlockType") in wanted:
+                        yield block
+                    stream.skip_comma()
+                stream.expect("]")
+            else:
+                stream.value()  # DocumentMetadata etc. - small, discarded
+
+            stream.skip_comma()
+
+
+# ============================================
+# COLUMNAR SIDECAR CACHE (optional, needs numpy)
+# ============================================
+
+SIDECAR_VERSION = 2
+
+BLOCK_TYPE_CODES = [
+    "PAGE", "LINE", "WORD", "TABLE", "CELL", "MERGED_CELL",
+    "KEY_VALUE_SET", "SELECTION_ELEMENT", "TABLE_TITLE", "TABLE_FOOTER"
+]
+
+# Blocks that are useful without Relationships (geometry + text)
+SIDECAR_BLOCK_TYPES = ("LINE", "WORD")
+
+SIDECAR_COLUMNS = (
+    "block_type", "page", "text", "strings",
+    "top", "left", "width", "height", "confidence"
+)
+
+
+def sidecar_path(json_path):
+    """
+    invoice.png.json -> invoice.png.cols/ (same folder, one .npy per column)
+    """
+    return os.path.splitext(json_path)[0] + ".cols"
+
+
+def _block_columns(blocks, block_types):
+    """
+    Blocks of the given types -> dict of column lists (SIDECAR_COLUMNS)
+    """
+    cols = {name: [] for name in SIDECAR_COLUMNS}
+    string_ids = {}
+    page = 0
+
+    for b in blocks:
+        if b.get("BlockType") == "PAGE":
+            page += 1
+        if b.get("BlockType") not in block_types:
+            continue
+
+        box = b.get("Geometry", {}).get("BoundingBox", {})
+        cols["block_type"].append(BLOCK_TYPE_CODES.index(b["BlockType"]))
+        cols["page"].append(b.get("Page", page or 1))
+        cols["top"].append(box.get("Top", 0))
+        cols["left"].append(box.get("Left", 0))
+        cols["width"].append(box.get("Width", 0))
+        cols["height"].append(box.get("Height", 0))
+        cols["confidence"].append(b.get("Confidence", 0))
+
+        text = b.get("Text", "")
+        if text not in string_ids:
+            string_ids[text] = len(cols["strings"])
+            cols["strings"].append(text)
+        cols["text"].append(string_ids[text])
+    return cols
+
+
+def _column_arrays(cols):
+    return {
+        "block_type": np.array(cols["block_type"], dtype=np.uint8),
+        "page": np.array(cols["page"], dtype=np.int32),
+        "text": np.array(cols["text"], dtype=np.int32),
+        "strings": np.array(cols["strings"], dtype=str),
+        **{k: np.array(cols[k], dtype=np.float32) for k in ("top", "left", "width", "height", "confidence")}
+    }
+
+
+def build_sidecar(json_path, block_types=SIDECAR_BLOCK_TYPES):
+    """
+    Convert one Textract JSON into a columnar sidecar folder
+    float32 geometry/confidence, block type codes, page numbers
+    and an interned string table - plain .npy files, so they can be
+    memory-mapped on load (an .npz zip can't be).
+    version.npy is written last and marks the folder complete.
+    """
+    if np is None:
+        raise ImportError("numpy is required for Textract sidecars (pip install numpy)")
+
+    columns = _column_arrays(_block_columns(iter_blocks(json_path), block_types))
+
+    out_dir = sidecar_path(json_path)
+    os.makedirs(out_dir, exist_ok=True)
+    version_file = os.path.join(out_dir, "version.npy")
+    if os.path.exists(version_file):
+        os.remove(version_file)  # incomplete until rewritten below
+    for name, arr in columns.items():
+        np.save(os.path.join(out_dir, name + ".npy"), arr)
+    np.save(version_file, np.array([SIDECAR_VERSION], dtype=np.int32))
+    return out_dir
+
+
+def build_sidecars(input_dir):
+    """
+    Conversion stage: one sidecar per textract_json/*.json
+    Skips files whose sidecar is already up to date.
+    """
+    built = 0
+    for fname in sorted(os.listdir(input_dir)):
+        if not fname.endswith(".json"):
+            continue
+        path = os.path.join(input_dir, fname)
+        if load_sidecar(path) is None:
+            build_sidecar(path)
+            built += 1
+    return built
+
+
+class TextractColumns:
+    """
+    Column arrays of one document (row i = block i), memory-mapped
+    from a sidecar or built from streamed blocks (plain lists when
+    numpy isn't installed)
+    Extractors read text / geometry from here instead of one nested
+    Geometry dict per block.
+    """
+
+    def __init__(self, data):
+        self.block_type = data["block_type"]
+        self.page = data["page"]
+        self.top = data["top"]
+        self.left = data["left"]
+        self.width = data["width"]
+        self.height = data["height"]
+        self.confidence = data["confidence"]
+        self.text = data["text"]
+        self.strings = data["strings"]
+
+    @classmethod
+    def from_blocks(cls, blocks, block_types):
+        cols = _block_columns(blocks, block_types)
+        return cls(_column_arrays(cols) if np is not None else cols)
+
+    def __len__(self):
+        return len(self.block_type)
+
+    def mask(self, block_types):
+        codes = [BLOCK_TYPE_CODES.index(t) for t in block_types]
+        return np.isin(self.block_type, codes)
+
+    def select(self, block_types):
+        """
+        Rows of these block types only (copied out of the memory map;
+        the string table stays shared)
+        """
+        idx = np.flatnonzero(self.mask(block_types))
+        data = {name: np.asarray(getattr(self, name)[idx]) for name in SIDECAR_COLUMNS if name != "strings"}
+        return TextractColumns(dict(data, strings=self.strings))
+
+    def texts(self):
+        """
+        Text of every row, as a list of str
+        """
+        if np is not None and isinstance(self.text, np.ndarray):
+            return self.strings[self.text].tolist()
+        return [self.strings[i] for i in self.text]
+
+    def floats(self, name):
+        """
+        One numeric column (top, left, ...) as a list of Python floats
+        """
+        col = getattr(self, name)
+        return col.tolist() if hasattr(col, "tolist") else list(col)
+
+    def blocks(self, block_types):
+        """
+        Rebuild block-shaped dicts (load_blocks callers)
+        """
+        idx = np.flatnonzero(self.mask(block_types))
+        strings = self.strings.tolist()
+        rows = zip(
+            self.block_type[idx].tolist(), self.page[idx].tolist(),
+            self.text[idx].tolist(), self.confidence[idx].tolist(),
+            self.top[idx].tolist(), self.left[idx].tolist(),
+            self.width[idx].tolist(), self.height[idx].tolist()
+        )
+        return [{
+            "BlockType": BLOCK_TYPE_CODES[bt],
+            "Page": page,
+            "Text": strings[t],
+            "Confidence": conf,
+            "Geometry": {"BoundingBox": {"Top": top, "Left": left, "Width": w, "Height": h}}
+        } for bt, page, t, conf, top, left, w, h in rows]
+
+
+def load_sidecar(json_path):
+    """
+    TextractColumns for a JSON file, or None if no fresh sidecar exists
+    Columns are memory-mapped (read-only), not read into memory.
+    """
+    folder = sidecar_path(json_path)
+    version_file = os.path.join(folder, "version.npy")
+    if np is None or not os.path.exists(version_file):
+        return None
+    if os.path.getmtime(version_file) < os.path.getmtime(json_path):
+        return None
+    if int(np.load(version_file)[0]) != SIDECAR_VERSION:
+        return None
+
+    try:
+        return TextractColumns({
+            name: np.load(os.path.join(folder, name + ".npy"), mmap_mode="r")
+            for name in SIDECAR_COLUMNS
+        })
+    except (OSError, ValueError):
+        return None
+
+
+def load_columns(json_path, block_types):
+    """
+    TextractColumns of the requested types (SIDECAR_BLOCK_TYPES only) -
+    from the sidecar when it exists, otherwise streamed from the JSON
+    """
+    if not set(block_types) <= set(SIDECAR_BLOCK_TYPES):
+        raise ValueError(f"Columns only cover {', '.join(SIDECAR_BLOCK_TYPES)} blocks")
+    cols = load_sidecar(json_path)
+    if cols is not None:
+        return cols.select(block_types)
+    return TextractColumns.from_blocks(iter_blocks(json_path, block_types), block_types)
+
+
+def load_blocks(json_path, block_types):
+    """
+    Blocks of the requested types - from the sidecar when it covers
+    them, otherwise streamed from the JSON.
+    """
+    if set(block_types) <= set(SIDECAR_BLOCK_TYPES):
+        cols = load_sidecar(json_path)
+        if cols is not None:
+            return cols.blocks(block_types)
+    return list(iter_blocks(json_path, block_types))